@@ -14,4 +14,11 @@ foreach dir $subdirs {
             add_files $file
         }
     }
+    # Add any memory initialisation files loaded by $readmemh/$readmemb
+    set mem_files [glob -nocomplain -directory $dir *.mem]
+    if {[llength $mem_files] > 0} {
+        foreach file $mem_files {
+            add_files $file
+        }
+    }
 }
@@ -1,50 +1,104 @@
 `timescale 1ns / 1ps
 //////////////////////////////////////////////////////////////////////////////////
 // Module Name: adc_readout
-// Description: Captures ADC data into a 4096‑byte buffer.
-//              The ADC channel is assumed to deliver 8‑bit samples synchronously
-//              with adc_clock. The capture is initiated with start_capture and
-//              stops once the entire buffer is filled. A simple read interface
-//              is provided for later processing.
+// Description: Captures ADC data into a BUFFER_SIZE‑sample buffer.
+//              The ADC channel is assumed to deliver DATA_WIDTH‑bit samples
+//              synchronously with adc_clock. The capture is initiated with
+//              start_capture. A simple read interface is provided for later
+//              processing.
+//
+//              DOUBLE_BUFFER = 0: one-shot capture, stops once the buffer is
+//              filled and holds capture_done high until reset.
+//              DOUBLE_BUFFER = 1: continuous ping-pong capture into two banks
+//              of BUFFER_SIZE samples. One bank fills while the other, selected
+//              by read_bank, is read out. capture_done pulses for one cycle each
+//              time a bank is filled, read_bank then points at that bank and the
+//              reader has BUFFER_SIZE cycles to read it before it is overwritten.
 //////////////////////////////////////////////////////////////////////////////////
+/* verilator lint_off WIDTHEXPAND */
+/* verilator lint_off WIDTHTRUNC */
 
 module adc_readout #(
-    parameter DATA_WIDTH = 12  // Parameter to define the width of the ADC input (adjust if ADC is 8-bit)
+    parameter DATA_WIDTH = 12,       // Parameter to define the width of the ADC input (adjust if ADC is 8-bit)
+    parameter BUFFER_SIZE = 4096,    // Number of samples per capture (per bank with DOUBLE_BUFFER)
+    parameter ADDR_WIDTH = 12,       // Width of the read address and write pointer (log2(BUFFER_SIZE))
+    parameter DOUBLE_BUFFER = 0      // 1 for continuous ping-pong capture into two banks
 ) (
     input  wire                    adc_clock,      // ADC clock
     input  wire                    reset,          // Synchronous reset (active high)
     input  wire                    start_capture,  // Signal to begin capturing ADC data
     input  wire [DATA_WIDTH-1:0]   adc_data,       // ADC sample data
-    output reg                     capture_done,   // Flag that goes high when capture is complete
+    output reg                     capture_done,   // Capture complete flag, a one cycle pulse per bank with DOUBLE_BUFFER
     // Read interface (e.g. for a processor or debug logic)
-    input  wire [11:0]             read_addr,      // Address for reading out the stored data
+    input  wire [ADDR_WIDTH-1:0]   read_addr,      // Address for reading out the stored data
+    output wire                    read_bank,      // Bank read through read_addr (always 0 without DOUBLE_BUFFER)
     output wire [DATA_WIDTH-1:0]   read_data       // Output data from the buffer
 );
 
-    // Write pointer for the buffer – 12 bits to cover 4096 addresses.
-    reg [11:0] write_ptr;
+    // The buffer holds both banks back to back with DOUBLE_BUFFER, bank 1 starts at BUFFER_SIZE
+    localparam BUFFER_DEPTH      = DOUBLE_BUFFER ? 2 * BUFFER_SIZE : BUFFER_SIZE;
+    localparam BUFFER_ADDR_WIDTH = DOUBLE_BUFFER ? ADDR_WIDTH + 1 : ADDR_WIDTH;
+
+    // Write pointer within the bank being filled – ADDR_WIDTH bits to cover BUFFER_SIZE addresses.
+    reg [ADDR_WIDTH-1:0] write_ptr;
+    // Bank being filled, stays 0 without DOUBLE_BUFFER.
+    reg        write_bank;
     // Flag to indicate that capture is ongoing.
     reg        capturing;
 
+    wire [BUFFER_ADDR_WIDTH-1:0] buffer_write_addr;
+    wire [BUFFER_ADDR_WIDTH-1:0] buffer_read_addr;
+
+    assign read_bank = DOUBLE_BUFFER ? ~write_bank : 1'b0;
+
+    generate
+        if (DOUBLE_BUFFER) begin : g_double_buffer
+            assign buffer_write_addr = write_bank ? BUFFER_SIZE + write_ptr : write_ptr;
+            assign buffer_read_addr  = read_bank  ? BUFFER_SIZE + read_addr : read_addr;
+        end else begin : g_single_buffer
+            assign buffer_write_addr = write_ptr;
+            assign buffer_read_addr  = read_addr;
+        end
+    endgenerate
+
     // Instantiate the dual‑port buffer to store ADC data.
     adc_buffer #(
-        .DATA_WIDTH(DATA_WIDTH)
+        .DATA_WIDTH  (DATA_WIDTH),
+        .BUFFER_SIZE (BUFFER_DEPTH),
+        .ADDR_WIDTH  (BUFFER_ADDR_WIDTH)
     ) u_adc_buffer (
         .clock      (adc_clock),
         .reset      (reset),
         .write_en   (capturing),    // Write enable is active during capture
-        .write_addr (write_ptr),
+        .write_addr (buffer_write_addr),
         .data_in    (adc_data),
-        .read_addr  (read_addr),
+        .read_addr  (buffer_read_addr),
         .data_out   (read_data)
     );
 
     // ADC capture state machine
     always @(posedge adc_clock or posedge reset) begin
         if (reset) begin
-            write_ptr    <= 12'd0;
+            write_ptr    <= {ADDR_WIDTH{1'b0}};
+            write_bank   <= 1'b0;
             capturing    <= 1'b0;
             capture_done <= 1'b0;
+        end else if (DOUBLE_BUFFER) begin
+            // Start capturing when start_capture is asserted, then keep filling the banks in turn.
+            if (start_capture && !capturing)
+                capturing <= 1'b1;
+
+            capture_done <= 1'b0;
+            if (capturing) begin
+                if (write_ptr == BUFFER_SIZE - 1) begin
+                    // Bank full – hand it to the reader and fill the other one.
+                    write_ptr    <= {ADDR_WIDTH{1'b0}};
+                    write_bank   <= ~write_bank;
+                    capture_done <= 1'b1;
+                end else begin
+                    write_ptr <= write_ptr + 1'b1;
+                end
+            end
         end else begin
             // Start capturing when start_capture is asserted and not already busy.
             if (start_capture && !capturing && !capture_done)
@@ -53,12 +107,12 @@ module adc_readout #(
             if (capturing) begin
                 // Each clock cycle, the current adc_data is written to the buffer.
                 // Increment the write pointer after each write.
-                if (write_ptr == 12'd4095) begin
+                if (write_ptr == BUFFER_SIZE - 1) begin
                     // Last address reached – capture is complete.
                     capturing    <= 1'b0;
                     capture_done <= 1'b1;
                 end else begin
-                    write_ptr <= write_ptr + 12'd1;
+                    write_ptr <= write_ptr + 1'b1;
                 end
             end
         end
@@ -7,22 +7,29 @@
 //////////////////////////////////////////////////////////////////////////////////
 
 module adc_readout_top #(
-    parameter DATA_WIDTH = 12  // Parameter defining ADC data width (adjustable)
+    parameter DATA_WIDTH = 12,       // Parameter defining ADC data width (adjustable)
+    parameter BUFFER_SIZE = 4096,    // Number of samples per capture (per bank with DOUBLE_BUFFER)
+    parameter ADDR_WIDTH = 12,       // Width of the read address (log2(BUFFER_SIZE))
+    parameter DOUBLE_BUFFER = 0      // 1 for continuous ping-pong capture into two banks
 ) (
     input  wire                    adc_clock,      // ADC clock input
     input  wire                    reset,          // Active-high reset
     input  wire                    start_capture,  // Trigger signal for ADC capture
     input  wire [DATA_WIDTH-1:0]   adc_data,       // ADC data input
-    output reg                     capture_done,   // Capture complete flag
+    output wire                    capture_done,   // Capture complete flag (one cycle pulse per bank with DOUBLE_BUFFER)
 
     // Readout interface for external processing
-    input  wire [11:0]             read_addr,      // Address input for reading stored data
-    output reg [DATA_WIDTH-1:0]    read_data       // Data output from the captured buffer
+    input  wire [ADDR_WIDTH-1:0]   read_addr,      // Address input for reading stored data
+    output wire                    read_bank,      // Bank read through read_addr (DOUBLE_BUFFER only)
+    output wire [DATA_WIDTH-1:0]   read_data       // Data output from the captured buffer
 );
 
     // Instantiate the adc_readout module
     adc_readout #(
-        .DATA_WIDTH(DATA_WIDTH)
+        .DATA_WIDTH(DATA_WIDTH),
+        .BUFFER_SIZE(BUFFER_SIZE),
+        .ADDR_WIDTH(ADDR_WIDTH),
+        .DOUBLE_BUFFER(DOUBLE_BUFFER)
     ) adc_readout_inst (
         .adc_clock(adc_clock),
         .reset(reset),
@@ -30,6 +37,7 @@ module adc_readout_top #(
         .adc_data(adc_data),
         .capture_done(capture_done),
         .read_addr(read_addr),
+        .read_bank(read_bank),
         .read_data(read_data)
     );
 
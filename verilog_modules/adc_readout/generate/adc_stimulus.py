@@ -0,0 +1,211 @@
+import numpy as np
+
+# Number of elements (samples x channels) synthesized per chunk, bounds the float64 intermediates to a few MB
+STIMULUS_CHUNK_ELEMENTS = 2**20
+
+# Noise and jitter are drawn in blocks of this many samples per channel, each from its own seed, so any
+# range of samples can be synthesized on its own and the output does not depend on the chunk size
+NOISE_BLOCK_SIZE = 2**16
+
+# Random streams of a channel, part of the spawn key of every block seed
+NOISE_STREAM = 0
+JITTER_STREAM = 1
+
+def adc_sample_dtype(data_width: int, signed: bool = False) -> np.dtype:
+    """
+    Smallest integer dtype that holds ADC samples of the given data width (uint16 or int16 for ADCs up to 16 bits).
+
+    Args:
+        data_width (int): Data width of the ADC.
+        signed (bool): Two's complement samples instead of offset binary.
+    """
+    for dtype in ((np.int16, np.int32, np.int64) if signed else (np.uint16, np.uint32, np.uint64)):
+        if data_width <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    raise ValueError(f"data_width {data_width} does not fit in a 64-bit sample")
+
+def channel_values(value, channels: int, name: str) -> np.ndarray:
+    """
+    Broadcast a per-channel setting, a scalar or one value per channel, to a float64 array of length channels.
+
+    Args:
+        value: Scalar or sequence of channel values.
+        channels (int): Number of channels.
+        name (str): Name of the setting, for the error message.
+    """
+    values = np.atleast_1d(np.asarray(value, dtype=np.float64))
+    if values.ndim != 1 or len(values) not in (1, channels):
+        raise ValueError(f"{name} needs 1 or {channels} values, got {len(values)}")
+    return np.broadcast_to(values, (channels,)).copy()
+
+class AdcStimulus:
+    """
+    Multi-channel ADC test signal: one sine per channel, with its own frequency, phase, amplitude, DC offset,
+    additive Gaussian noise and Gaussian aperture jitter, quantized to data_width bit samples.
+
+    Samples are synthesized chunk by chunk straight into an integer output array (or np.memmap), so the only
+    float64 data are the intermediates of one chunk. The noise and jitter come from seeds derived from
+    (seed, channel, stream, block) with np.random.SeedSequence, so a stimulus is reproducible from its seed
+    and every sample range can be synthesized independently of the others.
+    """
+
+    def __init__(self, data_width: int, sampling_rate: float, frequency, phase=0.0, amplitude=1.0, dc_offset=0.0,
+                 noise_rms=0.0, jitter_rms=0.0, channels: int = None, seed: int = 0, signed: bool = False):
+        """
+        Every per-channel setting takes a scalar for all channels or one value per channel.
+
+        Args:
+            data_width (int): Data width of the ADC.
+            sampling_rate (float): Sampling rate of the ADC.
+            frequency: Sine frequency of every channel.
+            phase: Sine phase of every channel in degrees.
+            amplitude: Sine amplitude of every channel as a fraction of full scale.
+            dc_offset: DC offset of every channel in LSB.
+            noise_rms: RMS of the additive Gaussian noise of every channel in LSB.
+            jitter_rms: RMS of the Gaussian aperture jitter of every channel in seconds.
+            channels (int): Number of channels (default: the longest per-channel setting).
+            seed (int): Seed of the noise and jitter.
+            signed (bool): Two's complement output centred on 0 instead of offset binary centred on mid-scale.
+        """
+        settings = {"frequency": frequency, "phase": phase, "amplitude": amplitude, "dc_offset": dc_offset,
+                    "noise_rms": noise_rms, "jitter_rms": jitter_rms}
+        if channels is None:
+            channels = max(np.size(value) for value in settings.values())
+        self.data_width = data_width
+        self.sampling_rate = sampling_rate
+        self.channels = channels
+        self.seed = seed
+        self.signed = signed
+        self.dtype = adc_sample_dtype(data_width, signed)
+        for name, value in settings.items():
+            setattr(self, name, channel_values(value, channels, name))
+        self.max_val = (2 ** data_width) - 1  # Maximum value for the unsigned range
+
+    def chunk_size(self) -> int:
+        """
+        Number of samples per channel synthesized at a time, a whole number of noise blocks.
+        """
+        return max(1, STIMULUS_CHUNK_ELEMENTS // self.channels // NOISE_BLOCK_SIZE) * NOISE_BLOCK_SIZE
+
+    def _random(self, channel: int, stream: int, start: int, stop: int) -> np.ndarray:
+        """
+        Standard normal values of one random stream of a channel, for samples start to stop.
+        """
+        values = np.empty(stop - start)
+        for block in range(start // NOISE_BLOCK_SIZE, (stop - 1) // NOISE_BLOCK_SIZE + 1):
+            block_start = block * NOISE_BLOCK_SIZE
+            first, last = max(start, block_start), min(stop, block_start + NOISE_BLOCK_SIZE)
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(channel, stream, block)))
+            values[first - start:last - start] = rng.standard_normal(last - block_start)[first - block_start:]
+        return values
+
+    def fill(self, out: np.ndarray, start: int = 0):
+        """
+        Synthesize samples start to start + len(out) of every channel into out.
+
+        Args:
+            out (np.ndarray): Integer array (or np.memmap) of shape (samples, channels), or (samples,) for one
+                              channel. Values are clipped to the ADC range and cast to its dtype on assignment.
+            start (int): Index of the first sample.
+        """
+        samples = out[:, None] if out.ndim == 1 else out
+        chunk_size = self.chunk_size()
+        angular_freq = 2 * np.pi * self.frequency
+        phase = np.deg2rad(self.phase)
+        low, high = (-(self.max_val + 1) // 2, self.max_val // 2) if self.signed else (0, self.max_val)
+
+        for offset in range(0, len(samples), chunk_size):
+            first = start + offset
+            count = min(chunk_size, len(samples) - offset)
+            # Sample times of every channel, moved by its aperture jitter
+            values = np.empty((count, self.channels))
+            values[:] = (np.arange(first, first + count) / self.sampling_rate)[:, None]
+            for channel in np.flatnonzero(self.jitter_rms):
+                values[:, channel] += self._random(channel, JITTER_STREAM, first, first + count) * self.jitter_rms[channel]
+            values *= angular_freq
+            values += phase
+            np.sin(values, out=values)
+            values *= self.amplitude
+            values += 1
+            values *= self.max_val / 2  # Shifted and scaled
+            values += self.dc_offset
+            for channel in np.flatnonzero(self.noise_rms):
+                values[:, channel] += self._random(channel, NOISE_STREAM, first, first + count) * self.noise_rms[channel]
+            np.rint(values, out=values)
+            if self.signed:
+                values -= (self.max_val + 1) // 2
+            np.clip(values, low, high, out=values)
+            samples[offset:offset + count] = values
+
+    def generate(self, num_samples: int, out: np.ndarray = None) -> np.ndarray:
+        """
+        Synthesize num_samples samples of every channel.
+
+        Args:
+            num_samples (int): Number of samples per channel.
+            out (np.ndarray): Array to write to, e.g. from open_stimulus_memmap (default: a new array).
+
+        Returns:
+            np.ndarray: Array of shape (num_samples, channels) in self.dtype, out if given.
+        """
+        if out is None:
+            out = np.empty((num_samples, self.channels), dtype=self.dtype)
+        self.fill(out[:num_samples])
+        return out
+
+    def iter_chunks(self, num_samples: int, chunk_size: int = None):
+        """
+        Synthesize num_samples samples of every channel chunk by chunk, so memory use does not grow with num_samples.
+
+        Args:
+            num_samples (int): Number of samples per channel.
+            chunk_size (int): Number of samples per chunk (default: chunk_size()).
+
+        Yields:
+            tuple: (start, samples) where samples has shape (chunk, channels). The array is reused for the
+                   next chunk, copy it to keep it.
+        """
+        chunk_size = chunk_size or self.chunk_size()
+        buffer = np.empty((min(chunk_size, num_samples), self.channels), dtype=self.dtype)
+        for start in range(0, num_samples, chunk_size):
+            samples = buffer[:min(chunk_size, num_samples - start)]
+            self.fill(samples, start)
+            yield start, samples
+
+    def write(self, filename, num_samples: int, file_format='bin', chunk_size: int = None):
+        """
+        Stream the stimulus to a file chunk by chunk.
+
+        Args:
+            filename (str): Name of the output file.
+            num_samples (int): Number of samples per channel.
+            file_format (str): 'bin' for raw little-endian samples in self.dtype, interleaved by channel with
+                               no header, or 'csv' for Sample,Amplitude rows (Sample,Channel0,Channel1,... for
+                               several channels).
+            chunk_size (int): Number of samples synthesized and written at a time.
+        """
+        if file_format not in ('csv', 'bin'):
+            raise ValueError(f"Unknown file_format '{file_format}', expected 'csv' or 'bin'")
+
+        dtype = self.dtype.newbyteorder('<')
+        with open(filename, 'wb' if file_format == 'bin' else 'w') as file:
+            if file_format == 'csv':
+                columns = ["Amplitude"] if self.channels == 1 else [f"Channel{channel}" for channel in range(self.channels)]
+                file.write(",".join(["Sample"] + columns) + "\n")
+            for start, samples in self.iter_chunks(num_samples, chunk_size):
+                if file_format == 'bin':
+                    samples.astype(dtype, copy=False).tofile(file)
+                else:
+                    np.savetxt(file, np.column_stack((np.arange(start, start + len(samples)), samples)), delimiter=",", fmt='%d')
+
+def open_stimulus_memmap(filename, num_samples: int, channels: int, dtype) -> np.memmap:
+    """
+    Create a raw sample file of the given shape and memory-map it for AdcStimulus.generate to write to.
+
+    Args:
+        filename (str): Name of the file.
+        num_samples (int): Number of samples per channel.
+        channels (int): Number of channels.
+        dtype: Sample dtype, stored little-endian.
+    """
+    return np.memmap(filename, dtype=np.dtype(dtype).newbyteorder('<'), mode='w+', shape=(num_samples, channels))
@@ -38,11 +38,84 @@ while [[ "$#" -gt 0 ]]; do
                 exit 1
             fi
             ;;
+        --double_buffer)
+            flag_string="${flag_string} --double_buffer"
+            shift
+            ;;
+        --captures)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --captures $2"
+                shift 2
+            else
+                echo "Error: --captures requires a value"
+                exit 1
+            fi
+            ;;
         --no_generate)
             NO_GENERATE=true
             flag_string="${flag_string} --no_generate"
             shift
             ;;
+        --output_format)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --output_format $2"
+                shift 2
+            else
+                echo "Error: --output_format requires a value"
+                exit 1
+            fi
+            ;;
+        --output_dir)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --output_dir $2"
+                shift 2
+            else
+                echo "Error: --output_dir requires a value"
+                exit 1
+            fi
+            ;;
+        --dry_run)
+            flag_string="${flag_string} --dry_run"
+            shift
+            ;;
+        --frequencies|--phases|--amplitudes|--dc_offsets|--noise_rms|--jitter_rms)
+            flag_string="${flag_string} $1"
+            shift
+            while [[ "$#" -gt 0 && "$1" != --* ]]; do
+                flag_string="${flag_string} $1"
+                shift
+            done
+            ;;
+        --seed)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --seed $2"
+                shift 2
+            else
+                echo "Error: --seed requires a value"
+                exit 1
+            fi
+            ;;
+        --signed)
+            flag_string="${flag_string} --signed"
+            shift
+            ;;
+        --profile|--profile_format)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} $1 $2"
+                shift 2
+            else
+                echo "Error: $1 requires a value"
+                exit 1
+            fi
+            ;;
+        --profile_stage)
+            shift
+            flag_string="${flag_string} --profile_stage"
+            while [[ "$#" -gt 0 && "$1" != --* ]]; do
+                flag_string="${flag_string} $1"
+                shift
+            done
+            ;;
         --plot)
             PLOT=true
             flag_string="${flag_string} --plot"
@@ -62,8 +135,24 @@ while [[ "$#" -gt 0 ]]; do
             echo "Usage: generate_adc_readout_modules.sh [OPTIONS]"
             echo "Options:"
             echo "  --data_width        Set the data width of the ADC readout"
-            echo "  --buffer_size       Set the buffer size for the ADC readout"
+            echo "  --buffer_size       Set the buffer size for the ADC readout (per bank with --double_buffer)"
+            echo "  --double_buffer     Capture continuously into two banks, one is read out while the other fills"
+            echo "  --captures          Number of captures the simulated ADC output covers (default: 1, or 4 with --double_buffer)"
             echo "  --no_generate       Skip generation of ADC readout modules"
+            echo "  --output_format     Simulated ADC output format: csv (default) or bin (raw little-endian 16-bit samples, up to 16-bit ADCs)"
+            echo "  --dry_run           Print a diff of the verilog module changes instead of writing them"
+            echo "  --output_dir        Write the generated modules to this directory instead of updating them in place"
+            echo "  --frequencies       Sine frequency of every channel of the simulated ADC output, one value per channel"
+            echo "  --phases            Phase of every channel in degrees"
+            echo "  --amplitudes        Amplitude of every channel as a fraction of full scale"
+            echo "  --dc_offsets        DC offset of every channel in LSB"
+            echo "  --noise_rms         RMS of the additive Gaussian noise of every channel in LSB"
+            echo "  --jitter_rms        RMS of the aperture jitter of every channel in seconds"
+            echo "  --seed              Seed of the noise and jitter (default: 0)"
+            echo "  --signed            Write two's complement samples instead of offset binary"
+            echo "  --profile           Time the generation stages and write the profile to the given file"
+            echo "  --profile_format    Profile file format: json (default) or chrome (chrome://tracing, Perfetto)"
+            echo "  --profile_stage     Stages to run under cProfile, e.g. --profile_stage export_adc_stream"
             echo "  --plot_sim          Plot the simulated ADC readout output"
             echo "  --sim_adc           Simulate the ADC readout module"
             echo "                      Usage: --sim_adc x y z where x is the wave frequency, y is the number of adc output samples, and z is the sample rate"
@@ -1,68 +1,127 @@
 import argparse
 import os
+import sys
 import math
-import matplotlib.pyplot as plt
 import numpy as np
-import re
+from adc_stimulus import AdcStimulus, adc_sample_dtype
 
 MODULE_ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
 ADC_OUTPUT_SIMULATION_PATH = os.path.join(MODULE_ROOT_PATH, 'simulate/')
 
-def update_verilog_parameters(parameters: dict, filename):
+# helpers shared by the verilog module generators
+sys.path.append(os.path.join(MODULE_ROOT_PATH, '..', 'common'))
+from verilog_rewrite import update_parameter_files
+from decimated_plot import plot_decimated
+from pipeline_profile import add_profile_arguments, finish_profile, profile_from_arguments
+
+def update_verilog_parameters(parameters: dict, filename, dry_run=False):
     """
     Update the parameters in the Verilog file with the given dictionary.
 
     Args:
         parameters (dict): Dictionary containing the parameter names and values.
         filename (str): Name of the Verilog file
+        dry_run (bool): Print the changes instead of writing the file.
+
+    Returns:
+        bool: True if the file changed (or would change on a dry run).
     """
 
-    file_path = os.path.join(MODULE_ROOT_PATH, filename)
+    return bool(update_verilog_modules({filename: parameters}, dry_run))
 
-    with open(file_path, 'r') as file:
-        content = file.read()
+def update_verilog_modules(updates: dict, dry_run=False, output_dir=None):
+    """
+    Update the parameters of several Verilog modules in a single pass.
 
-    # Regex pattern to match Verilog parameters (e.g., parameter NAME = VALUE)
-    pattern = r"parameter\s+(\w+)\s*=\s*(\d+)"
+    Files whose parameters already have the given values are not rewritten.
 
-    # Function to replace the parameter value
-    def replacer(match):
-        param_name = match.group(1)
-        # Replace the parameter value if it's in the dictionary
-        if param_name in parameters:
-            new_value = parameters[param_name]
-            return f"parameter {param_name} = {new_value}"
-        return match.group(0)  # Keep the original line if parameter not in dictionary
-    
-    # replace the parameters in the verilog file
-    updated_verilog_content = re.sub(pattern, replacer, content)
+    Args:
+        updates (dict): Dictionary mapping Verilog file names to dictionaries of parameter names and values.
+        dry_run (bool): Print the changes instead of writing the files.
+        output_dir (str): Write the updated modules to this directory instead of updating them in place,
+                          the modules in the ADC readout module directory are used as templates.
 
-    with open(file_path, 'w') as file:
-        file.write(updated_verilog_content)
+    Returns:
+        list: The names of the files that changed (or would change on a dry run).
+    """
 
+    paths = {filename: os.path.join(output_dir or MODULE_ROOT_PATH, filename) for filename in updates}
+    sources = {paths[filename]: os.path.join(MODULE_ROOT_PATH, filename) for filename in updates}
+    changed = update_parameter_files({paths[filename]: parameters for filename, parameters in updates.items()}, dry_run, sources)
+    return [filename for filename in updates if paths[filename] in changed]
 
-def update_adc_readout(DATA_WIDTH: int):
+def adc_readout_parameters(DATA_WIDTH: int, BUFFER_SIZE: int = 4096, DOUBLE_BUFFER: bool = False):
+    """
+    Parameters of the ADC readout module, also used for adc_readout_top.v.
+
+    Args:
+        DATA_WIDTH (int): Data width of the ADC readout module.
+        BUFFER_SIZE (int): Samples per capture, per bank with DOUBLE_BUFFER.
+        DOUBLE_BUFFER (bool): Capture continuously into two banks, one is read out while the other fills.
+    """
+
+    parameters = adc_buffer_parameters(DATA_WIDTH, BUFFER_SIZE)
+    parameters["DOUBLE_BUFFER"] = int(DOUBLE_BUFFER)
+    return parameters
+
+def adc_buffer_parameters(DATA_WIDTH: int, BUFFER_SIZE: int):
+    """
+    Parameters of the ADC buffer module.
+
+    Args:
+        DATA_WIDTH (int): Data width of the ADC buffer module.
+        BUFFER_SIZE (int): Size of the buffer.
+    """
+
+    if BUFFER_SIZE < 2:
+        raise ValueError(f"BUFFER_SIZE must be at least 2, got {BUFFER_SIZE}")
+    return {"DATA_WIDTH": DATA_WIDTH, "BUFFER_SIZE": BUFFER_SIZE, "ADDR_WIDTH": math.ceil(math.log2(BUFFER_SIZE))}
+
+def update_adc_readout(DATA_WIDTH: int, BUFFER_SIZE: int = 4096, DOUBLE_BUFFER: bool = False, dry_run=False):
     """
     Update the parameters in the ADC readout module with the given dictionary.
 
     Args:
         DATA_WIDTH (int): Data width of the ADC readout module.
+        BUFFER_SIZE (int): Samples per capture, per bank with DOUBLE_BUFFER.
+        DOUBLE_BUFFER (bool): Capture continuously into two banks.
+        dry_run (bool): Print the changes instead of writing the file.
     """
 
-    parameters = {"DATA_WIDTH": DATA_WIDTH}
-    update_verilog_parameters(parameters, 'adc_readout.v')
+    return update_verilog_parameters(adc_readout_parameters(DATA_WIDTH, BUFFER_SIZE, DOUBLE_BUFFER), 'adc_readout.v', dry_run)
 
-def update_adc_buffer(DATA_WIDTH: int, BUFFER_SIZE: int):
+def update_adc_buffer(DATA_WIDTH: int, BUFFER_SIZE: int, dry_run=False):
     """
     Update the parameters in the ADC buffer module with the given dictionary.
 
     Args:
         DATA_WIDTH (int): Data width of the ADC buffer module.
         BUFFER_SIZE (int): Size of the buffer.
+        dry_run (bool): Print the changes instead of writing the file.
     """
 
-    parameters = {"DATA_WIDTH": DATA_WIDTH, "BUFFER_SIZE": BUFFER_SIZE, "ADDR_WIDTH": math.ceil(math.log2(BUFFER_SIZE))}
-    update_verilog_parameters(parameters, 'adc_buffer.v')
+    return update_verilog_parameters(adc_buffer_parameters(DATA_WIDTH, BUFFER_SIZE), 'adc_buffer.v', dry_run)
+
+# Number of samples generated per chunk by the streaming ADC stimulus
+STIMULUS_CHUNK_SIZE = 2**20
+
+def iter_adc_output(data_width: int, num_samples: int, frequency: float, sampling_rate: float, chunk_size: int = STIMULUS_CHUNK_SIZE):
+    """
+    Generate the simulated ADC output in chunks, so memory use does not grow with num_samples.
+
+    Args:
+        data_width (int): Data width of the ADC.
+        num_samples (int): Number of samples to generate.
+        frequency (float): Frequency of the sine wave.
+        sampling_rate (float): Sampling rate of the ADC.
+        chunk_size (int): Number of samples per chunk.
+
+    Yields:
+        tuple: (start, samples) where start is the index of the first sample in the chunk and samples is an
+               array in adc_sample_dtype(data_width), identical to the same slice of simulate_adc_output.
+    """
+    for start, samples in AdcStimulus(data_width, sampling_rate, frequency).iter_chunks(num_samples, chunk_size):
+        yield start, samples[:, 0].copy()
 
 def simulate_adc_output(data_width: int, num_samples: int, frequency: float, sampling_rate: float):
     """
@@ -75,15 +134,10 @@ def simulate_adc_output(data_width: int, num_samples: int, frequency: float, sam
         sampling_rate (float): Sampling rate of the ADC.
 
     Returns:
-        np.ndarray: Array containing the simulated ADC output.
+        np.ndarray: Array containing the simulated ADC output, in adc_sample_dtype(data_width).
     """
-    t = np.arange(num_samples) / sampling_rate
-    amplitude = 1
-    angularFreq = 2 * np.pi * frequency
-
-    max_val = (2 ** data_width) - 1  # Maximum value for the unsigned range
-    sine_wave = amplitude * np.sin(angularFreq * t)
-    adc_output = np.round((sine_wave + 1) * (max_val / 2)).astype(int)  # Shifted and scaled
+    adc_output = np.empty(num_samples, dtype=adc_sample_dtype(data_width))
+    AdcStimulus(data_width, sampling_rate, frequency).fill(adc_output)
     return range(num_samples), adc_output
 
 def export_to_csv(data, filename):
@@ -97,6 +151,42 @@ def export_to_csv(data, filename):
     x, y = data
     np.savetxt(filename, np.column_stack((x, y)), delimiter=",", fmt='%d', header="Sample,Amplitude", comments='')
 
+def export_adc_stream(filename, data_width: int, num_samples: int, frequency: float, sampling_rate: float, file_format='csv', chunk_size: int = STIMULUS_CHUNK_SIZE):
+    """
+    Stream the simulated ADC output to a file chunk by chunk.
+
+    Args:
+        filename (str): Name of the output file.
+        data_width (int): Data width of the ADC.
+        num_samples (int): Number of samples to generate.
+        frequency (float): Frequency of the sine wave.
+        sampling_rate (float): Sampling rate of the ADC.
+        file_format (str): 'csv' for the Sample,Amplitude CSV written by export_to_csv, or 'bin' for raw
+                           little-endian samples in adc_sample_dtype(data_width), with no header.
+        chunk_size (int): Number of samples generated and written at a time.
+    """
+    AdcStimulus(data_width, sampling_rate, frequency).write(filename, num_samples, file_format, chunk_size)
+
+def read_adc_binary(filename, data_width: int, channels: int = 1, signed: bool = False) -> np.ndarray:
+    """
+    Memory-map a raw ADC sample file written by export_adc_stream or AdcStimulus.write.
+
+    Args:
+        filename (str): Name of the binary file.
+        data_width (int): Data width of the ADC the file was written for.
+        channels (int): Number of interleaved channels in the file.
+        signed (bool): The file holds two's complement samples.
+
+    Returns:
+        np.memmap: Read-only array of the samples, of shape (samples, channels) for several channels.
+                   Pages are only read from disk when accessed.
+    """
+    dtype = adc_sample_dtype(data_width, signed).newbyteorder('<')
+    if os.path.getsize(filename) == 0:
+        return np.zeros(0 if channels == 1 else (0, channels), dtype=dtype)
+    samples = np.memmap(filename, dtype=dtype, mode='r')
+    return samples if channels == 1 else samples.reshape(-1, channels)
+
 def plotSineWave(sine_table: np.ndarray):
     """
     Plots a sine wave using the provided sine table.
@@ -104,8 +194,9 @@ def plotSineWave(sine_table: np.ndarray):
     :param sine_table: A numpy array containing the sine wave values to be plotted.
     :type sine_table: np.ndarray
     """
+    import matplotlib.pyplot as plt
 
-    plt.step(*sine_table, where='mid')
+    plot_decimated(*sine_table, where='mid')
     plt.title('Simulated ADC Output')
     plt.xlabel('Samples')
     plt.ylabel('Value')
@@ -116,35 +207,95 @@ def main():
     parser = argparse.ArgumentParser(description='Generate Verilog modules for ADC readout')
     parser.add_argument('--data_width', type=int, default=12, help='Data width of the ADC readout module')
     parser.add_argument('--buffer_size', type=int, default=4096, help='Size of the buffer')
+    parser.add_argument('--double_buffer', action='store_true', help='Capture continuously into two banks of buffer_size samples, one is read out while the other fills.')
+    parser.add_argument('--captures', type=int, default=None, help='Number of captures (banks with --double_buffer) the simulated ADC output covers when --sim_adc gives no sample count (default: 1, or 4 with --double_buffer).')
     parser.add_argument('--no_generate', action='store_true', help='Do not generate and update the sine wave verilog modules.')
-    parser.add_argument('--sim_adc',type=int, nargs='+', default=1, help='Simulate the ADC output and export to a CSV file: x y z where x is the wave frequency, y is the number of adc output samples, and z is the sample rate')
+    parser.add_argument('--sim_adc',type=int, nargs='+', default=None, help='Simulate the ADC output and export to a CSV file: x y z where x is the wave frequency, y is the number of adc output samples (default: enough for --captures), and z is the sample rate')
+    parser.add_argument('--frequencies', type=float, nargs='+', default=None, help='Sine frequency of every channel of the simulated ADC output, one value per channel (default: the --sim_adc frequency).')
+    parser.add_argument('--phases', type=float, nargs='+', default=[0.0], help='Phase of every channel in degrees, one value or one per channel (default: 0).')
+    parser.add_argument('--amplitudes', type=float, nargs='+', default=[1.0], help='Amplitude of every channel as a fraction of full scale (default: 1).')
+    parser.add_argument('--dc_offsets', type=float, nargs='+', default=[0.0], help='DC offset of every channel in LSB (default: 0).')
+    parser.add_argument('--noise_rms', type=float, nargs='+', default=[0.0], help='RMS of the additive Gaussian noise of every channel in LSB (default: 0).')
+    parser.add_argument('--jitter_rms', type=float, nargs='+', default=[0.0], help='RMS of the aperture jitter of every channel in seconds (default: 0).')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the noise and jitter of the simulated ADC output (default: 0).')
+    parser.add_argument('--signed', action='store_true', help='Write two\'s complement samples (int16 up to 16 bits) instead of offset binary (uint16).')
+    parser.add_argument('--output_format', choices=['csv', 'bin'], default='csv', help='Write the simulated ADC output as CSV (adc_output.csv) or raw little-endian 16-bit samples (adc_output.bin, ADCs up to 16 bits, as sim_main_adc_readout.cpp reads them).')
+    parser.add_argument('--chunk_size', type=int, default=STIMULUS_CHUNK_SIZE, help='Number of ADC samples generated and written at a time.')
     parser.add_argument('--plot', action='store_true', help='Plot the simulated ADC output')
+    parser.add_argument('--dry_run', action='store_true', help='Print a diff of the verilog module changes instead of writing them.')
+    parser.add_argument('--output_dir', type=str, default=None, help='Write the generated modules and simulated ADC output to this directory instead of the ADC readout module directories.')
+    add_profile_arguments(parser)
     args = parser.parse_args()
+    if args.output_format == 'bin' and args.data_width > 16:
+        # sim_main_adc_readout.cpp and adc_readout_model.py read binary stimulus as 16-bit samples
+        parser.error(f"--output_format bin holds 16-bit samples, use csv for a data_width of {args.data_width}")
 
     data_width = args.data_width
     buffer_size = args.buffer_size
+    double_buffer = args.double_buffer
+    captures = args.captures if args.captures is not None else (4 if double_buffer else 1)
+
+    profile = profile_from_arguments(args, 'generate_modules_adc_readout')
+    with profile:
+        profile.record("data_width", data_width)
+        profile.record("buffer_size", buffer_size)
+        profile.record("double_buffer", double_buffer)
+
+        if args.output_dir and not args.dry_run:
+            os.makedirs(args.output_dir, exist_ok=True)
+
+        if not args.no_generate:
+            print("Generating ADC readout modules...")
+            print(f"Data width: {data_width}")
+            print(f"Buffer size: {buffer_size}{' per bank, double buffered' if double_buffer else ''}")
+            # Update all modules in one pass, files whose parameters already match are left untouched
+            readout_parameters = adc_readout_parameters(data_width, buffer_size, double_buffer)
+            with profile.stage('update_verilog_modules') as stage:
+                changed = update_verilog_modules({
+                    'adc_readout.v': readout_parameters,
+                    'adc_readout_top.v': readout_parameters,
+                    'adc_buffer.v': adc_buffer_parameters(data_width, buffer_size),
+                }, dry_run=args.dry_run, output_dir=args.output_dir)
+                stage["changed_files"] = len(changed)
+            for filename in ['adc_readout.v', 'adc_readout_top.v', 'adc_buffer.v']:
+                print(f"{filename} {'updated' if filename in changed else 'unchanged'}")
+
+        if args.sim_adc:
+            frequency = args.sim_adc[0]
+            frequencies = args.frequencies if args.frequencies else [frequency]
+            # The capture starts writing on the edge after start_capture, so one extra sample is consumed
+            num_samples = args.sim_adc[1] if len(args.sim_adc) > 1 else 1 + captures * buffer_size
+            sampling_rate = args.sim_adc[2] if len(args.sim_adc) > 2 else 100
+
+            stimulus = AdcStimulus(data_width, sampling_rate, frequencies, args.phases, args.amplitudes, args.dc_offsets,
+                                   args.noise_rms, args.jitter_rms, seed=args.seed, signed=args.signed)
+
+            print(f"Simulating ADC output: Frequency={', '.join(f'{value:g}' for value in stimulus.frequency)}, Num Samples={num_samples}, Sampling Rate={sampling_rate}, Channels={stimulus.channels}")
+
+            # stream the ADC output to a file in bounded-size chunks
+            output_path = os.path.join(args.output_dir or ADC_OUTPUT_SIMULATION_PATH, f'adc_output.{args.output_format}')
+            with profile.stage('export_adc_stream', num_samples=num_samples, channels=stimulus.channels, file_format=args.output_format, chunk_size=args.chunk_size) as stage:
+                stimulus.write(output_path, num_samples, args.output_format, args.chunk_size)
+                stage["bytes"] = os.path.getsize(output_path)
+            profile.count('files_written')
+            profile.count('bytes_written', os.path.getsize(output_path))
+            print(f"ADC output written to {output_path}")
+            if stimulus.channels == 1 and not args.signed:
+                # sim_main_adc_readout.cpp reads single channel offset binary samples
+                print(f"Expected read out: python simulate/adc_readout_model.py --input {output_path} --captures {captures} --sim_time {num_samples + buffer_size}")
+
+            if args.plot:
+                print("Plotting the simulated ADC output...")
+                with profile.stage('plotSineWave'):
+                    # The first channel is plotted
+                    if args.output_format == 'bin':
+                        samples = read_adc_binary(output_path, data_width, stimulus.channels, args.signed)
+                    else:
+                        samples = stimulus.generate(num_samples)
+                    samples = samples.reshape(len(samples), stimulus.channels)[:, 0]
+                    plotSineWave((range(len(samples)), samples))
 
-    if not args.no_generate:
-        print("Generating ADC readout modules...")
-        print(f"Data width: {data_width}")
-        print(f"Buffer size: {buffer_size}")   
-        update_adc_readout(data_width)
-        update_adc_buffer(data_width, buffer_size)
-   
-    if args.sim_adc:
-        frequency = args.sim_adc[0]
-        num_samples = args.sim_adc[1] if len(args.sim_adc) > 1 else 4096
-        sampling_rate = args.sim_adc[2] if len(args.sim_adc) > 2 else 100
-
-        print(f"Simulating ADC output: Frequency={frequency}, Num Samples={num_samples}, Sampling Rate={sampling_rate}")
-        adc_output = simulate_adc_output(data_width, num_samples, frequency, sampling_rate)
-
-        # export the ADC output to a CSV file
-        export_to_csv(adc_output, os.path.join(ADC_OUTPUT_SIMULATION_PATH, 'adc_output.csv'))
-
-        if args.plot:
-            print("Plotting the simulated ADC output...")
-            plotSineWave(adc_output)
+    finish_profile(profile, args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,238 @@
+import argparse
+import os
+import sys
+import numpy as np
+
+# Root directory of the adc readout verilog modules
+MODULE_ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# helpers shared by the verilog modules
+sys.path.append(os.path.join(MODULE_ROOT_PATH, '..', 'common'))
+from verilog_rewrite import PARAMETER_PATTERN
+
+# Number of reset half periods sim_main_adc_readout.cpp applies before the capture is started
+TESTBENCH_RESET_STEPS = 5
+
+class AdcReadoutModel:
+    """
+    Cycle-accurate model of adc_readout.v and the adc_buffer.v instance it holds.
+
+    Registers and the buffer start at zero, as they do in a Verilator model.
+    """
+
+    def __init__(self, DATA_WIDTH=12, BUFFER_SIZE=4096, DOUBLE_BUFFER=False):
+        """
+        :param DATA_WIDTH: Width of the ADC samples.
+        :param BUFFER_SIZE: Samples per capture, per bank with DOUBLE_BUFFER.
+        :param DOUBLE_BUFFER: Continuous ping-pong capture into two banks.
+        """
+        self.DATA_WIDTH = DATA_WIDTH
+        self.BUFFER_SIZE = BUFFER_SIZE
+        self.DOUBLE_BUFFER = bool(DOUBLE_BUFFER)
+        self.memory = np.zeros(2 * BUFFER_SIZE if self.DOUBLE_BUFFER else BUFFER_SIZE, dtype=np.int64)
+        self.read_data = 0        # adc_buffer.data_out, not reset
+        self.reset_state()
+
+    def reset_state(self):
+        """
+        Put the capture registers of adc_readout back to their reset value of zero.
+        """
+        self.write_ptr = 0
+        self.write_bank = 0       # stays 0 without DOUBLE_BUFFER
+        self.capturing = 0
+        self.capture_done = 0
+
+    @property
+    def read_bank(self) -> int:
+        """
+        Bank read through read_addr, the one not being filled.
+        """
+        return 1 - self.write_bank if self.DOUBLE_BUFFER else 0
+
+    def buffer_address(self, address: int, bank: int) -> int:
+        """
+        Address in adc_buffer of an address within a bank.
+        """
+        return bank * self.BUFFER_SIZE + address
+
+    def posedge(self, reset: bool, start_capture: bool, adc_data: int, read_addr: int):
+        """
+        Advance the model by one rising clock edge, with non-blocking assignments.
+        """
+        if reset:
+            # adc_buffer wipes its memory on a clock edge in reset and holds data_out
+            self.memory[:] = 0
+            self.reset_state()
+            return
+
+        # adc_buffer: the read returns the memory content from before this edge's write
+        read_data = int(self.memory[self.buffer_address(read_addr, self.read_bank)])
+        if self.capturing:
+            self.memory[self.buffer_address(self.write_ptr, self.write_bank)] = adc_data & ((1 << self.DATA_WIDTH) - 1)
+        self.read_data = read_data
+
+        capturing, capture_done, write_ptr, write_bank = self.capturing, self.capture_done, self.write_ptr, self.write_bank
+        last_address = self.write_ptr == self.BUFFER_SIZE - 1
+        if self.DOUBLE_BUFFER:
+            if start_capture and not self.capturing:
+                capturing = 1
+            capture_done = 0
+            if self.capturing:
+                if last_address:
+                    write_ptr, write_bank, capture_done = 0, 1 - self.write_bank, 1
+                else:
+                    write_ptr = self.write_ptr + 1
+        else:
+            if start_capture and not self.capturing and not self.capture_done:
+                capturing = 1
+            if self.capturing:
+                if last_address:
+                    capturing, capture_done = 0, 1
+                else:
+                    write_ptr = self.write_ptr + 1
+        self.capturing, self.capture_done, self.write_ptr, self.write_bank = capturing, capture_done, write_ptr, write_bank
+
+    def outputs(self):
+        """
+        Current (capture_done, read_bank, read_data) outputs of adc_readout.
+        """
+        return self.capture_done, self.read_bank, self.read_data
+
+def capture_banks(samples, BUFFER_SIZE: int, captures: int, first_sample: int = 1) -> np.ndarray:
+    """
+    Samples each capture of a continuous stream holds, without stepping the model cycle by cycle.
+
+    The first write happens on the edge after start_capture is sampled, so with the testbench's stimulus
+    capture k holds samples first_sample + k*BUFFER_SIZE onward. Without DOUBLE_BUFFER only capture 0 exists.
+    Samples past the end of the stream are 0, as the testbench drives once its input file is exhausted.
+
+    :return: An int64 array of shape (captures, BUFFER_SIZE).
+    """
+    samples = np.asarray(samples, dtype=np.int64)
+    stream = np.zeros(first_sample + captures * BUFFER_SIZE, dtype=np.int64)
+    available = min(len(samples), len(stream))
+    stream[:available] = samples[:available]
+    return stream[first_sample:].reshape(captures, BUFFER_SIZE)
+
+def simulate_testbench(samples, sim_time: int, DATA_WIDTH=12, BUFFER_SIZE=4096, DOUBLE_BUFFER=False, captures: int = 1) -> dict:
+    """
+    Reproduce a run of sim_main_adc_readout.cpp and the capture,address,data rows it writes with --output.
+
+    The testbench holds start_capture over the first rising edge after reset, feeds one sample per edge,
+    and reads every completed capture out over the following BUFFER_SIZE edges, while the next bank fills
+    with DOUBLE_BUFFER.
+
+    :param samples: The ADC stimulus, one sample per clock cycle.
+    :param sim_time: The --sim_time argument of the testbench, in clock cycles.
+    :param captures: The --captures argument, the number of captures read out before stopping.
+    :return: A dict of int64 arrays 'capture', 'address' and 'data', plus 'done_cycles', the testbench cycle
+             count at which every capture completed.
+    """
+    samples = np.asarray(samples, dtype=np.int64)
+    model = AdcReadoutModel(DATA_WIDTH, BUFFER_SIZE, DOUBLE_BUFFER)
+
+    # Reset sequence: rising edges on the first, third and fifth half period
+    for _ in range((TESTBENCH_RESET_STEPS + 1) // 2):
+        model.posedge(True, False, 0, 0)
+
+    rows = []
+    done_cycles = []
+    completed = 0
+    read_capture = None
+    read_address = 0
+    capture_done = False
+    for cycle in range(sim_time):
+        reading = read_capture is not None
+        adc_data = int(samples[cycle]) if cycle < len(samples) else 0
+        model.posedge(False, cycle == 0, adc_data, read_address if reading else 0)
+
+        if reading:
+            rows.append((read_capture, read_address, model.read_data))
+            read_address += 1
+            if read_address == BUFFER_SIZE:
+                read_capture = None
+                if completed == captures:
+                    break
+
+        if model.capture_done and not capture_done and completed < captures:
+            done_cycles.append(cycle + 1)
+            read_capture, read_address = completed, 0
+            completed += 1
+        capture_done = bool(model.capture_done)
+
+    table = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return {'capture': table[:, 0], 'address': table[:, 1], 'data': table[:, 2], 'done_cycles': np.array(done_cycles, dtype=np.int64)}
+
+def read_verilog_parameters(filepath: str) -> dict:
+    """
+    Read the numeric parameters of a Verilog module.
+    """
+    with open(filepath, 'r') as file:
+        return {name: int(value) for name, value in PARAMETER_PATTERN.findall(file.read())}
+
+def load_adc_samples(filepath: str) -> np.ndarray:
+    """
+    Load the ADC stimulus the way sim_main_adc_readout.cpp reads it: the amplitude column of a CSV, or
+    raw little-endian uint16 samples from a .bin file.
+    """
+    if filepath.endswith('.bin'):
+        return np.fromfile(filepath, dtype='<u2').astype(np.int64)
+    return np.loadtxt(filepath, delimiter=',', skiprows=1, dtype=np.int64, usecols=1, ndmin=1)
+
+def read_capture_csv(filepath: str) -> dict:
+    """
+    Read a capture,address,data CSV written by sim_main_adc_readout.cpp --output.
+    """
+    data = np.loadtxt(filepath, delimiter=',', skiprows=1, dtype=np.int64, ndmin=2).reshape(-1, 3)
+    return {name: data[:, column] for column, name in enumerate(['capture', 'address', 'data'])}
+
+def compare_captures(expected: dict, actual: dict, max_report: int = 10) -> int:
+    """
+    Compare the model read out with the testbench read out row by row and print the first mismatches.
+
+    :return: The number of mismatching rows (a length difference counts every missing row).
+    """
+    rows = min(len(expected['data']), len(actual['data']))
+    mismatch = np.zeros(rows, dtype=bool)
+    for column in ['capture', 'address', 'data']:
+        mismatch |= expected[column][:rows] != actual[column][:rows]
+
+    for row in np.flatnonzero(mismatch)[:max_report]:
+        print("Mismatch at row {}: model capture={} address={} data={}, simulation capture={} address={} data={}".format(
+            row, *(expected[column][row] for column in ['capture', 'address', 'data']), *(actual[column][row] for column in ['capture', 'address', 'data'])))
+    missing = abs(len(expected['data']) - len(actual['data']))
+    if missing:
+        print("Read outs differ in length: model has {} rows, simulation has {}".format(len(expected['data']), len(actual['data'])))
+    return int(np.count_nonzero(mismatch)) + missing
+
+def main():
+    parser = argparse.ArgumentParser(description='Golden model of adc_readout.v, reproducing sim_main_adc_readout.cpp.')
+    parser.add_argument('--input', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'adc_output.csv'), help='ADC stimulus written by generate_modules_adc_readout.py --sim_adc (csv or bin).')
+    parser.add_argument('--sim_time', type=int, default=5000, help='Simulation time in clock cycles, as for the testbench (default: 5000).')
+    parser.add_argument('--captures', type=int, default=1, help='Number of captures read out before stopping, as for the testbench (default: 1).')
+    parser.add_argument('--output', default=None, help='Write the model read out to this capture,address,data CSV.')
+    parser.add_argument('--compare', default=None, help='Compare the model read out with a CSV written by the Verilator testbench.')
+    args = parser.parse_args()
+
+    parameters = read_verilog_parameters(os.path.join(MODULE_ROOT_PATH, 'adc_readout.v'))
+    samples = load_adc_samples(args.input)
+    readout = simulate_testbench(samples, args.sim_time, parameters['DATA_WIDTH'], parameters['BUFFER_SIZE'],
+                                 parameters['DOUBLE_BUFFER'], args.captures)
+    for capture, cycle in enumerate(readout['done_cycles']):
+        print("Capture {} complete at cycle {}".format(capture, cycle))
+    print("Read out {} samples of adc_readout with BUFFER_SIZE = {}{}".format(
+        len(readout['data']), parameters['BUFFER_SIZE'], " (double buffered)" if parameters['DOUBLE_BUFFER'] else ""))
+
+    if args.output:
+        np.savetxt(args.output, np.column_stack([readout[column] for column in ['capture', 'address', 'data']]), delimiter=',', fmt='%d', header='capture,address,data', comments='')
+        print("Model read out written to {}".format(args.output))
+
+    if args.compare:
+        mismatches = compare_captures(readout, read_capture_csv(args.compare))
+        if mismatches:
+            print("{} rows differ from {}".format(mismatches, args.compare))
+            raise SystemExit(1)
+        print("Model matches {}".format(args.compare))
+
+if __name__ == '__main__':
+    main()
@@ -3,29 +3,111 @@
 #include <iostream>
 #include <fstream>
 #include <string>
+#include <vector>
+#include <cstdint>
 #include <cstdlib>             // For std::atoi
 
+// Reads ADC samples from either the CSV (Sample,Amplitude) or the raw binary
+// (little-endian uint16) file written by generate_modules_adc_readout.py.
+// The generator only writes binary files for ADCs up to 16 bits, wider
+// stimulus has to go through the CSV.
+class AdcSampleReader {
+public:
+    explicit AdcSampleReader(const std::string& filename)
+        : binary(filename.size() >= 4 && filename.compare(filename.size() - 4, 4, ".bin") == 0),
+          file(filename, binary ? std::ios::binary : std::ios::in) {
+        if (file.is_open() && !binary) {
+            // Skip the CSV header line
+            std::string header;
+            std::getline(file, header);
+        }
+    }
+
+    bool is_open() const { return file.is_open(); }
+
+    // Read the next sample, returns false once the file is exhausted.
+    bool next(int& sample) {
+        if (binary) {
+            if (position == count) {
+                // Refill the block buffer with the next run of samples
+                file.read(reinterpret_cast<char*>(block.data()), block.size() * sizeof(uint16_t));
+                count = static_cast<size_t>(file.gcount()) / sizeof(uint16_t);
+                position = 0;
+                if (count == 0) return false;
+            }
+            const uint8_t* bytes = reinterpret_cast<const uint8_t*>(&block[position++]);
+            sample = bytes[0] | (bytes[1] << 8);
+            return true;
+        }
+        std::string line;
+        if (!std::getline(file, line)) return false;
+        // The amplitude is the second column, fall back to the whole line for single-column files
+        size_t comma = line.find(',');
+        sample = std::stoi(comma == std::string::npos ? line : line.substr(comma + 1));
+        return true;
+    }
+
+private:
+    bool binary;
+    std::ifstream file;
+    std::vector<uint16_t> block = std::vector<uint16_t>(1 << 16);
+    size_t position = 0;
+    size_t count = 0;
+};
+
 int main(int argc, char** argv) {
     // Create and configure the Verilator simulation context.
     VerilatedContext* contextp = new VerilatedContext;
     contextp->commandArgs(argc, argv);
 
     int sim_time = 5000;
+    int buffer_size = 4096;
+    int captures = 1;
+    std::string input_filename = "adc_output.csv";
+    std::string output_filename;
+
+    // Retrieve command line arguments
+    for (int i = 1; i < argc; i++) {
+        if (std::string(argv[i]) == "--sim_time" && i + 1 < argc) {
+            sim_time = std::atoi(argv[i + 1]);
+        }
+        if (std::string(argv[i]) == "--input" && i + 1 < argc) {
+            input_filename = argv[i + 1];
+        }
+        // BUFFER_SIZE of adc_readout.v, the number of addresses read out per capture
+        if (std::string(argv[i]) == "--buffer_size" && i + 1 < argc) {
+            buffer_size = std::atoi(argv[i + 1]);
+        }
+        // Number of captures (banks with DOUBLE_BUFFER) to read out before stopping
+        if (std::string(argv[i]) == "--captures" && i + 1 < argc) {
+            captures = std::atoi(argv[i + 1]);
+        }
+        // Write the read out samples as capture,address,data rows
+        if (std::string(argv[i]) == "--output" && i + 1 < argc) {
+            output_filename = argv[i + 1];
+        }
+    }
 
 
     // Instantiate the top module (adc_readout)
     Vadc_readout* top = new Vadc_readout(contextp);
 
-    // Open the ADC output CSV file.
-    std::ifstream adc_file("adc_output.csv");
+    // Open the ADC output file (adc_output.csv, or the raw adc_output.bin with --input).
+    AdcSampleReader adc_file(input_filename);
     if (!adc_file.is_open()) {
-        std::cerr << "Error: Could not open adc_output.csv" << std::endl;
+        std::cerr << "Error: Could not open " << input_filename << std::endl;
         return 1;
     }
 
-    // Optionally, skip a header line if your CSV contains one.
-    // std::string header;
-    // std::getline(adc_file, header);
+    std::ofstream output_file;
+    if (!output_filename.empty()) {
+        output_file.open(output_filename);
+        if (!output_file.is_open()) {
+            std::cerr << "Error: Could not open " << output_filename << std::endl;
+            return 1;
+        }
+        output_file << "capture,address,data\n";
+    }
 
     // Set initial signal values.
     top->adc_clock    = 0;
@@ -42,46 +124,60 @@ int main(int argc, char** argv) {
     }
     top->reset = 0; // Deassert reset
 
-    // Begin capture: assert start_capture for one clock cycle.
+    // Begin capture: start_capture is held until the first rising edge of the main loop.
     top->start_capture = 1;
-    top->adc_clock = !top->adc_clock;
-    top->eval();
-    contextp->timeInc(1);
-    top->start_capture = 0;
 
     // Main simulation loop.
     int cycleCount = 0;
+    int completed = 0;        // Captures filled so far
+    int read_capture = -1;    // Capture being read out, -1 when idle
+    int read_address = 0;     // Next address to read from it
+    bool capture_done = false;
     while (!contextp->gotFinish() && cycleCount < sim_time) {
         // Toggle clock.
         top->adc_clock = !top->adc_clock;
 
-        // On rising edge, feed ADC data from the CSV file.
+        // On rising edge, feed ADC data from the input file and the next read address.
+        bool reading = false;
         if (top->adc_clock) {
-            std::string line;
-            if (std::getline(adc_file, line)) {
-                // Convert the CSV line to an integer (assumes one value per line).
-                int adc_val = std::stoi(line);
+            int adc_val;
+            if (adc_file.next(adc_val)) {
                 top->adc_data = adc_val;
             } else {
                 // If the file has been exhausted, you may choose to hold the last value or send 0.
                 top->adc_data = 0;
             }
+            reading = read_capture >= 0;
+            top->read_addr = reading ? read_address : 0;
         }
 
         // Evaluate the model.
         top->eval();
         contextp->timeInc(1);
 
-        // Increment cycle counter only on rising edge.
-        if (top->adc_clock) {
-            cycleCount++;
+        if (!top->adc_clock) continue;
+        top->start_capture = 0;
+        cycleCount++;
+
+        // The buffer read is synchronous, read_data holds the address driven on this edge.
+        if (reading) {
+            if (output_file.is_open()) {
+                output_file << read_capture << "," << read_address << "," << static_cast<int>(top->read_data) << "\n";
+            }
+            if (++read_address == buffer_size) {
+                read_capture = -1;
+                if (completed == captures) break;
+            }
         }
 
-        // Check if capture is complete.
-        if (top->capture_done) {
-            std::cout << "Capture complete at cycle " << cycleCount << std::endl;
-            break;
+        // A capture (or bank) is complete, read it out over the next buffer_size cycles.
+        if (top->capture_done && !capture_done && completed < captures) {
+            std::cout << "Capture " << completed << " complete at cycle " << cycleCount
+                      << " in bank " << static_cast<int>(top->read_bank) << std::endl;
+            read_capture = completed++;
+            read_address = 0;
         }
+        capture_done = top->capture_done;
     }
 
     // Finalise simulation.
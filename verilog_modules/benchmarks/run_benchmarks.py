@@ -0,0 +1,423 @@
+import argparse
+import ctypes
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+VERILOG_MODULES_PATH = os.path.join(BENCHMARKS_PATH, '..')
+SINE_WAVE_PATH = os.path.join(VERILOG_MODULES_PATH, 'sine_wave')
+
+# The generators are plain scripts, make them importable
+sys.path.append(os.path.join(VERILOG_MODULES_PATH, 'common'))
+sys.path.append(os.path.join(SINE_WAVE_PATH, 'generate'))
+sys.path.append(os.path.join(VERILOG_MODULES_PATH, 'adc_readout', 'generate'))
+
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARKS_PATH, 'benchmark_baseline.json')
+
+# A case is only flagged when it is slower (or uses more memory) than the baseline by more than the
+# threshold, and by more than these absolute amounts, so timer noise on tiny cases is not reported
+MIN_WALL_REGRESSION = 0.005
+MIN_MEMORY_REGRESSION = 1024 * 1024
+
+# ============ Benchmark registry ============ #
+# name -> (case generator, size parameter plotted on the x axis of the scaling curves)
+BENCHMARKS = {}
+
+def benchmark(name: str, size):
+    """
+    Register a benchmark. The decorated function takes (quick, workdir) and yields (params, run) pairs,
+    where run is a zero-argument callable doing the timed work. A run that does its work in another
+    process returns a dict with the "peak_bytes" of that process. Benchmarks without a size parameter
+    (size=None) are left out of the scaling curves.
+    """
+    def register(cases):
+        BENCHMARKS[name] = (cases, size)
+        return cases
+    return register
+
+@benchmark('generateSineTable', size='sampleCount')
+def generate_sine_table_cases(quick, workdir):
+    from generate_modules_sine import generateSineTable
+    bit_widths = [4, 8, 12, 16, 20]
+    sample_counts = [2**8, 2**12, 2**16] if quick else [2**8, 2**12, 2**16, 2**18, 2**20]
+    for bits in bit_widths:
+        for sampleCount in sample_counts:
+            yield {"bits": bits, "sampleCount": sampleCount}, lambda bits=bits, sampleCount=sampleCount: generateSineTable(bits, sampleCount)
+
+@benchmark('optimise_sampleCount', size='bits')
+def optimise_sample_count_cases(quick, workdir):
+    from generate_modules_sine import optimise_sampleCount
+    for bits in ([4, 6, 8] if quick else [4, 6, 8, 10, 12]):
+        yield {"bits": bits, "search": "exhaustive"}, lambda bits=bits: optimise_sampleCount(bits, search='exhaustive')
+    for bits in ([4] if quick else [4, 8]):
+        yield {"bits": bits, "search": "gp"}, lambda bits=bits: optimise_sampleCount(bits, search='gp')
+    # Fit-guided searches, with a fixed fit of the loss optima for bits 2 to 8 so the cases do not depend on
+    # the fit stored by --find_sample. Exhaustive searches only use the fit past EXHAUSTIVE_MAX_ELEMENTS
+    fit = {"a": 10.097, "b": 0.32, "c": -10.599}
+    for bits in ([14] if quick else [14, 16]):
+        yield {"bits": bits, "search": "exhaustive", "fit": True}, lambda bits=bits: optimise_sampleCount(bits, search='exhaustive', fit=fit)
+    for bits in ([8] if quick else [8, 12]):
+        yield {"bits": bits, "search": "gp", "fit": True}, lambda bits=bits: optimise_sampleCount(bits, search='gp', fit=fit)
+
+@benchmark('construct_sine_table_module', size='sampleCount')
+def construct_sine_table_module_cases(quick, workdir):
+    from generate_modules_sine import construct_sine_table_module, generateSineTable
+    for bits in ([8, 12] if quick else [4, 8, 12, 16, 20]):
+        sampleCount = min(4 * 2**bits, 2**16 if quick else 2**20)
+        sine_table = generateSineTable(bits, sampleCount)
+        for table_format in ('inline', 'hex'):
+            filename = os.path.join(workdir, 'half_sine_table_{}_{}.v'.format(bits, table_format))
+
+            def run(sine_table=sine_table, bits=bits, filename=filename, table_format=table_format):
+                # Remove the previous output so every run writes the module
+                for path in (filename, os.path.splitext(filename)[0] + '.mem'):
+                    if os.path.exists(path):
+                        os.remove(path)
+                construct_sine_table_module(sine_table, bits, filename=filename, table_format=table_format)
+
+            yield {"bits": bits, "sampleCount": sampleCount, "table_format": table_format}, run
+
+@benchmark('update_verilog_macros', size='bits')
+def update_verilog_macros_cases(quick, workdir):
+    from generate_modules_sine import generateSineTable, update_verilog_macros
+    filenames = []
+    for name in ('sine_wave.v', 'signal_gen_top.v'):
+        shutil.copy(os.path.join(SINE_WAVE_PATH, name), os.path.join(workdir, name))
+        filenames.append(os.path.join(workdir, name))
+    for bits in ([8, 16] if quick else [4, 8, 12, 16, 20]):
+        sine_table = generateSineTable(bits, min(4 * 2**bits, 2**20))
+        # Alternate between two table sizes so every run rewrites the files
+        other_table = sine_table[:-2]
+
+        def run(sine_table=sine_table, other_table=other_table, bits=bits):
+            update_verilog_macros(other_table, bits, filenames)
+            update_verilog_macros(sine_table, bits, filenames)
+
+        yield {"bits": bits}, run
+
+@benchmark('simulate_adc_output', size='num_samples')
+def simulate_adc_output_cases(quick, workdir):
+    from generate_modules_adc_readout import simulate_adc_output
+    for num_samples in ([10**4, 10**5, 10**6] if quick else [10**4, 10**5, 10**6, 10**7, 10**8]):
+        yield {"num_samples": num_samples}, lambda num_samples=num_samples: simulate_adc_output(12, num_samples, 10, 1000)
+
+@benchmark('adc_stimulus', size='num_samples')
+def adc_stimulus_cases(quick, workdir):
+    from adc_stimulus import AdcStimulus
+    # Four noisy, jittered channels synthesized into a preallocated uint16 buffer
+    stimulus = AdcStimulus(12, 1e8, [1e6, 2.1e6, 3.3e6, 4.7e6], phase=[0, 30, 60, 90], noise_rms=1.5, jitter_rms=1e-12, seed=0)
+    for num_samples in ([10**4, 10**5, 10**6] if quick else [10**4, 10**5, 10**6, 10**7]):
+        out = np.empty((num_samples, stimulus.channels), dtype=stimulus.dtype)
+        yield {"num_samples": num_samples, "channels": stimulus.channels}, lambda num_samples=num_samples, out=out: stimulus.generate(num_samples, out)
+
+@benchmark('export_to_csv', size='num_samples')
+def export_to_csv_cases(quick, workdir):
+    from generate_modules_adc_readout import export_to_csv, simulate_adc_output
+    filename = os.path.join(workdir, 'adc_output.csv')
+    # np.savetxt formats row by row, 10^8 rows would take tens of minutes, larger runs use export_adc_stream
+    for num_samples in ([10**4, 10**5] if quick else [10**4, 10**5, 10**6, 10**7]):
+        data = simulate_adc_output(12, num_samples, 10, 1000)
+        yield {"num_samples": num_samples}, lambda data=data: export_to_csv(data, filename)
+
+@benchmark('export_adc_stream', size='num_samples')
+def export_adc_stream_cases(quick, workdir):
+    from generate_modules_adc_readout import export_adc_stream
+    for file_format in ('csv', 'bin'):
+        filename = os.path.join(workdir, 'adc_output.' + file_format)
+        for num_samples in ([10**4, 10**5, 10**6] if quick else [10**4, 10**5, 10**6, 10**7, 10**8]):
+            yield ({"num_samples": num_samples, "file_format": file_format},
+                   lambda num_samples=num_samples, filename=filename, file_format=file_format:
+                   export_adc_stream(filename, 12, num_samples, 10, 1000, file_format))
+
+@benchmark('startup', size=None)
+def startup_cases(quick, workdir):
+    # Whole command-line runs in a fresh interpreter, so the import time of the generators is included.
+    # Nothing is written, --dry_run only prints the diff of the module changes.
+    sine_script = os.path.join(SINE_WAVE_PATH, 'generate', 'generate_modules_sine.py')
+    adc_script = os.path.join(VERILOG_MODULES_PATH, 'adc_readout', 'generate', 'generate_modules_adc_readout.py')
+    commands = {
+        "python": ['-c', 'pass'],
+        "numpy": ['-c', 'import numpy'],
+        "plotting_and_fitting": ['-c', 'import matplotlib.pyplot, scipy.optimize, skopt'],
+        "sine_override_sample": [sine_script, '--bit_count', '8', '--override_sample', '1024', '--dry_run'],
+        "sine_exhaustive_search": [sine_script, '--bit_count', '6', '--search', 'exhaustive', '--no_cache', '--dry_run'],
+        "adc_readout": [adc_script, '--dry_run'],
+    }
+    if quick:
+        del commands["sine_exhaustive_search"]
+    for command_name, command in commands.items():
+        yield {"command": command_name}, lambda command=command: run_python(command)
+
+# ============ Measurement ============ #
+
+# Runs first in the interpreters started by run_python. The resident set peak of a spawned process (ru_maxrss)
+# also counts the memory of the process that spawned it, so the child reports the peak of its own memory map
+# (VmHWM) on stderr when it exits.
+PEAK_RSS_REPORTER = """
+import atexit, sys
+def report_peak_rss():
+    try:
+        with open('/proc/self/status') as status:
+            peak = next(int(line.split()[1]) * 1024 for line in status if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    sys.stderr.write('\\npeak_rss_bytes=%d\\n' % peak)
+atexit.register(report_peak_rss)
+"""
+
+def run_python(arguments) -> dict:
+    """
+    Run a Python command line in a new interpreter with its output discarded.
+
+    :param arguments: The interpreter arguments, a script path followed by its arguments, or '-c' and code.
+    :return: A dictionary with the "peak_bytes" of the child process.
+    """
+    if arguments[0] == '-c':
+        launcher = "sys.argv = {!r}\nexec({!r})".format(['-c'] + list(arguments[2:]), arguments[1])
+    else:
+        launcher = ("import os, runpy\nsys.argv = {!r}\nsys.path[0] = os.path.dirname(sys.argv[0])\n"
+                    "runpy.run_path(sys.argv[0], run_name='__main__')").format([os.path.abspath(arguments[0])] + list(arguments[1:]))
+    result = subprocess.run([sys.executable, '-c', PEAK_RSS_REPORTER + launcher], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = result.stderr.decode(errors='replace')
+    if result.returncode != 0:
+        raise RuntimeError("{} exited with status {}: {}".format(' '.join(arguments), result.returncode, stderr.strip()))
+    return {"peak_bytes": int(re.findall(r'peak_rss_bytes=(\d+)', stderr)[-1])}
+
+def case_name(name: str, params: dict) -> str:
+    """
+    Unique name of a benchmark case, e.g. generateSineTable[bits=8,sampleCount=1024].
+    """
+    return "{}[{}]".format(name, ','.join('{}={}'.format(key, value) for key, value in params.items()))
+
+def read_process_status(field: str) -> int:
+    """
+    Value of a kB field of /proc/self/status (e.g. VmRSS or VmHWM), in bytes.
+    """
+    with open('/proc/self/status', 'r') as file:
+        for line in file:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) * 1024
+    raise KeyError(field)
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak resident set size of this process to its current size, returns False where Linux's
+    /proc/self/clear_refs is not available.
+
+    Free heap memory is handed back to the system first, otherwise allocations reusing it would not
+    show up as growth of the resident set.
+    """
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+def measure(run, repeats: int = 3, max_time: float = 1.0, memory='rss') -> dict:
+    """
+    Measure the wall time and peak memory of a callable.
+
+    The wall time is the fastest of up to `repeats` runs, stopping early once the runs have taken
+    max_time seconds.
+
+    With memory='rss' the peak is the growth of the resident set size during the first run, which costs
+    nothing but does not see allocations served from memory the process already holds. With
+    memory='tracemalloc' the peak of the Python and numpy allocations is traced in one extra, untimed run;
+    this is exact but slows allocation-heavy code down by an order of magnitude. 'rss' falls back to
+    'tracemalloc' where the peak RSS cannot be reset. Runs that report their own "peak_bytes" (see
+    run_python) are measured as 'child_rss', the peak resident set of the process they started.
+
+    :return: A dictionary with "wall_s", "peak_bytes", the "memory" method used and the number of timed "runs".
+    """
+    if memory == 'rss' and not reset_peak_rss():
+        memory = 'tracemalloc'
+
+    times = []
+    peak = 0
+    while len(times) < repeats and (not times or sum(times) < max_time):
+        if memory == 'rss' and not times:
+            start_rss = read_process_status('VmRSS')
+        start = time.perf_counter()
+        outcome = run()
+        times.append(time.perf_counter() - start)
+        if isinstance(outcome, dict) and "peak_bytes" in outcome:
+            memory = 'child_rss'
+            peak = max(peak, outcome["peak_bytes"])
+        elif memory == 'rss' and len(times) == 1:
+            peak = max(0, read_process_status('VmHWM') - start_rss)
+
+    if memory == 'tracemalloc':
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"wall_s": min(times), "peak_bytes": int(peak), "memory": memory, "runs": len(times)}
+
+def run_benchmarks(names=None, pattern=None, quick=False, repeats=3, memory='rss', verbose=True) -> dict:
+    """
+    Run the registered benchmarks.
+
+    :param names: Benchmarks to run (default: all of them).
+    :param pattern: Regular expression the case names must match.
+    :param quick: Use the reduced parameter sweeps.
+    :param repeats: Maximum number of timed runs per case.
+    :param memory: How peak memory is measured, 'rss' or 'tracemalloc' (see measure).
+    :return: A dictionary mapping case names to their measurement, params and benchmark.
+    """
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='benchmarks_')
+    try:
+        for name in (names or BENCHMARKS):
+            cases, _ = BENCHMARKS[name]
+            for params, run in cases(quick, workdir):
+                full_name = case_name(name, params)
+                if pattern and not re.search(pattern, full_name):
+                    continue
+                results[full_name] = dict(measure(run, repeats, memory=memory), benchmark=name, params=params)
+                if verbose:
+                    print("{:<75} {:>10.4f} s {:>10.1f} MB".format(full_name, results[full_name]["wall_s"], results[full_name]["peak_bytes"] / 2**20))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+# ============ Baselines ============ #
+
+def environment_info() -> dict:
+    """
+    Description of the machine the benchmarks ran on, stored with a baseline.
+    """
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "system": platform.platform(),
+    }
+
+def save_baseline(results: dict, filename: str):
+    with open(filename, 'w') as file:
+        json.dump({"environment": environment_info(), "results": results}, file, indent=1)
+
+def load_baseline(filename: str) -> dict:
+    with open(filename, 'r') as file:
+        return json.load(file)["results"]
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float = 0.25) -> list:
+    """
+    Print every case next to its baseline and return the regressions.
+
+    :param threshold: Allowed relative increase of the wall time and peak memory, 0.25 allows 25%.
+    :return: A list of (case name, metric, baseline value, new value) for every regression.
+    """
+    regressions = []
+    print("{:<75} {:>10} {:>10}".format("case", "time", "memory"))
+    for name, result in results.items():
+        if name not in baseline:
+            print("{:<75} {:>10} {:>10}".format(name, "new", "new"))
+            continue
+        ratios = []
+        metrics = [("wall_s", MIN_WALL_REGRESSION)]
+        # Peak memory is only comparable when it was measured the same way
+        if baseline[name].get("memory") == result["memory"]:
+            metrics.append(("peak_bytes", MIN_MEMORY_REGRESSION))
+        for metric, minimum in metrics:
+            old, new = baseline[name][metric], result[metric]
+            ratios.append(new / old if old else float('inf') if new else 1.0)
+            if new > old * (1 + threshold) and new - old > minimum:
+                regressions.append((name, metric, old, new))
+        flagged = any(regression[0] == name for regression in regressions)
+        memory_ratio = "{:>9.2f}x".format(ratios[1]) if len(ratios) > 1 else "{:>10}".format("n/a")
+        print("{:<75} {:>9.2f}x {}{}".format(name, ratios[0], memory_ratio, "  REGRESSION" if flagged else ""))
+    return regressions
+
+# ============ Scaling curves ============ #
+
+def plot_scaling_curves(results: dict):
+    """
+    Plot the wall time and peak memory of every benchmark against its size parameter, on log-log axes.
+    """
+    import matplotlib.pyplot as plt
+
+    names = sorted({result["benchmark"] for result in results.values() if BENCHMARKS[result["benchmark"]][1] is not None})
+    if not names:
+        print("None of the results has a size parameter to plot")
+        return
+    fig, axes = plt.subplots(len(names), 2, figsize=(12, 3.5 * len(names)), squeeze=False)
+    for row, name in enumerate(names):
+        size = BENCHMARKS[name][1]
+        # One curve per combination of the other parameters
+        curves = {}
+        for result in results.values():
+            if result["benchmark"] != name:
+                continue
+            label = ', '.join('{}={}'.format(key, value) for key, value in result["params"].items() if key != size)
+            curves.setdefault(label, []).append((result["params"][size], result["wall_s"], result["peak_bytes"] / 2**20))
+        for label, points in curves.items():
+            points.sort()
+            sizes, walls, peaks = zip(*points)
+            axes[row][0].plot(sizes, walls, marker='o', label=label or name)
+            axes[row][1].plot(sizes, peaks, marker='o', label=label or name)
+        for column, ylabel in enumerate(('Wall time (s)', 'Peak memory (MB)')):
+            axes[row][column].set_xscale('log')
+            axes[row][column].set_yscale('log')
+            axes[row][column].set_xlabel(size)
+            axes[row][column].set_ylabel(ylabel)
+            axes[row][column].set_title(name)
+            axes[row][column].grid(True)
+        axes[row][0].legend(fontsize=8)
+    plt.tight_layout()
+    plt.show()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the verilog module generators and simulation data paths.')
+    parser.add_argument('--benchmarks', nargs='+', choices=sorted(BENCHMARKS), default=None, help='Benchmarks to run (default: all).')
+    parser.add_argument('--filter', type=str, default=None, help='Only run the cases whose name matches this regular expression.')
+    parser.add_argument('--quick', action='store_true', help='Use reduced parameter sweeps, finishes in well under a minute.')
+    parser.add_argument('--repeats', type=int, default=3, help='Maximum number of timed runs per case (default: 3).')
+    parser.add_argument('--memory', choices=['rss', 'tracemalloc'], default='rss', help='Measure peak memory as resident set growth (free) or with tracemalloc (exact, slow extra run).')
+    parser.add_argument('--output', type=str, default=None, help='Write the results to this JSON file.')
+    parser.add_argument('--save_baseline', action='store_true', help='Store the results as the new baseline.')
+    parser.add_argument('--compare', action='store_true', help='Compare the results with the baseline and exit with an error on regressions.')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE_PATH, help='Baseline JSON file (default: benchmark_baseline.json next to this script).')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed relative slowdown or memory growth before a case is flagged (default: 0.25).')
+    parser.add_argument('--plot', action='store_true', help='Plot the scaling curves of the results.')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.benchmarks, args.filter, args.quick, args.repeats, args.memory)
+
+    if args.output:
+        save_baseline(results, args.output)
+        print("Results written to {}".format(args.output))
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print("Baseline written to {}".format(args.baseline))
+    if args.plot:
+        plot_scaling_curves(results)
+    if args.compare:
+        regressions = compare_to_baseline(results, load_baseline(args.baseline), args.threshold)
+        for name, metric, old, new in regressions:
+            print("Regression in {}: {} went from {:.6g} to {:.6g}".format(name, metric, old, new))
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions past {:.0%} against {}".format(args.threshold, args.baseline))
+
+if __name__ == '__main__':
+    main()
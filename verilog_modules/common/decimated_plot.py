@@ -0,0 +1,123 @@
+import numpy as np
+
+# Largest number of samples read from the (possibly memory-mapped) data at a time while decimating
+DECIMATION_CHUNK_ELEMENTS = 2**22
+
+def minmax_indices(y, start: int, stop: int, buckets: int) -> np.ndarray:
+    """
+    Indices of the samples to draw for y[start:stop] on a screen `buckets` pixels wide.
+
+    The range is split into buckets of equal size and the minimum and maximum of every bucket are kept,
+    in the order they occur, so peaks and quantisation steps survive the decimation. The first and last
+    samples are always kept. Ranges that already fit in 2 * buckets points are returned in full.
+
+    :param y: 1-D array or memory-mapped array, only y[start:stop] is read, in bounded chunks.
+    :param start: First sample of the visible range.
+    :param stop: Sample to stop before.
+    :param buckets: Number of buckets, usually the width of the axes in pixels.
+    :return: Sorted int64 indices into y.
+    """
+    start, stop = max(0, int(start)), min(len(y), int(stop))
+    if stop - start <= 2 * max(1, buckets):
+        return np.arange(start, stop, dtype=np.int64)
+
+    size = (stop - start) // buckets
+    count = (stop - start) // size
+    buckets_per_chunk = max(1, DECIMATION_CHUNK_ELEMENTS // size)
+
+    pieces = [np.array([start, stop - 1], dtype=np.int64)]
+    for first_bucket in range(0, count, buckets_per_chunk):
+        chunk_buckets = min(buckets_per_chunk, count - first_bucket)
+        offset = start + first_bucket * size
+        block = np.asarray(y[offset:offset + chunk_buckets * size]).reshape(chunk_buckets, size)
+        lo = block.argmin(axis=1)
+        hi = block.argmax(axis=1)
+        bucket_starts = offset + np.arange(chunk_buckets, dtype=np.int64) * size
+        pieces.append(bucket_starts + lo)
+        pieces.append(bucket_starts + hi)
+
+    # Samples left over after the last full bucket
+    tail = start + count * size
+    if tail < stop:
+        rest = np.asarray(y[tail:stop])
+        pieces.append(np.array([tail + rest.argmin(), tail + rest.argmax()], dtype=np.int64))
+
+    return np.unique(np.concatenate(pieces))
+
+class DecimatedLine:
+    """
+    A matplotlib line that only draws a min/max decimated view of its data.
+
+    The full x/y arrays are kept (they can be memory-mapped) and the line is re-decimated from them
+    whenever the x limits change, so zooming in reveals every sample of the visible range.
+    """
+
+    def __init__(self, ax, x, y, where=None, max_points=None, **kwargs):
+        """
+        :param ax: Axes to draw on.
+        :param x: Monotonically increasing x values, a range, or None for the sample index.
+        :param y: 1-D array of y values.
+        :param where: Draw a step plot like plt.step ('pre', 'post' or 'mid'), or None for a line.
+        :param max_points: Maximum number of points drawn (default: twice the axes width in pixels).
+        :param kwargs: Passed on to ax.plot (label, color...).
+        """
+        self.ax = ax
+        self.x = x
+        self.y = y
+        self.max_points = max_points
+        if where is not None:
+            kwargs['drawstyle'] = 'steps-' + where
+        (self.line,) = ax.plot(*self._decimate(0, len(y)), **kwargs)
+        # A plain function is held strongly by the callback registry, so the line lives as long as the axes
+        ax.callbacks.connect('xlim_changed', lambda changed_ax: self._on_xlim_changed(changed_ax))
+
+    def _buckets(self) -> int:
+        if self.max_points is not None:
+            return max(1, self.max_points // 2)
+        return max(1, int(self.ax.bbox.width))
+
+    def _x_values(self, indices):
+        if self.x is None:
+            return indices
+        if isinstance(self.x, range):
+            return self.x.start + indices * self.x.step
+        return np.asarray(self.x[indices])
+
+    def _index_range(self, xmin, xmax):
+        """
+        Sample range covering the x limits, with one extra sample on each side so lines reach the edges.
+        """
+        if self.x is None or isinstance(self.x, range):
+            origin, step = (0, 1) if self.x is None else (self.x.start, self.x.step)
+            start, stop = int(np.floor((xmin - origin) / step)), int(np.ceil((xmax - origin) / step)) + 1
+        else:
+            start = int(np.searchsorted(self.x, xmin, side='left'))
+            stop = int(np.searchsorted(self.x, xmax, side='right'))
+        return max(0, start - 1), min(len(self.y), stop + 1)
+
+    def _decimate(self, start, stop):
+        indices = minmax_indices(self.y, start, stop, self._buckets())
+        return self._x_values(indices), np.asarray(self.y[indices])
+
+    def _on_xlim_changed(self, ax):
+        xmin, xmax = sorted(ax.get_xlim())
+        self.line.set_data(*self._decimate(*self._index_range(xmin, xmax)))
+        ax.figure.canvas.draw_idle()
+
+def plot_decimated(x, y=None, ax=None, where=None, max_points=None, **kwargs) -> DecimatedLine:
+    """
+    Drop-in replacement for plt.plot / plt.step that decimates large arrays to the screen resolution.
+
+    :param x: x values (or the y values if y is None, as with plt.plot(y)).
+    :param y: y values.
+    :param ax: Axes to draw on (default: the current axes).
+    :param where: None for plt.plot, or the plt.step `where` argument for a step plot.
+    :param max_points: Maximum number of points drawn (default: twice the axes width in pixels).
+    :return: The DecimatedLine.
+    """
+    if y is None:
+        x, y = None, x
+    if ax is None:
+        import matplotlib.pyplot as plt
+        ax = plt.gca()
+    return DecimatedLine(ax, x, y, where=where, max_points=max_points, **kwargs)
@@ -0,0 +1,236 @@
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+# Output formats of PipelineProfile.write
+PROFILE_FORMATS = ('json', 'chrome')
+
+# Number of functions listed per cProfile'd stage in the profile output, sorted by cumulative time
+CPROFILE_TOP_FUNCTIONS = 25
+
+class PipelineProfile:
+    """
+    Wall and CPU time of the stages of a generator run, plus named counters and values.
+
+    A profile is made active with `with profile:`. Library code reports to the active profile through
+    active_profile(), which returns a profile that records nothing when none is active, so the
+    instrumentation costs nothing outside of --profile runs.
+    """
+
+    def __init__(self, name: str, cprofile_stages=(), cprofile_dir=None):
+        """
+        :param name: Name of the run, e.g. the generator script.
+        :param cprofile_stages: Names of the stages to run under cProfile.
+        :param cprofile_dir: Directory the .prof files of the cProfile'd stages are written to (default: not written).
+        """
+        self.name = name
+        self.cprofile_stages = set(cprofile_stages)
+        self.cprofile_dir = cprofile_dir
+        self.stages = []
+        self.counters = {}
+        self.values = {}
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.wall_s = None
+        self._previous = None
+
+    def __enter__(self):
+        global _ACTIVE_PROFILE
+        self._previous, _ACTIVE_PROFILE = _ACTIVE_PROFILE, self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _ACTIVE_PROFILE
+        _ACTIVE_PROFILE = self._previous
+        self.wall_s = time.perf_counter() - self.start
+        return False
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **args):
+        """
+        Time the body of the with statement as a stage. Stages can be nested.
+
+        :param name: Stage name, also used to select the stages run under cProfile.
+        :param args: Values describing this run of the stage, stored with it.
+        """
+        record = {"name": name, "start_s": time.perf_counter() - self.start, "args": dict(args), "thread": threading.get_ident()}
+        profiler = cProfile.Profile() if name in self.cprofile_stages else None
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record["args"]
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record["wall_s"] = time.perf_counter() - self.start - record["start_s"]
+            record["cpu_s"] = time.process_time() - cpu_start
+            if profiler is not None:
+                record["cprofile"] = self._cprofile_summary(profiler, name)
+            self.stages.append(record)
+
+    def count(self, name: str, amount=1):
+        """
+        Add to a counter, e.g. loss evaluations or bytes written.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, name: str, value):
+        """
+        Store a value describing the run, e.g. the table size. Values must be JSON serialisable.
+        """
+        self.values[name] = value
+
+    def _cprofile_summary(self, profiler, stage_name: str) -> dict:
+        """
+        The functions with the largest cumulative time in a stage, and the .prof file written for it.
+        """
+        summary = {}
+        if self.cprofile_dir is not None:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+            summary["file"] = os.path.join(self.cprofile_dir, "{}.{}.{}.prof".format(self.name, stage_name, sum(stage["name"] == stage_name for stage in self.stages)))
+            profiler.dump_stats(summary["file"])
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({"function": "{}:{}({})".format(os.path.basename(filename), line, function),
+                         "ncalls": ncalls, "tottime_s": tottime, "cumtime_s": cumtime})
+        rows.sort(key=lambda row: row["cumtime_s"], reverse=True)
+        summary["functions"] = rows[:CPROFILE_TOP_FUNCTIONS]
+        return summary
+
+    def stage_totals(self) -> dict:
+        """
+        Total wall and CPU time and number of runs of every stage name.
+        """
+        totals = {}
+        for stage in self.stages:
+            total = totals.setdefault(stage["name"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+            total["calls"] += 1
+            total["wall_s"] += stage["wall_s"]
+            total["cpu_s"] += stage["cpu_s"]
+        return totals
+
+    def summary(self) -> dict:
+        """
+        The profile as one JSON serialisable dictionary, the format written for 'json'.
+        """
+        wall_s = self.wall_s if self.wall_s is not None else time.perf_counter() - self.start
+        return {
+            "name": self.name,
+            "argv": sys.argv,
+            "started_at": self.started_at,
+            "wall_s": wall_s,
+            "stages": [{key: value for key, value in stage.items() if key != "thread"} for stage in sorted(self.stages, key=lambda stage: stage["start_s"])],
+            "stage_totals": self.stage_totals(),
+            "counters": self.counters,
+            "values": self.values,
+        }
+
+    def chrome_trace(self) -> dict:
+        """
+        The profile in the Chrome trace event format, for chrome://tracing or Perfetto.
+
+        Every stage is a complete ('X') event, the counters are a counter ('C') event at the end of the run,
+        and the values are stored in the trace metadata.
+        """
+        pid = os.getpid()
+        threads = {}
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}}]
+        for stage in sorted(self.stages, key=lambda stage: stage["start_s"]):
+            tid = threads.setdefault(stage["thread"], len(threads))
+            args = dict(stage["args"], cpu_s=stage["cpu_s"])
+            if "cprofile" in stage:
+                args["cprofile"] = stage["cprofile"]
+            events.append({"name": stage["name"], "cat": "stage", "ph": "X", "pid": pid, "tid": tid,
+                           "ts": stage["start_s"] * 1e6, "dur": stage["wall_s"] * 1e6, "args": args})
+        wall_s = self.wall_s if self.wall_s is not None else time.perf_counter() - self.start
+        if self.counters:
+            events.append({"name": "counters", "ph": "C", "pid": pid, "tid": 0, "ts": wall_s * 1e6, "args": self.counters})
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"name": self.name, "argv": sys.argv, "started_at": self.started_at, "values": self.values}}
+
+    def write(self, filepath: str, profile_format='json'):
+        """
+        Write the profile to a file.
+
+        :param filepath: Output path.
+        :param profile_format: 'json' for summary(), or 'chrome' for chrome_trace().
+        """
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError("Unknown profile_format '{}', expected one of {}".format(profile_format, PROFILE_FORMATS))
+        content = self.summary() if profile_format == 'json' else self.chrome_trace()
+        with open(filepath, 'w') as file:
+            json.dump(content, file, indent=1, default=str)
+
+    def print_summary(self):
+        """
+        Print the time spent in every stage and the counters.
+        """
+        print("Profile of {}:".format(self.name))
+        for name, total in self.stage_totals().items():
+            print("  {:<32} {:>4}x {:>10.4f} s wall {:>10.4f} s cpu".format(name, total["calls"], total["wall_s"], total["cpu_s"]))
+        for name, value in self.counters.items():
+            print("  {:<32} {}".format(name, value))
+
+class NullProfile:
+    """
+    Stand-in for PipelineProfile when no profile is active, every method does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def stage(self, name: str, **args):
+        return contextlib.nullcontext(args)
+
+    def count(self, name: str, amount=1):
+        pass
+
+    def record(self, name: str, value):
+        pass
+
+_NULL_PROFILE = NullProfile()
+_ACTIVE_PROFILE = None
+
+def active_profile():
+    """
+    The PipelineProfile of the current `with profile:` block, or a NullProfile outside of one.
+    """
+    return _ACTIVE_PROFILE if _ACTIVE_PROFILE is not None else _NULL_PROFILE
+
+def add_profile_arguments(parser):
+    """
+    Add the --profile, --profile_format and --profile_stage options to a generator's argument parser.
+    """
+    parser.add_argument('--profile', type=str, default=None, help='Time the generation stages and write the profile to this file.')
+    parser.add_argument('--profile_format', choices=PROFILE_FORMATS, default='json', help='Profile file format: a JSON summary, or a Chrome trace for chrome://tracing and Perfetto (default: json).')
+    parser.add_argument('--profile_stage', type=str, nargs='+', default=[], help='Stages to run under cProfile, their hottest functions go into the profile and their .prof files next to it.')
+
+def profile_from_arguments(args, name: str):
+    """
+    The PipelineProfile requested by the add_profile_arguments options, or a NullProfile without --profile.
+    """
+    if not args.profile:
+        return _NULL_PROFILE
+    return PipelineProfile(name, args.profile_stage, os.path.dirname(os.path.abspath(args.profile)))
+
+def finish_profile(profile, args):
+    """
+    Write and summarise the profile of a generator run, does nothing without --profile.
+    """
+    if not args.profile:
+        return
+    profile.write(args.profile, args.profile_format)
+    profile.print_summary()
+    print("Profile written to {}".format(args.profile))
@@ -0,0 +1,281 @@
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from verilog_rewrite import content_hash
+
+# Root directory of the verilog modules
+VERILOG_MODULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Generator scripts a variant can be built with, all of them take --output_dir
+GENERATORS = {
+    'sine': os.path.join(VERILOG_MODULES_PATH, 'sine_wave', 'generate', 'generate_modules_sine.py'),
+    'adc': os.path.join(VERILOG_MODULES_PATH, 'adc_readout', 'generate', 'generate_modules_adc_readout.py'),
+}
+
+MANIFEST_NAME = 'manifest.json'
+LOG_DIR_NAME = 'logs'
+
+# Longest variant directory name before the parameters part is cut short
+MAX_NAME_LENGTH = 80
+
+def parse_value(text: str):
+    """
+    Value of a --grid entry: JSON numbers, booleans and null as such, anything else as a string.
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def parse_grid(specs) -> dict:
+    """
+    Parse --grid entries of the form name=value1,value2,...
+
+    Args:
+        specs (list): Grid entries, one per generator argument.
+
+    Returns:
+        dict: Dictionary mapping argument names to their list of values.
+    """
+    grid = {}
+    for spec in specs:
+        name, separator, values = spec.partition('=')
+        if not separator or not name or not values:
+            raise ValueError(f"Grid entry '{spec}' is not of the form name=value1,value2,...")
+        grid[name.lstrip('-')] = [parse_value(value) for value in values.split(',')]
+    return grid
+
+def expand_grid(grid: dict) -> list:
+    """
+    Every combination of the grid values, in the order the grid entries were given.
+
+    Args:
+        grid (dict): Dictionary mapping argument names to their list of values.
+
+    Returns:
+        list: One dictionary of argument names and values per combination.
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def load_configurations(filepath: str) -> list:
+    """
+    Read a JSON list of configurations, each a dictionary of generator argument names and values.
+    """
+    with open(filepath, 'r') as file:
+        configurations = json.load(file)
+    if not isinstance(configurations, list) or not all(isinstance(config, dict) for config in configurations):
+        raise ValueError(f"{filepath} does not hold a list of configuration objects")
+    return configurations
+
+def generator_arguments(parameters: dict) -> list:
+    """
+    Command line arguments of a generator for a configuration.
+
+    True adds a bare flag, False and None leave the argument out and lists pass several values.
+
+    Args:
+        parameters (dict): Dictionary of generator argument names (without the leading --) and values.
+
+    Returns:
+        list: The arguments, in the order of the dictionary.
+    """
+    arguments = []
+    for name, value in parameters.items():
+        if value is None or value is False:
+            continue
+        arguments.append('--' + name)
+        if value is True:
+            continue
+        arguments.extend(str(item) for item in (value if isinstance(value, (list, tuple)) else [value]))
+    return arguments
+
+def variant_name(index: int, parameters: dict) -> str:
+    """
+    Directory name of a variant: its index followed by its parameters, e.g. 003_bit_count-8_table_layout-quarter.
+    """
+    parts = []
+    for name, value in parameters.items():
+        if isinstance(value, (list, tuple)):
+            value = '-'.join(str(item) for item in value)
+        parts.append(name if value is True else f"{name}-{value}")
+    name = re.sub(r'[^\w.-]+', '_', '_'.join(parts))[:MAX_NAME_LENGTH]
+    return f"{index:03d}_{name}" if name else f"{index:03d}"
+
+def tree_hashes(directory: str) -> dict:
+    """
+    SHA-256 of every file below a directory.
+
+    Returns:
+        dict: Dictionary mapping the paths relative to the directory (with / separators) to the file hashes.
+    """
+    hashes = {}
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            with open(path, 'rb') as file:
+                hashes[os.path.relpath(path, directory).replace(os.sep, '/')] = content_hash(file.read())
+    return hashes
+
+def tree_hash(hashes: dict) -> str:
+    """
+    SHA-256 over the relative paths and hashes of the files of an output tree, identifies its content.
+    """
+    return content_hash(''.join(f"{path}\0{digest}\n" for path, digest in sorted(hashes.items())))
+
+def run_variant(generator: str, name: str, parameters: dict, output_root: str) -> dict:
+    """
+    Generate one variant into its own directory with the generator script.
+
+    The generator's output goes to logs/<name>.log, outside the variant tree, so that it does not
+    keep otherwise identical trees apart.
+
+    Args:
+        generator (str): Key of GENERATORS.
+        name (str): Name of the variant directory.
+        parameters (dict): Dictionary of generator argument names and values.
+        output_root (str): Directory holding the variant directories.
+
+    Returns:
+        dict: The manifest entry of the variant, without the deduplication fields.
+    """
+    directory = os.path.join(output_root, name)
+    log_path = os.path.join(output_root, LOG_DIR_NAME, name + '.log')
+    argv = [sys.executable, GENERATORS[generator], '--output_dir', directory] + generator_arguments(parameters)
+
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        result = subprocess.run(argv, cwd=os.path.dirname(GENERATORS[generator]), stdout=log, stderr=subprocess.STDOUT)
+    wall_s = time.perf_counter() - start
+
+    entry = {
+        "name": name,
+        "parameters": parameters,
+        "directory": name,
+        "argv": argv[1:],
+        "returncode": result.returncode,
+        "wall_s": round(wall_s, 3),
+        "log": os.path.relpath(log_path, output_root).replace(os.sep, '/'),
+    }
+    if result.returncode == 0 and os.path.isdir(directory):
+        entry["files"] = tree_hashes(directory)
+        entry["output_hash"] = tree_hash(entry["files"])
+    return entry
+
+def link_identical_files(output_root: str, variants: list) -> int:
+    """
+    Replace every file whose content already appeared in an earlier variant with a hard link to the first copy,
+    and mark variants whose whole tree matches an earlier one with duplicate_of.
+
+    Args:
+        output_root (str): Directory holding the variant directories.
+        variants (list): Manifest entries of the variants in order, updated in place.
+
+    Returns:
+        int: The number of bytes saved by the hard links.
+    """
+    first_copies = {}
+    first_trees = {}
+    saved_bytes = 0
+    for variant in variants:
+        if "output_hash" not in variant:
+            continue
+        variant["duplicate_of"] = first_trees.setdefault(variant["output_hash"], variant["name"])
+        if variant["duplicate_of"] == variant["name"]:
+            variant["duplicate_of"] = None
+
+        for relpath, digest in variant["files"].items():
+            path = os.path.join(output_root, variant["directory"], relpath)
+            original = first_copies.setdefault(digest, path)
+            if original == path or os.path.samefile(original, path):
+                continue
+            saved_bytes += os.path.getsize(path)
+            # Link under a temporary name first, so the file is never missing
+            temp_path = path + '.link'
+            os.link(original, temp_path)
+            os.replace(temp_path, path)
+    return saved_bytes
+
+def run_farm(generator: str, configurations: list, output_root: str, workers: int = None, verbose: bool = True) -> dict:
+    """
+    Generate every configuration into its own directory below output_root in parallel, deduplicate the
+    outputs and write manifest.json.
+
+    Args:
+        generator (str): Key of GENERATORS.
+        configurations (list): One dictionary of generator argument names and values per variant.
+        output_root (str): Directory the variant directories and the manifest are written to.
+        workers (int): Number of variants generated at a time (default: os.cpu_count()).
+        verbose (bool): Print a line per finished variant.
+
+    Returns:
+        dict: The manifest.
+    """
+    if generator not in GENERATORS:
+        raise ValueError(f"Unknown generator '{generator}', expected one of {', '.join(GENERATORS)}")
+    # The generators run from their own directory
+    output_root = os.path.abspath(output_root)
+    os.makedirs(os.path.join(output_root, LOG_DIR_NAME), exist_ok=True)
+
+    names = [variant_name(index, parameters) for index, parameters in enumerate(configurations)]
+    variants = [None] * len(configurations)
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {executor.submit(run_variant, generator, name, parameters, output_root): index
+                   for index, (name, parameters) in enumerate(zip(names, configurations))}
+        for future in concurrent.futures.as_completed(futures):
+            variant = variants[futures[future]] = future.result()
+            if verbose:
+                status = "ok" if variant["returncode"] == 0 else f"failed ({variant['returncode']}), see {variant['log']}"
+                print(f"{variant['name']}: {status} in {variant['wall_s']:.2f} s")
+
+    saved_bytes = link_identical_files(output_root, variants)
+    manifest = {
+        "generator": generator,
+        "script": os.path.relpath(GENERATORS[generator], VERILOG_MODULES_PATH).replace(os.sep, '/'),
+        "wall_s": round(time.perf_counter() - start, 3),
+        "variants": variants,
+        "unique_outputs": len({variant["output_hash"] for variant in variants if "output_hash" in variant}),
+        "linked_bytes": saved_bytes,
+    }
+    with open(os.path.join(output_root, MANIFEST_NAME), 'w') as file:
+        json.dump(manifest, file, indent=2)
+        file.write('\n')
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a grid or list of module configurations, each into its own output directory.')
+    parser.add_argument('--generator', choices=sorted(GENERATORS), required=True, help='Generator script the variants are built with.')
+    parser.add_argument('--grid', nargs='+', default=[], metavar='NAME=V1,V2', help='Generator arguments and their values, every combination is generated (e.g. bit_count=6,8 table_layout=half,quarter).')
+    parser.add_argument('--configs', type=str, default=None, help='JSON list of configurations, each an object of generator argument names and values. Combined with --grid, every configuration is crossed with the grid.')
+    parser.add_argument('--output', type=str, required=True, help='Directory the variant directories and manifest.json are written to.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of variants generated at a time (default: number of CPUs).')
+    args = parser.parse_args()
+
+    configurations = load_configurations(args.configs) if args.configs else [{}]
+    grid = expand_grid(parse_grid(args.grid))
+    configurations = [{**config, **combination} for config in configurations for combination in grid]
+    if configurations == [{}]:
+        parser.error('Give the configurations with --grid and/or --configs')
+
+    print(f"Generating {len(configurations)} {args.generator} variants into {args.output}...")
+    manifest = run_farm(args.generator, configurations, args.output, args.workers)
+
+    failed = [variant["name"] for variant in manifest["variants"] if variant["returncode"] != 0]
+    duplicates = sum(1 for variant in manifest["variants"] if variant.get("duplicate_of"))
+    print(f"{len(manifest['variants']) - len(failed)} variants generated, {manifest['unique_outputs']} unique outputs, "
+          f"{duplicates} duplicates, {manifest['linked_bytes']} bytes hard linked")
+    print(f"Manifest written to {os.path.join(args.output, MANIFEST_NAME)}")
+    if failed:
+        print(f"Failed variants: {', '.join(failed)}")
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
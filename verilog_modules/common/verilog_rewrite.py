@@ -0,0 +1,147 @@
+import difflib
+import hashlib
+import os
+import re
+import stat
+import tempfile
+from pipeline_profile import active_profile
+
+# Regex pattern to match Verilog parameters (e.g., parameter NAME = VALUE)
+PARAMETER_PATTERN = re.compile(r"parameter\s+(\w+)\s*=\s*(\d+)")
+
+def rewrite_parameters(content: str, parameters: dict) -> str:
+    """
+    Replace the values of the given numeric parameters in Verilog source text.
+
+    Args:
+        content (str): Verilog source text.
+        parameters (dict): Dictionary containing the parameter names and values.
+
+    Returns:
+        str: The updated source text, parameters not in the dictionary are left as they are.
+    """
+
+    def replacer(match):
+        param_name = match.group(1)
+        # Replace the parameter value if it's in the dictionary
+        if param_name in parameters:
+            return f"parameter {param_name} = {parameters[param_name]}"
+        return match.group(0)  # Keep the original line if parameter not in dictionary
+
+    return PARAMETER_PATTERN.sub(replacer, content)
+
+def read_parameters(file_path: str) -> dict:
+    """
+    Read the numeric parameters of a Verilog module.
+
+    Args:
+        file_path (str): Path of the Verilog file.
+
+    Returns:
+        dict: Dictionary mapping the parameter names to their integer values.
+    """
+    with open(file_path, 'r') as file:
+        return {name: int(value) for name, value in PARAMETER_PATTERN.findall(file.read())}
+
+def content_hash(content) -> str:
+    """
+    SHA-256 of text or bytes content (text is hashed as UTF-8).
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def file_hash(file_path: str):
+    """
+    SHA-256 of a file's content, or None if the file does not exist.
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'rb') as file:
+        return content_hash(file.read())
+
+def write_if_changed(file_path: str, content, dry_run=False) -> bool:
+    """
+    Write content to a file only if it differs from what is already there.
+
+    Unchanged files are not touched, so their mtime stays the same and Verilator/Vivado do not rebuild them.
+    Changed files are written to a temporary file in the same directory and renamed over the original.
+
+    Args:
+        file_path (str): Path of the file to write.
+        content (str or bytes): New file content.
+        dry_run (bool): Print a unified diff of the change (a size summary for bytes) instead of writing.
+
+    Returns:
+        bool: True if the file changed (or would change on a dry run).
+    """
+    if file_hash(file_path) == content_hash(content):
+        active_profile().count('files_unchanged')
+        return False
+
+    if dry_run:
+        print_diff(file_path, content)
+        return True
+
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=os.path.basename(file_path))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        # Keep the permissions of the file being replaced, or the usual default for a new file
+        if os.path.exists(file_path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    active_profile().count('files_written')
+    active_profile().count('bytes_written', len(data))
+    return True
+
+def print_diff(file_path: str, content):
+    """
+    Print the change write_if_changed would make to a file.
+    """
+    if isinstance(content, bytes):
+        print(f"Would rewrite {file_path} ({len(content)} bytes)")
+        return
+
+    old_content = ''
+    if os.path.exists(file_path):
+        with open(file_path, 'r') as file:
+            old_content = file.read()
+    diff = difflib.unified_diff(old_content.splitlines(keepends=True), content.splitlines(keepends=True),
+                                fromfile=file_path, tofile=file_path)
+    print(''.join(diff), end='')
+
+def update_parameter_files(updates: dict, dry_run=False, sources=None) -> list:
+    """
+    Apply parameter updates to several Verilog files in a single pass.
+
+    Every file is read once, all of its parameters are replaced in one regex pass, and it is only
+    written back if its content changes.
+
+    Args:
+        updates (dict): Dictionary mapping file paths to dictionaries of parameter names and values.
+        dry_run (bool): Print the diffs instead of writing the files.
+        sources (dict): Optional mapping of file paths to the module each one is generated from, e.g. to
+                        write a configuration into another directory. Files not in it are updated in place.
+
+    Returns:
+        list: The paths of the files that changed (or would change on a dry run).
+    """
+    sources = sources or {}
+    changed = []
+    for file_path, parameters in updates.items():
+        with open(sources.get(file_path, file_path), 'r') as file:
+            content = file.read()
+        if write_if_changed(file_path, rewrite_parameters(content, parameters), dry_run):
+            changed.append(file_path)
+    return changed
@@ -0,0 +1,158 @@
+import argparse
+import json
+import math
+import os
+import sys
+import numpy as np
+from spectral_quality import walk_period_length
+
+MODULE_ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# the sine_wave.v model reads PHASE_SIZE, which limits the largest phaseStep
+sys.path.append(os.path.join(MODULE_ROOT_PATH, 'simulate'))
+from sine_wave_model import read_verilog_parameters
+
+# Upper bound on the number of (table size, phaseStep) candidates evaluated at once
+PLAN_CHUNK_ELEMENTS = 2**22
+
+def table_frequencies(clock_hz: float, table_sizes, phaseSteps, min_period: int = 4):
+    """
+    Output frequency of sine_wave.v for every combination of table size and phaseStep.
+
+    One period of the output is one walk up and down the half sine table (see walk_period_length),
+    started from the index of a phase of 0.
+
+    :param clock_hz: Clock frequency of sine_wave.v.
+    :param table_sizes: 1-D array of TABLE_SIZE values.
+    :param phaseSteps: 1-D array of phaseStep values.
+    :param min_period: Shortest period in cycles that is accepted, shorter walks are too coarse to be a tone.
+    :return: (frequencies, periods), arrays of shape (table sizes, phaseSteps). Combinations whose phaseStep
+             does not fit the table, or whose period is shorter than min_period, have a frequency of NaN.
+    """
+    table_sizes = np.asarray(table_sizes, dtype=np.int64)[:, None]
+    phaseSteps = np.asarray(phaseSteps, dtype=np.int64)[None, :]
+    fits = phaseSteps <= table_sizes - 1
+    periods = walk_period_length(table_sizes, np.where(fits, phaseSteps, 1))
+    valid = fits & (periods >= min_period)
+    with np.errstate(divide='ignore'):
+        frequencies = np.where(valid, clock_hz / periods, np.nan)
+    return frequencies, np.where(valid, periods, 0)
+
+def plan_frequencies(clock_hz: float, targets_hz, tolerance: float = 1e-3, bit_count: int = 12, min_table_size: int = 4,
+                     max_table_size: int = 2**16, max_phaseStep: int = 255, min_period: int = 4) -> dict:
+    """
+    Find the smallest half sine table that produces every target frequency within a relative tolerance.
+
+    Table sizes are searched from the smallest up, in vectorized chunks of every (table size, phaseStep)
+    pair, and the search stops at the first size that serves all targets. For that table each target
+    gets the phaseStep whose frequency is closest to it, the smallest phaseStep on a tie.
+
+    The periods are those of a phase of 0, other phases start the walk elsewhere and can shift it by a
+    cycle. Even tables never give a period that is a multiple of 4 cycles, so a target needing one
+    exactly is only served within the tolerance by a neighbouring period.
+
+    :param clock_hz: Clock frequency of sine_wave.v.
+    :param targets_hz: Target output frequencies.
+    :param tolerance: Largest accepted relative frequency error, 1e-3 is 0.1%.
+    :param bit_count: Bit resolution of the table, only used to report the ROM size.
+    :param min_table_size: Smallest TABLE_SIZE considered.
+    :param max_table_size: Largest TABLE_SIZE considered.
+    :param max_phaseStep: Largest phaseStep the phaseStep input can hold (2^PHASE_SIZE - 1).
+    :param min_period: Shortest accepted output period in cycles.
+    :return: A dictionary with the table parameters (bit_count, sampleCount, TABLE_SIZE, TABLE_REG_SIZE,
+             rom_bits) and "frequencies", one entry per target with its phaseStep, period, frequency_hz and error_ppm.
+    :raises ValueError: If no table size in the range serves every target.
+    """
+    targets = np.asarray(targets_hz, dtype=np.float64)
+    if len(targets) == 0 or (targets <= 0).any():
+        raise ValueError("Target frequencies must be positive, got {}".format(list(targets_hz)))
+
+    # generateSineTable builds 2 * (sampleCount // 4) entries, so every table size is even
+    table_sizes = np.arange(max(2, min_table_size + min_table_size % 2), max_table_size + 1, 2, dtype=np.int64)
+    phaseSteps = np.arange(1, max_phaseStep + 1, dtype=np.int64)
+    rows_per_chunk = max(1, PLAN_CHUNK_ELEMENTS // len(phaseSteps))
+    served_alone = np.zeros(len(targets), dtype=bool)
+
+    for first in range(0, len(table_sizes), rows_per_chunk):
+        chunk = table_sizes[first:first + rows_per_chunk]
+        frequencies, periods = table_frequencies(clock_hz, chunk, phaseSteps, min_period)
+        served = np.ones(len(chunk), dtype=bool)
+        for target_index, target in enumerate(targets):
+            errors = np.abs(np.nan_to_num(frequencies, nan=np.inf) - target) / target
+            target_served = errors.min(axis=1) <= tolerance
+            served_alone[target_index] |= target_served.any()
+            served &= target_served
+        if not served.any():
+            continue
+
+        row = int(np.argmax(served))
+        TABLE_SIZE = int(chunk[row])
+        plan = []
+        for target in targets:
+            errors = np.abs(np.nan_to_num(frequencies[row], nan=np.inf) - target) / target
+            best = int(np.argmin(errors))
+            plan.append({
+                "target_hz": float(target),
+                "phaseStep": int(phaseSteps[best]),
+                "period": int(periods[row, best]),
+                "frequency_hz": float(frequencies[row, best]),
+                "error_ppm": float((frequencies[row, best] - target) / target * 1e6),
+            })
+        TABLE_REG_SIZE = math.ceil(math.log2(TABLE_SIZE + 1))
+        return {
+            "clock_hz": float(clock_hz),
+            "tolerance": float(tolerance),
+            "bit_count": int(bit_count),
+            "sampleCount": 2 * TABLE_SIZE,
+            "TABLE_SIZE": TABLE_SIZE,
+            "TABLE_REG_SIZE": TABLE_REG_SIZE,
+            "rom_bits": TABLE_SIZE * int(bit_count),
+            "frequencies": plan,
+        }
+
+    unreachable = [float(target) for target, alone in zip(targets, served_alone) if not alone]
+    if unreachable:
+        raise ValueError("No table size up to {} produces {} Hz within {:g} of the target".format(
+            max_table_size, ', '.join('{:g}'.format(target) for target in unreachable), tolerance))
+    raise ValueError("Every target can be produced, but no single table size up to {} serves them all within {:g}".format(max_table_size, tolerance))
+
+def print_frequency_plan(plan: dict):
+    """
+    Print the table parameters and the phaseStep of every target frequency.
+    """
+    print("TABLE_SIZE = {} (sampleCount {}), TABLE_REG_SIZE = {}, ROM of {} bits at {} bits per entry".format(
+        plan["TABLE_SIZE"], plan["sampleCount"], plan["TABLE_REG_SIZE"], plan["rom_bits"], plan["bit_count"]))
+    print("{:>14} {:>9} {:>8} {:>16} {:>11}".format("target Hz", "phaseStep", "period", "frequency Hz", "error ppm"))
+    for entry in plan["frequencies"]:
+        print("{:>14.6g} {:>9} {:>8} {:>16.9g} {:>11.2f}".format(
+            entry["target_hz"], entry["phaseStep"], entry["period"], entry["frequency_hz"], entry["error_ppm"]))
+
+def main():
+    parser = argparse.ArgumentParser(description='Pick the smallest sine table and a phaseStep per target frequency for sine_wave.v.')
+    parser.add_argument('--clock', type=float, required=True, help='Clock frequency of sine_wave.v in Hz.')
+    parser.add_argument('--frequencies', type=float, nargs='+', required=True, help='Target output frequencies in Hz.')
+    parser.add_argument('--tolerance', type=float, default=1e-3, help='Largest relative frequency error (default: 1e-3, 0.1%%).')
+    parser.add_argument('--bit_count', type=int, default=12, help='Bit resolution of the sine table (default: 12).')
+    parser.add_argument('--max_table_size', type=int, default=2**16, help='Largest TABLE_SIZE to consider (default: 65536).')
+    parser.add_argument('--phase_size', type=int, default=None, help='PHASE_SIZE of sine_wave.v, phaseStep is at most 2^PHASE_SIZE - 1 (default: read from sine_wave.v).')
+    parser.add_argument('--min_period', type=int, default=4, help='Shortest output period in clock cycles (default: 4).')
+    parser.add_argument('--output', type=str, default=None, help='Write the plan to this JSON file, for generate_modules_sine.py --frequency_plan.')
+    args = parser.parse_args()
+
+    phase_size = args.phase_size
+    if phase_size is None:
+        phase_size = read_verilog_parameters(os.path.join(MODULE_ROOT_PATH, 'sine_wave.v'))['PHASE_SIZE']
+
+    plan = plan_frequencies(args.clock, args.frequencies, args.tolerance, args.bit_count, max_table_size=args.max_table_size,
+                            max_phaseStep=2**phase_size - 1, min_period=args.min_period)
+    plan["PHASE_SIZE"] = phase_size
+    print_frequency_plan(plan)
+    print("Generate the table with: generate_modules_sine.py --bit_count {} --override_sample {}".format(plan["bit_count"], plan["sampleCount"]))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(plan, file, indent=1)
+        print("Frequency plan written to {}".format(args.output))
+
+if __name__ == '__main__':
+    main()
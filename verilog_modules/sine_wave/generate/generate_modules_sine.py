@@ -1,27 +1,53 @@
 import argparse
 import concurrent.futures
+import json
 import os
+import sys
 import math
-import matplotlib.pyplot as plt
 import numpy as np
-import re
-from skopt import gp_minimize
-from skopt.space import Integer
-from skopt.utils import use_named_args
-from scipy.optimize import curve_fit
-import matplotlib.cm as cm
+# matplotlib, scikit-optimize and scipy are imported by the plotting, optimisation and fitting
+# functions that use them, so generating the modules with --override_sample only needs numpy
+from sample_count_cache import DEFAULT_FIT_PATH, SampleCountCache, load_sampleCount_fit, make_cache_key, store_sampleCount_fit
+from memory_init import format_coe_file, format_mem_file, memory_file_name
+from spectral_quality import SPECTRAL_METRICS, table_spectral_metrics, walk_period_length
 
 # generate all modules in the verilog module root directory
 MODULE_ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
 
+# helpers shared by the verilog module generators
+sys.path.append(os.path.join(MODULE_ROOT_PATH, '..', 'common'))
+from verilog_rewrite import read_parameters, update_parameter_files, write_if_changed
+from decimated_plot import plot_decimated
+from pipeline_profile import active_profile, add_profile_arguments, finish_profile, profile_from_arguments
+
+# golden model of sine_wave.v, the phase index ROM is checked against its phase arithmetic
+SINE_WAVE_MODEL_PATH = os.path.join(MODULE_ROOT_PATH, 'simulate')
+
 ## ============ half_sine_table.v generation ============
+# Upper bound on the number of table entries evaluated at once by generateSineTables,
+# keeps the float64 intermediates of a batched build to a few hundred MB at most
+MAX_BATCH_ELEMENTS = 2**24
+
+def sine_table_dtype(bitResolution: int) -> np.dtype:
+    """
+    Return the smallest unsigned integer dtype that can hold a sine table of the given bit resolution.
+
+    :param bitResolution: The bit resolution of the table values.
+    :return: One of np.uint8, np.uint16, np.uint32 or np.uint64.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if bitResolution <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    raise ValueError("bitResolution {} does not fit in a 64-bit table".format(bitResolution))
+
 def generateSineTable(bitResolution:int, sampleCount:int) -> np.ndarray:
     """
     Generate a sine wave table with specified bit resolution and phase increment.
 
     :param bitResolution: The bit resolution for the output values. Default is 8 bits.
     :param sampleCount: The phase increment for generating the sine wave. Default is 100.
-    :return: A numpy array containing the sine wave values scaled to fit the specified bit resolution.
+    :return: A numpy array containing the sine wave values scaled to fit the specified bit resolution,
+             stored in the smallest unsigned dtype that fits bitResolution.
     """
 
     amplitude=1 # DONT CHANGE THIS, need unitary amplitude for the sine wave
@@ -30,169 +56,947 @@ def generateSineTable(bitResolution:int, sampleCount:int) -> np.ndarray:
     angularFreq = 2 * math.pi * f
 
     # Generate the sine wave table with values in the range [0, 2*amplitude]
-    table = amplitude * np.array([math.sin(angularFreq * i / sampleCount) for i in range(int(-sampleCount/4), int(sampleCount/4))])
+    # (same operation order as the scalar math.sin loop, so the values are bit-identical)
+    i = np.arange(int(-sampleCount/4), int(sampleCount/4))
+    table = amplitude * np.sin(angularFreq * i / sampleCount)
 
     # Scale to fit unsigned bit resolution, centred around amplitude
     max_val = (2 ** bitResolution) - 1  # Maximum value for the unsigned range
-    table = np.round((table + 1) * (max_val / 2)).astype(int)  # Shifted and scaled
+    table = np.round((table + 1) * (max_val / 2)).astype(sine_table_dtype(bitResolution))  # Shifted and scaled
     return table
 
-def construct_sine_table_module(sine_table: np.ndarray, bitResolution: int, filename='half_sine_table.v'):
+def generateSineTables(configs, ragged=False, fill_value=0):
+    """
+    Generate a family of sine wave tables in one vectorized pass.
+
+    Every table has the values of generateSineTable(bitResolution, sampleCount) for its configuration.
+    The tables are built in row chunks of at most MAX_BATCH_ELEMENTS entries to bound memory use.
+
+    :param configs: Iterable of (bitResolution, sampleCount) pairs.
+    :param ragged: If True, return a list of 1-D tables instead of a padded 2-D array.
+    :param fill_value: Value used to pad the rows of the 2-D array past the end of each table, it has to fit
+                       the dtype of the array.
+    :return: If ragged, a list of numpy arrays, each in the dtype generateSineTable returns for its configuration.
+             Otherwise a tuple (tables, lengths) where tables is a 2-D array of shape (len(configs), max table
+             length) in the dtype of the largest bit resolution, and lengths holds the valid length of each row.
+    """
+
+    configs = [(int(bits), int(samples)) for bits, samples in configs]
+    bitResolutions = np.array([bits for bits, _ in configs], dtype=np.int64)
+    sampleCounts = np.array([samples for _, samples in configs], dtype=np.int64)
+
+    # Same index range as generateSineTable: [int(-sampleCount/4), int(sampleCount/4))
+    starts = np.array([int(-samples/4) for _, samples in configs], dtype=np.int64)
+    lengths = np.array([int(samples/4) for _, samples in configs], dtype=np.int64) - starts
+    scales = np.array([((2 ** bits) - 1) / 2 for bits, _ in configs], dtype=np.float64)
+
+    dtype = sine_table_dtype(int(bitResolutions.max())) if len(configs) else np.dtype(np.uint8)
+    max_length = int(lengths.max()) if len(configs) else 0
+    info = np.iinfo(dtype)
+    if int(fill_value) != fill_value or not info.min <= fill_value <= info.max:
+        raise ValueError("fill_value {} does not fit the {} table array".format(fill_value, dtype))
+    tables = np.full((len(configs), max_length), fill_value, dtype=dtype)
+
+    angularFreq = 2 * math.pi
+    rows_per_chunk = max(1, MAX_BATCH_ELEMENTS // max(max_length, 1))
+    for first in range(0, len(configs), rows_per_chunk):
+        rows = slice(first, first + rows_per_chunk)
+        chunk_length = int(lengths[rows].max())
+        columns = np.arange(chunk_length)
+        i = starts[rows, None] + columns[None, :]
+        table = np.sin(angularFreq * i / sampleCounts[rows, None])
+        table = np.round((table + 1) * scales[rows, None])
+        valid = columns[None, :] < lengths[rows, None]
+        tables[rows, :chunk_length] = np.where(valid, table, fill_value)
+
+    if ragged:
+        return [tables[row, :length].astype(sine_table_dtype(bits)) for row, (length, bits) in enumerate(zip(lengths, bitResolutions))]
+    return tables, lengths
+
+def generateQuarterSineTable(bitResolution:int, sampleCount:int) -> np.ndarray:
+    """
+    Generate the quarter-wave sine table from 0 to +T/4 (inclusive) that the half table can be rebuilt from.
+
+    The half table from generateSineTable has 2 * (sampleCount // 4) entries, covering -T/4 to just before +T/4.
+    Its upper half is the first sampleCount // 4 entries of this table, and its lower half is the mirror image
+    of this table about the midpoint, inverted around the maximum value (see reconstructHalfSineTable).
+
+    :param bitResolution: The bit resolution for the output values.
+    :param sampleCount: The number of samples in a full sine period.
+    :return: A numpy array with sampleCount // 4 + 1 sine values, in the same dtype as generateSineTable.
+    """
+
+    f = 1
+    angularFreq = 2 * math.pi * f
+
+    # Same operation order as generateSineTable, so the shared samples are bit-identical
+    i = np.arange(0, int(sampleCount/4) + 1)
+    table = np.sin(angularFreq * i / sampleCount)
+
+    max_val = (2 ** bitResolution) - 1
+    return np.round((table + 1) * (max_val / 2)).astype(sine_table_dtype(bitResolution))
+
+def quarterFromHalfSineTable(sine_table: np.ndarray, bitResolution: int) -> np.ndarray:
+    """
+    Extract the quarter-wave table from a half table, the last (+T/4) sample is the mirror of the first.
+    """
+    midpoint = len(sine_table) // 2
+    max_val = (2 ** bitResolution) - 1
+    last = np.array([max_val - int(sine_table[0])], dtype=sine_table.dtype) if len(sine_table) else sine_table[:0]
+    return np.concatenate([sine_table[midpoint:], last])
+
+def reconstructHalfSineTable(quarter_table: np.ndarray, bitResolution: int) -> np.ndarray:
+    """
+    Rebuild the half table from a quarter-wave table, in the same way the quarter layout half_sine_table.v does.
+
+    Address k of the half table reads quarter_table[k - midpoint] at or above the midpoint, and
+    max_val - quarter_table[midpoint - k] below it.
+    """
+    midpoint = len(quarter_table) - 1
+    max_val = (2 ** bitResolution) - 1
+    lower = (max_val - quarter_table[midpoint:0:-1].astype(np.int64)).astype(quarter_table.dtype)
+    return np.concatenate([lower, quarter_table[:midpoint]])
+
+def verify_quarter_table(bitResolution: int, sampleCount: int) -> int:
+    """
+    Check that the quarter-wave layout reproduces the half table sample for sample.
+
+    The quarter table is generated independently with generateQuarterSineTable, rebuilt into a half table
+    and compared with generateSineTable, and the quarter table extracted from the half table is checked too.
+
+    :return: The number of half table samples compared.
+    :raises ValueError: If any sample differs.
+    """
+    sine_table = generateSineTable(bitResolution, sampleCount)
+    quarter_table = generateQuarterSineTable(bitResolution, sampleCount)
+    reconstructed = reconstructHalfSineTable(quarter_table, bitResolution)
+
+    if not np.array_equal(reconstructed, sine_table):
+        mismatches = np.flatnonzero(reconstructed != sine_table) if len(reconstructed) == len(sine_table) else []
+        raise ValueError("Quarter-wave table does not reproduce the half table for bitResolution={}, sampleCount={} "
+                         "({} mismatching samples)".format(bitResolution, sampleCount, len(mismatches)))
+    if not np.array_equal(quarterFromHalfSineTable(sine_table, bitResolution), quarter_table):
+        raise ValueError("Quarter-wave table extracted from the half table differs for bitResolution={}, "
+                         "sampleCount={}".format(bitResolution, sampleCount))
+    return len(sine_table)
+
+# Supported half_sine_table.v initialisation formats and table layouts
+TABLE_FORMATS = ('inline', 'hex', 'bin', 'coe')
+TABLE_LAYOUTS = ('half', 'quarter')
+
+def construct_sine_table_module(sine_table: np.ndarray, bitResolution: int, filename='half_sine_table.v', table_format='inline', table_layout='half', dry_run=False, output_dir=None):
     """
     Constructs a Verilog module for a sine wave table.
 
     This function generates a Verilog module that represents a sine wave table.
     The generated module includes an array of sine wave values and the size of the table.
+    The module text is assembled in memory, and each output file is only rewritten if its content changes.
 
     :param sine_table: List of integer values representing the sine wave.
     :param bitResolution: Integer representing the bit resolution of the sine wave values.
     :param filename: String representing the name of the output Verilog file. Default is 'half_sine_table.v'.
+    :param table_format: How the table is initialised:
+                         'inline' - one assignment per entry in an initial block,
+                         'hex' - $readmemh from a hex .mem file written next to the module,
+                         'bin' - $readmemb from a binary .mem file written next to the module,
+                         'coe' - as 'hex', plus a .coe file for Vivado block memory initialisation.
+    :param table_layout: 'half' stores the whole half table. 'quarter' stores only the quarter-wave table and
+                         mirrors it to serve the same half table addresses, halving the ROM.
+    :param dry_run: Print the changes instead of writing the files.
+    :param output_dir: Directory the files are written to (default: the sine wave module directory).
+    :return: List of the files that changed (or would change on a dry run).
     """
 
+    if table_format not in TABLE_FORMATS:
+        raise ValueError("Unknown table_format '{}', expected one of {}".format(table_format, TABLE_FORMATS))
+    if table_layout not in TABLE_LAYOUTS:
+        raise ValueError("Unknown table_layout '{}', expected one of {}".format(table_layout, TABLE_LAYOUTS))
+
     SINE_SIZE = bitResolution
     TABLE_SIZE = len(sine_table)
     TABLE_REG_SIZE = math.ceil(math.log2(TABLE_SIZE + 1))
-    filepath = os.path.join(MODULE_ROOT_PATH, filename)
-
-    with open(filepath, 'w') as file:
-        file.write('`timescale 1ns / 1ps\n\n')
-        file.write('//////////////////////////////////////////////////////////////////////////////////\n')
-        file.write('// Module Name: half_sine_table\n')
-        file.write('// Description: This module contains a lookup table for a half sine wave.\n')
-        file.write('//              The table is parameterized by size and bit resolution.\n')
-        file.write('//\n')
-        file.write('// Autogenerated from generate_modules_sine.py\n')
-        file.write('//////////////////////////////////////////////////////////////////////////////////\n\n')
-        file.write('module half_sine_table #(\n')
-        file.write('    parameter SINE_SIZE = {},\n'.format(SINE_SIZE))
-        file.write('    parameter TABLE_SIZE = {},\n'.format(TABLE_SIZE))
-        file.write('    parameter TABLE_REG_SIZE = {}\n'.format(TABLE_REG_SIZE))
-        file.write(') (\n')
-        file.write('    input  wire [TABLE_REG_SIZE-1:0] addr,       // Address to access the sine value\n')
-        file.write('    output reg  [SINE_SIZE-1:0]      data,       // Sine value at the given address\n')
-        file.write('    output reg [TABLE_REG_SIZE-1:0] table_size  // Maximum valid address (TABLE_SIZE - 1)\n')
-        file.write(');\n\n')
-        file.write('    // Internal memory array for the half sine wave lookup table\n')
-        file.write('    reg [SINE_SIZE-1:0] sine_wave [0:TABLE_SIZE-1];\n\n')
-        file.write('    // Initialise the lookup table with the sine values\n')
-        file.write('    initial begin\n')
-        file.write('        table_size = TABLE_SIZE-1;\n')
-        for i, value in enumerate(sine_table):
-            file.write('        sine_wave[{}] = {};\n'.format(i, value))
-        file.write('    end\n\n')
-        file.write('    // Immediately output the sine value corresponding to the input address\n')
-        file.write('    always @(*) begin\n')
-        file.write('        data = sine_wave[addr];\n')
-        file.write('    end\n\n')
-        file.write('endmodule\n')
-
-def optimise_sampleCount(bitCount, min_sample_val=None, max_sample_val=None, random_state=42, n_calls=100, n_initial_points=100):
-    """
-    Perform Bayesian optimisation to find the optimal sampleCount for a given bitcount.
-    
-    Parameters:
-        n (int): Number of bits for amplitude resolution.
-        m_min (int): Minimum value for `m` (default: 2n).
-        m_max (int): Maximum value for `m` (default: 4 * 2^n).
-        n_calls (int): Number of optimisation calls (default: 50).
-        n_initial_points (int): Number of initial points for the optimisation (default: 10).
-        random_state (int): Random seed for reproducibility (default: 42).
-        
-    Returns:
-        dict: A dictionary containing the optimal `m`, the minimum loss, and optimisation results.
+    directory = output_dir or MODULE_ROOT_PATH
+    filepath = os.path.join(directory, filename)
+    mem_filename = memory_file_name(filename, '.mem')
+
+    # Contents of the ROM array
+    if table_layout == 'quarter':
+        rom_table = quarterFromHalfSineTable(sine_table, bitResolution)
+        rom_name = 'quarter_sine_wave'
+        rom_size = 'QUARTER_SIZE'
+    else:
+        rom_table = sine_table
+        rom_name = 'sine_wave'
+        rom_size = 'TABLE_SIZE'
+
+    parameters = [
+        'parameter SINE_SIZE = {}'.format(SINE_SIZE),
+        'parameter TABLE_SIZE = {}'.format(TABLE_SIZE),
+        'parameter TABLE_REG_SIZE = {}'.format(TABLE_REG_SIZE),
+    ]
+    if table_layout == 'quarter':
+        parameters.append('parameter QUARTER_SIZE = {}'.format(len(rom_table)))
+    if table_format != 'inline':
+        parameters.append('parameter TABLE_FILE = "{}"'.format(mem_filename))
+
+    lines = []
+    lines.append('`timescale 1ns / 1ps\n\n')
+    lines.append('//////////////////////////////////////////////////////////////////////////////////\n')
+    lines.append('// Module Name: half_sine_table\n')
+    lines.append('// Description: This module contains a lookup table for a half sine wave.\n')
+    lines.append('//              The table is parameterized by size and bit resolution.\n')
+    if table_layout == 'quarter':
+        lines.append('//              Only the quarter wave from the midpoint up is stored, the lower\n')
+        lines.append('//              half of the table is its mirror image inverted around the maximum.\n')
+    if table_format != 'inline':
+        lines.append('//              The table contents are loaded from TABLE_FILE, which is resolved\n')
+        lines.append('//              relative to the simulator or project working directory.\n')
+    lines.append('//\n')
+    lines.append('// Autogenerated from generate_modules_sine.py\n')
+    lines.append('//////////////////////////////////////////////////////////////////////////////////\n')
+    if table_layout == 'quarter':
+        lines.append('/* verilator lint_off WIDTHEXPAND */\n')
+        lines.append('/* verilator lint_off WIDTHTRUNC */\n')
+    lines.append('\n')
+    lines.append('module half_sine_table #(\n')
+    lines.append(',\n'.join('    ' + parameter for parameter in parameters) + '\n')
+    lines.append(') (\n')
+    lines.append('    input  wire [TABLE_REG_SIZE-1:0] addr,       // Address to access the sine value\n')
+    lines.append('    output reg  [SINE_SIZE-1:0]      data,       // Sine value at the given address\n')
+    lines.append('    output reg [TABLE_REG_SIZE-1:0] table_size  // Maximum valid address (TABLE_SIZE - 1)\n')
+    lines.append(');\n\n')
+    if table_layout == 'quarter':
+        lines.append('    // Midpoint of the half table, where the stored quarter wave starts\n')
+        lines.append('    localparam [TABLE_REG_SIZE-1:0] MIDPOINT = TABLE_SIZE / 2;\n\n')
+        lines.append('    // Internal memory array for the quarter sine wave lookup table\n')
+    else:
+        lines.append('    // Internal memory array for the half sine wave lookup table\n')
+    lines.append('    reg [SINE_SIZE-1:0] {} [0:{}-1];\n\n'.format(rom_name, rom_size))
+    lines.append('    // Initialise the lookup table with the sine values\n')
+    lines.append('    initial begin\n')
+    lines.append('        table_size = TABLE_SIZE-1;\n')
+    if table_format == 'inline':
+        lines.extend('        {}[{}] = {};\n'.format(rom_name, i, value) for i, value in enumerate(rom_table.tolist()))
+    elif table_format == 'bin':
+        lines.append('        $readmemb(TABLE_FILE, {});\n'.format(rom_name))
+    else:
+        lines.append('        $readmemh(TABLE_FILE, {});\n'.format(rom_name))
+    lines.append('    end\n\n')
+    lines.append('    // Immediately output the sine value corresponding to the input address\n')
+    lines.append('    always @(*) begin\n')
+    if table_layout == 'quarter':
+        lines.append('        if (addr >= MIDPOINT)\n')
+        lines.append('            data = quarter_sine_wave[addr - MIDPOINT];\n')
+        lines.append('        else\n')
+        lines.append("            data = {SINE_SIZE{1'b1}} - quarter_sine_wave[MIDPOINT - addr];\n")
+    else:
+        lines.append('        data = sine_wave[addr];\n')
+    lines.append('    end\n\n')
+    lines.append('endmodule\n')
+
+    outputs = {filepath: ''.join(lines)}
+
+    # Table contents for the $readmem formats
+    if table_format == 'bin':
+        outputs[os.path.join(directory, mem_filename)] = format_mem_file(rom_table, bitResolution, radix=2)
+    elif table_format in ('hex', 'coe'):
+        outputs[os.path.join(directory, mem_filename)] = format_mem_file(rom_table, bitResolution, radix=16)
+    if table_format == 'coe':
+        outputs[os.path.join(directory, memory_file_name(filename, '.coe'))] = format_coe_file(rom_table, bitResolution)
+
+    return [path for path, content in outputs.items() if write_if_changed(path, content, dry_run)]
+
+# ============ phase_index_table.v generation ============ #
+# Encoding of the direction output of phase_index_table.v, how sine_wave.v sets reverseTraversal on a phase change
+DIRECTION_FORWARD = 0                # forward traversal
+DIRECTION_REVERSE = 1                # reverse traversal
+DIRECTION_FORWARD_UNTIL_END = 2      # forward, unless the previous index is at or past the end of the table
+DIRECTION_REVERSE_UNLESS_START = 3   # reverse, unless the previous index is at or below the start of the table
+
+def generatePhaseIndexTable(TABLE_SIZE: int, TABLE_REG_SIZE: int, PHASE_SIZE: int = 8) -> dict:
+    """
+    Precompute what sine_wave.v does on a phase change, for every PHASE_SIZE+1 bit phase input.
+
+    This is a vectorized restatement of phase_to_phaseVal and calculate_start_index from sine_wave.v, with the
+    same 32-bit signed arithmetic, truncating division and register truncation.
+
+    :param TABLE_SIZE: Number of entries in the half sine table.
+    :param TABLE_REG_SIZE: Width of the table address, the index register i is one bit wider.
+    :param PHASE_SIZE: Phase resolution parameter of sine_wave.v.
+    :return: A dictionary of arrays indexed by the unsigned bit pattern of the phase input:
+             "phase" (the signed phase), "phaseVal" (signed), "start_index" (the unsigned bit pattern loaded
+             into i) and "direction" (one of the DIRECTION_ values).
+    """
+    width = PHASE_SIZE + 1
+
+    def wrap(values, bits):
+        # Two's complement truncation, as an assignment to a signed register of the given width
+        values = np.asarray(values, dtype=np.int64) & ((1 << bits) - 1)
+        return np.where(values >> (bits - 1), values - (1 << bits), values)
+
+    def truncating_div(numerator, denominator):
+        # Verilog's / truncates toward zero, the denominators here are positive
+        return np.sign(numerator) * (np.abs(numerator) // denominator)
+
+    codes = np.arange(1 << width, dtype=np.int64)
+    phase = wrap(codes, width)
+    minVal = int(wrap(-3 * (TABLE_SIZE // 2) + 1, width))
+    maxVal = int(wrap((TABLE_SIZE // 2) - 1, width))
+
+    phaseVal = np.select(
+        [(phase >= 0) & (phase <= 90), (phase > 90) & (phase <= 180), (phase >= -180) & (phase < 0)],
+        [truncating_div(phase * maxVal, 90), minVal + truncating_div((phase - 90) * maxVal, 90), -TABLE_SIZE + truncating_div((phase + 180) * TABLE_SIZE, 180)],
+        default=np.where(phase > 180, maxVal, minVal),
+    )
+    phaseVal = wrap(phaseVal, width)
+    start_index = np.abs((TABLE_SIZE // 2) + phaseVal) & ((1 << (TABLE_REG_SIZE + 1)) - 1)
+
+    direction = np.select(
+        [(phase == 90) | (phase == 180), phase == -90, phase == -180, phase >= 0],
+        [DIRECTION_REVERSE, DIRECTION_FORWARD, DIRECTION_REVERSE, DIRECTION_FORWARD_UNTIL_END],
+        default=DIRECTION_REVERSE_UNLESS_START,
+    )
+    return {"phase": phase, "phaseVal": phaseVal, "start_index": start_index, "direction": direction}
+
+def verify_phase_index_table(phase_table: dict, TABLE_SIZE: int, TABLE_REG_SIZE: int, PHASE_SIZE: int = 8) -> int:
+    """
+    Check the phase index ROM against the golden model of sine_wave.v, for every phase input.
+
+    For each phase, the model takes a reset edge from previous index values on both sides of the limits
+    that the direction depends on, and its phaseIdxOut, i and reverseTraversal are compared with the entry.
+
+    :return: The number of phase inputs checked.
+    :raises ValueError: If any entry differs from the model.
+    """
+    # The model lives with the simulation scripts, it is only needed when a ROM is generated
+    if SINE_WAVE_MODEL_PATH not in sys.path:
+        sys.path.append(SINE_WAVE_MODEL_PATH)
+    import sine_wave_model
+
+    model = sine_wave_model.SineWaveModel(np.zeros(TABLE_SIZE, dtype=np.int64), TABLE_REG_SIZE, PHASE_SIZE)
+    i_width = TABLE_REG_SIZE + 1
+    probes = sorted({0, 1, TABLE_SIZE - 2, TABLE_SIZE - 1})
+    for code, phase in enumerate(phase_table["phase"].tolist()):
+        direction = int(phase_table["direction"][code])
+        for previous_i in probes:
+            model.reset_state()
+            model.i = sine_wave_model.wrap_signed(previous_i, i_width)
+            expected_reverse = {
+                DIRECTION_FORWARD: 0,
+                DIRECTION_REVERSE: 1,
+                DIRECTION_FORWARD_UNTIL_END: 0 if model.i < TABLE_SIZE - 1 else 1,
+                DIRECTION_REVERSE_UNLESS_START: 1 if model.i > 0 else 0,
+            }[direction]
+            model.reset_edge(phase, 1)
+            if (model.phaseIdxOut != phase_table["phaseVal"][code]
+                    or model.i & ((1 << i_width) - 1) != phase_table["start_index"][code]
+                    or model.reverseTraversal != expected_reverse):
+                raise ValueError("Phase index table entry for phase {} (phaseVal {}, start index {}, direction {}) does not match "
+                                 "the model of sine_wave.v (phaseVal {}, i {}, reverseTraversal {}) for TABLE_SIZE={}".format(
+                                     phase, phase_table["phaseVal"][code], phase_table["start_index"][code], direction,
+                                     model.phaseIdxOut, model.i, model.reverseTraversal, TABLE_SIZE))
+    return len(phase_table["phase"])
+
+def construct_phase_index_module(TABLE_SIZE: int, TABLE_REG_SIZE: int, PHASE_SIZE: int = 8, filename='phase_index_table.v', table_format='inline', dry_run=False, output_dir=None):
+    """
+    Constructs the Verilog ROM mapping every phase input of sine_wave.v to its table index and traversal direction.
+
+    sine_wave.v used to compute these with a multiply and a divide by 90 or 180 on every phase change,
+    which put a wide combinational divider on the phase change path. The ROM is addressed by the raw
+    bits of the phase input, so it covers all 2^(PHASE_SIZE+1) inputs, out of range phases included.
+    Every entry is checked against the golden model before the module is written, and the module
+    fails to elaborate when it is instantiated with a TABLE_SIZE other than the one it was generated for.
+
+    :param TABLE_SIZE: Number of entries in the half sine table the ROM is generated for.
+    :param TABLE_REG_SIZE: Width of the table address.
+    :param PHASE_SIZE: Phase resolution parameter of sine_wave.v.
+    :param filename: Name of the output Verilog file. Default is 'phase_index_table.v'.
+    :param table_format: How the ROM is initialised, as for construct_sine_table_module.
+    :param dry_run: Print the changes instead of writing the file.
+    :param output_dir: Directory the module is written to (default: the sine wave module directory).
+    :return: List of the files that changed (or would change on a dry run).
+    """
+    if table_format not in TABLE_FORMATS:
+        raise ValueError("Unknown table_format '{}', expected one of {}".format(table_format, TABLE_FORMATS))
+
+    phase_table = generatePhaseIndexTable(TABLE_SIZE, TABLE_REG_SIZE, PHASE_SIZE)
+    verify_phase_index_table(phase_table, TABLE_SIZE, TABLE_REG_SIZE, PHASE_SIZE)
+
+    phase_width = PHASE_SIZE + 1
+    index_width = TABLE_REG_SIZE + 1
+    entry_width = phase_width + index_width + 2
+    direction_names = {
+        DIRECTION_FORWARD: 'forward',
+        DIRECTION_REVERSE: 'reverse',
+        DIRECTION_FORWARD_UNTIL_END: 'forward until end',
+        DIRECTION_REVERSE_UNLESS_START: 'reverse unless start',
+    }
+    directory = output_dir or MODULE_ROOT_PATH
+    filepath = os.path.join(directory, filename)
+    mem_filename = memory_file_name(filename, '.mem')
+
+    # {phaseVal, start_index, direction} of every phase input, phaseVal in two's complement
+    phase_bits = phase_table["phaseVal"].astype(np.int64) & ((1 << phase_width) - 1)
+    entries = (phase_bits << (index_width + 2)) | (phase_table["start_index"].astype(np.int64) << 2) | phase_table["direction"]
+
+    parameters = [
+        'parameter TABLE_SIZE = {}'.format(TABLE_SIZE),
+        'parameter TABLE_REG_SIZE = {}'.format(TABLE_REG_SIZE),
+        'parameter PHASE_SIZE = {}'.format(PHASE_SIZE),
+    ]
+    if table_format != 'inline':
+        parameters.append('parameter TABLE_FILE = "{}"'.format(mem_filename))
+
+    lines = []
+    lines.append('`timescale 1ns / 1ps\n\n')
+    lines.append('//////////////////////////////////////////////////////////////////////////////////\n')
+    lines.append('// Module Name: phase_index_table\n')
+    lines.append('// Description: This module maps a phase input of sine_wave to the signed phase\n')
+    lines.append('//              index, the start index into the half sine table and the initial\n')
+    lines.append('//              traversal direction, without any runtime arithmetic.\n')
+    lines.append('//              The contents are generated for TABLE_SIZE = {}.\n'.format(TABLE_SIZE))
+    lines.append('//              Direction: 0 forward, 1 reverse, 2 forward unless the previous index\n')
+    lines.append('//              is at the end of the table, 3 reverse unless it is at the start.\n')
+    if table_format != 'inline':
+        lines.append('//              The ROM contents are loaded from TABLE_FILE, which is resolved\n')
+        lines.append('//              relative to the simulator or project working directory.\n')
+    lines.append('//\n')
+    lines.append('// Autogenerated from generate_modules_sine.py\n')
+    lines.append('//////////////////////////////////////////////////////////////////////////////////\n')
+    lines.append('/* verilator lint_off WIDTHEXPAND */\n')
+    lines.append('/* verilator lint_off WIDTHTRUNC */\n')
+    lines.append('\n')
+    lines.append('module phase_index_table #(\n')
+    lines.append(',\n'.join('    ' + parameter for parameter in parameters) + '\n')
+    lines.append(') (\n')
+    lines.append('    input  wire signed [PHASE_SIZE:0]     phase,        // Phase input of sine_wave\n')
+    lines.append('    output wire signed [PHASE_SIZE:0]     phaseVal,     // Signed phase index\n')
+    lines.append('    output wire        [TABLE_REG_SIZE:0] start_index,  // Index loaded into i\n')
+    lines.append('    output wire        [1:0]              direction     // Initial traversal direction\n')
+    lines.append(');\n\n')
+    lines.append('    // The contents only hold for the table they were generated for\n')
+    lines.append('    localparam GENERATED_TABLE_SIZE = {};\n\n'.format(TABLE_SIZE))
+    lines.append('    if (TABLE_SIZE != GENERATED_TABLE_SIZE) begin : g_table_size_check\n')
+    lines.append('        $error("phase_index_table was generated for TABLE_SIZE = %0d, regenerate it with generate_modules_sine.py", GENERATED_TABLE_SIZE);\n')
+    lines.append('    end\n\n')
+    lines.append('    // One {phaseVal, start_index, direction} entry per phase input bit pattern\n')
+    lines.append('    reg [PHASE_SIZE+TABLE_REG_SIZE+3:0] phase_rom [0:(1 << (PHASE_SIZE+1))-1];\n\n')
+    lines.append('    initial begin\n')
+    if table_format == 'inline':
+        for code in range(len(entries)):
+            phaseVal = int(phase_table["phaseVal"][code])
+            start_index = int(phase_table["start_index"][code])
+            direction = int(phase_table["direction"][code])
+            lines.append("        phase_rom[{}] = {}'h{:0{}x}; // {}º: phaseVal {}, start index {}, {}\n".format(
+                code, entry_width, int(entries[code]), (entry_width + 3) // 4, int(phase_table["phase"][code]), phaseVal, start_index, direction_names[direction]))
+    elif table_format == 'bin':
+        lines.append('        $readmemb(TABLE_FILE, phase_rom);\n')
+    else:
+        lines.append('        $readmemh(TABLE_FILE, phase_rom);\n')
+    lines.append('    end\n\n')
+    lines.append('    // The phase bits address the ROM as an unsigned value\n')
+    lines.append('    assign {phaseVal, start_index, direction} = phase_rom[$unsigned(phase)];\n\n')
+    lines.append('endmodule\n')
+
+    outputs = {filepath: ''.join(lines)}
+
+    # ROM contents for the $readmem formats
+    if table_format == 'bin':
+        outputs[os.path.join(directory, mem_filename)] = format_mem_file(entries, entry_width, radix=2)
+    elif table_format in ('hex', 'coe'):
+        outputs[os.path.join(directory, mem_filename)] = format_mem_file(entries, entry_width, radix=16)
+    if table_format == 'coe':
+        outputs[os.path.join(directory, memory_file_name(filename, '.coe'))] = format_coe_file(entries, entry_width)
+
+    return [path for path, content in outputs.items() if write_if_changed(path, content, dry_run)]
+
+# Weights of the sampleCount loss function
+SAMPLE_COUNT_WEIGHT = 0.2
+REPEAT_VALUE_WEIGHT = 0.4
+SMOOTHNESS_WEIGHT = 0.4
+MAX_VALUE_PENALTY = 1000
+
+# Largest number of table entries the exhaustive search will evaluate before falling back to GP search.
+# The full range of up to 13 bit tables fits, wider tables are only searched exhaustively within a fit window
+EXHAUSTIVE_MAX_ELEMENTS = 2**28
+
+# Fit-guided search: half width of the window around the fitted sampleCount, as a fraction of the
+# prediction and at least FIT_WINDOW_MIN_HALF_WIDTH, and the offsets of the GP seed points from the prediction
+FIT_WINDOW_FRACTION = 0.25
+FIT_WINDOW_MIN_HALF_WIDTH = 8
+FIT_SEED_OFFSETS = (0.0, -0.1, 0.1)
+
+# After a fit-guided search, the sampleCounts within this fraction of the window width (at least
+# FIT_WINDOW_MIN_HALF_WIDTH) outside each window edge are scored. One that beats the best result in the window
+# widens the window towards it, at most FIT_MAX_REFINEMENTS times per search
+FIT_PROBE_FRACTION = 0.1
+FIT_MAX_REFINEMENTS = 8
+
+# What optimise_sampleCount minimises: the table loss, or a spectral metric of the synthesized tone (negated)
+SAMPLE_COUNT_OBJECTIVES = ('loss',) + SPECTRAL_METRICS
+
+def loss_function(bitCount, sampleCount):
+    """
+    Loss of a sampleCount for a given bit resolution, lower is better.
+
+    Rewards larger tables and penalises repeated values, uneven steps and not reaching the maximum value.
+    """
+    sine_table = generateSineTable(bitCount, sampleCount)
+    unique_values = len(np.unique(sine_table))
+    repeated_values = sampleCount - unique_values
+
+    max_value = (2 ** bitCount) - 1
+
+    # Scaled penalty if the highest value is not achieved
+    penalty = MAX_VALUE_PENALTY * (1 - (sine_table.max() / max_value))
+
+    # Measure smoothness: lower std of differences is better
+    smoothness_penalty = np.std(np.diff(sine_table.astype(np.int64)))
+
+    return (REPEAT_VALUE_WEIGHT * repeated_values) - (SAMPLE_COUNT_WEIGHT * sampleCount) + (SMOOTHNESS_WEIGHT * smoothness_penalty) + penalty
+
+def batch_loss_function(bitCount, sampleCounts):
+    """
+    Vectorized loss_function over many sampleCounts of the same bit resolution.
+
+    The tables are built with generateSineTables in chunks of at most MAX_BATCH_ELEMENTS entries.
+    The sine tables are monotonic, so the unique value count is taken from the non-zero steps; any
+    row that is not monotonic is scored with the scalar loss_function instead.
+
+    :param bitCount: Bit resolution of the tables.
+    :param sampleCounts: 1-D array of sampleCounts, sorted ascending.
+    :return: A float64 array with the loss of each sampleCount (inf for empty tables).
+    """
+    sampleCounts = np.asarray(sampleCounts, dtype=np.int64)
+    losses = np.empty(len(sampleCounts), dtype=np.float64)
+    max_value = (2 ** bitCount) - 1
+
+    # Group the candidates so each chunk of padded tables stays within MAX_BATCH_ELEMENTS
+    table_lengths = 2 * (sampleCounts // 4)
+    first = 0
+    while first < len(sampleCounts):
+        # Largest run of candidates whose padded tables fit in MAX_BATCH_ELEMENTS
+        rows = np.arange(1, len(sampleCounts) - first + 1)
+        fits = rows * np.maximum(table_lengths[first:], 1) <= MAX_BATCH_ELEMENTS
+        last = first + max(1, int(np.count_nonzero(fits)))
+        chunk = sampleCounts[first:last]
+
+        tables, lengths = generateSineTables([(bitCount, sampleCount) for sampleCount in chunk])
+        tables = tables.astype(np.int64)
+        steps = np.diff(tables, axis=1)
+        step_count = lengths - 1
+        # Zero the step from the last table entry into the padding, the rest of the padding is already zero
+        ends = np.flatnonzero((step_count >= 0) & (step_count < steps.shape[1]))
+        steps[ends, step_count[ends]] = 0
+
+        unique_values = np.where(lengths > 0, 1 + np.count_nonzero(steps, axis=1), 0)
+        repeated_values = chunk - unique_values
+        penalty = MAX_VALUE_PENALTY * (1 - (tables.max(axis=1, initial=0) / max_value))
+
+        # Standard deviation of the steps from exact integer sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_step = steps.sum(axis=1) / step_count
+            mean_square_step = np.einsum('ij,ij->i', steps, steps) / step_count
+            smoothness_penalty = np.sqrt(np.maximum(mean_square_step - mean_step ** 2, 0))
+
+        chunk_losses = (REPEAT_VALUE_WEIGHT * repeated_values) - (SAMPLE_COUNT_WEIGHT * chunk) + (SMOOTHNESS_WEIGHT * smoothness_penalty) + penalty
+        chunk_losses[step_count < 1] = np.inf
+
+        # Fall back to the exact scalar loss for any table that is not monotonic
+        for row in np.flatnonzero((steps < 0).any(axis=1)):
+            chunk_losses[row] = loss_function(bitCount, int(chunk[row]))
+
+        losses[first:last] = chunk_losses
+        first = last
+
+    return losses
+
+def spectral_objective(bitCount, sampleCount, metric='sinad', phaseStep=1):
+    """
+    Negated spectral metric of the tone synthesized from a sampleCount's table, lower is better like loss_function.
+
+    :param metric: 'sinad', 'sfdr' or 'enob', see spectral_quality.spectral_metrics.
+    :param phaseStep: Index increment of the table walk.
+    :return: The negated metric, or 0.0 if the table is too short to synthesize a tone with harmonics.
+    """
+    sine_table = generateSineTable(bitCount, sampleCount)
+    table_length = len(sine_table)
+    if not 1 <= phaseStep < table_length or walk_period_length(table_length, phaseStep) < 4:
+        return 0.0
+    return -float(table_spectral_metrics(sine_table[None, :], table_length, phaseStep)[metric][0])
+
+def batch_spectral_objective(bitCount, sampleCounts, metric='sinad', phaseStep=1):
+    """
+    spectral_objective over many sampleCounts of the same bit resolution.
+
+    The tables are built with generateSineTables in chunks of at most MAX_BATCH_ELEMENTS entries, every
+    table then needs its own FFT since the period length changes with the sampleCount.
+    """
+    sampleCounts = np.asarray(sampleCounts, dtype=np.int64)
+    objectives = np.zeros(len(sampleCounts), dtype=np.float64)
+    rows_per_chunk = max(1, MAX_BATCH_ELEMENTS // max(1, int(2 * (sampleCounts.max(initial=0) // 4))))
+    for first in range(0, len(sampleCounts), rows_per_chunk):
+        chunk = sampleCounts[first:first + rows_per_chunk]
+        tables, lengths = generateSineTables([(bitCount, sampleCount) for sampleCount in chunk])
+        for row, table_length in enumerate(int(length) for length in lengths):
+            if 1 <= phaseStep < table_length and walk_period_length(table_length, phaseStep) >= 4:
+                metrics = table_spectral_metrics(tables[row:row + 1], table_length, phaseStep)
+                objectives[first + row] = -metrics[metric][0]
+    return objectives
+
+def exhaustive_sampleCount_search(bitCount, min_sample_val, max_sample_val, objective='loss'):
+    """
+    Score every sampleCount in [min_sample_val, max_sample_val] and return the exact minimum.
+
+    For the table loss, the candidates within rounding distance of the vectorized minimum are re-scored with
+    the scalar loss_function, so the returned loss is exactly what loss_function gives for the winning
+    sampleCount. Spectral objectives are computed the same way in the batch and scalar versions.
+
+    :param objective: One of SAMPLE_COUNT_OBJECTIVES.
+    :return: An OptimizeResult with x, fun, x_iters and func_vals, mirroring gp_minimize's result.
+    """
+    from scipy.optimize import OptimizeResult
+
+    candidates = np.arange(min_sample_val, max_sample_val + 1, dtype=np.int64)
+    if objective != 'loss':
+        losses = batch_spectral_objective(bitCount, candidates, objective)
+        best = int(np.argmin(losses))
+        return OptimizeResult(x=[int(candidates[best])], fun=float(losses[best]), x_iters=candidates[:, None], func_vals=losses)
+
+    losses = batch_loss_function(bitCount, candidates)
+
+    best_loss = losses.min()
+    near_best = np.flatnonzero(losses <= best_loss + 1e-9 * max(1.0, abs(best_loss)))
+    exact_losses = [loss_function(bitCount, int(candidates[idx])) for idx in near_best]
+    best = near_best[int(np.argmin(exact_losses))]
+
+    return OptimizeResult(
+        x=[int(candidates[best])],
+        fun=float(min(exact_losses)),
+        x_iters=candidates[:, None],
+        func_vals=losses,
+    )
+
+def exhaustive_search_size(min_sample_val, max_sample_val):
+    """
+    Number of table entries an exhaustive search over [min_sample_val, max_sample_val] evaluates.
+    """
+    sampleCounts = np.arange(min_sample_val, max_sample_val + 1, dtype=np.int64)
+    return int((2 * (sampleCounts // 4)).sum())
+
+def exhaustive_max_bits():
+    """
+    Largest bit resolution whose full default sampleCount range the exhaustive search scores.
+    """
+    bits = 1
+    while exhaustive_search_size(*default_sampleCount_bounds(bits + 1)) <= EXHAUSTIVE_MAX_ELEMENTS:
+        bits += 1
+    return bits
+
+def default_sampleCount_bounds(bitCount, min_sample_val=None, max_sample_val=None):
+    """
+    Fill in the default sampleCount search range [2 * bitCount, 4 * 2^bitCount] where a bound is not given.
     """
-    # Default range for sampleCount
     if min_sample_val is None:
         min_sample_val = bitCount*2
     if max_sample_val is None:
         max_sample_val = 4 * 2**bitCount
+    return min_sample_val, max_sample_val
 
-    # Define the search space for the sampleCount
-    search_space = [Integer(min_sample_val, max_sample_val, name="sampleCount")]
+def fitted_sampleCount(fit: dict, bitCount) -> float:
+    """
+    sampleCount the exponential fit a*e^(b*bitCount) + c of find_ideal_sampleCount_data predicts.
+    """
+    return fit["a"] * math.exp(fit["b"] * bitCount) + fit["c"]
 
-    # Define the loss function
-    def loss_function(bitCount, sampleCount):
-        sine_table = generateSineTable(bitCount, sampleCount)
-        unique_values = len(np.unique(sine_table))
-        repeated_values = sampleCount - unique_values
+def fit_sampleCount_window(fit: dict, bitCount, min_sample_val, max_sample_val):
+    """
+    Search window around the fitted sampleCount: FIT_WINDOW_FRACTION of the prediction (at least
+    FIT_WINDOW_MIN_HALF_WIDTH) on either side, within [min_sample_val, max_sample_val].
+
+    :return: (low, high), or None if the prediction lies outside the range, the fit is then not used.
+    """
+    predicted = fitted_sampleCount(fit, bitCount)
+    half_width = max(FIT_WINDOW_MIN_HALF_WIDTH, FIT_WINDOW_FRACTION * predicted)
+    low = max(min_sample_val, int(math.floor(predicted - half_width)))
+    high = min(max_sample_val, int(math.ceil(predicted + half_width)))
+    if not min_sample_val <= predicted <= max_sample_val or low >= high:
+        return None
+    return low, high
 
-        sampleCountWeight = 0.2
-        repeatValueWeight = 0.4
-        smoothnessWeight = 0.4
-        max_value = (2 ** bitCount) - 1
+def fit_search_window(fit: dict, bitCount, min_sample_val, max_sample_val, search='gp'):
+    """
+    Window optimise_sampleCount searches with a fit, or None if the fit is not used and the full range is searched.
 
-        # Scaled penalty if the highest value is not achieved
-        penalty = 1000 * (1 - (sine_table.max() / max_value))
+    The fit is not used for the bit resolutions it was fitted to, whose optimum it does not predict better
+    than a full search found it, nor for exhaustive searches the full range of which fits in
+    EXHAUSTIVE_MAX_ELEMENTS, so those keep returning the exact minimum of the range.
+    """
+    if not fit or int(bitCount) in fit.get("bits", ()):
+        return None
+    if search == 'exhaustive' and exhaustive_search_size(min_sample_val, max_sample_val) <= EXHAUSTIVE_MAX_ELEMENTS:
+        return None
+    return fit_sampleCount_window(fit, bitCount, min_sample_val, max_sample_val)
 
-        # Measure smoothness: lower std of differences is better
-        smoothness_penalty = np.std(np.diff(sine_table))
+def batch_sampleCount_objective(bitCount, sampleCounts, objective='loss'):
+    """
+    The optimise_sampleCount objective of many sampleCounts, batch_loss_function or batch_spectral_objective.
+    """
+    if objective != 'loss':
+        return batch_spectral_objective(bitCount, sampleCounts, objective)
+    return batch_loss_function(bitCount, sampleCounts)
 
-        return (repeatValueWeight * repeated_values) - (sampleCountWeight * sampleCount) + + (smoothnessWeight * smoothness_penalty) + penalty
+def search_sampleCount_window(bitCount, min_sample_val, max_sample_val, random_state=42, n_calls=100, n_initial_points=100, search='gp', objective='loss', x0=None):
+    """
+    Run one GP or exhaustive search of optimise_sampleCount over [min_sample_val, max_sample_val].
 
-    # Define the objective function to wrap the loss function
+    :param x0: sampleCounts the GP search evaluates first, they take the place of as many random initial points.
+    :return: An OptimizeResult with x, fun, x_iters and func_vals.
+    """
+    if search == 'exhaustive':
+        return exhaustive_sampleCount_search(bitCount, min_sample_val, max_sample_val, objective)
+
+    from skopt import gp_minimize
+    from skopt.space import Integer
+    from skopt.utils import use_named_args
+
+    # Define the search space for the sampleCount
+    search_space = [Integer(min_sample_val, max_sample_val, name="sampleCount")]
+
+    # Define the objective function to wrap the loss function (or the spectral objective)
     @use_named_args(search_space)
-    def objective(**params):
+    def objective_function(**params):
         sampleCount = params["sampleCount"]
+        if objective != 'loss':
+            return spectral_objective(bitCount, sampleCount, objective)
         return loss_function(bitCount, sampleCount)
 
+    x0 = [[int(sampleCount)] for sampleCount in x0] if x0 else None
     # Perform Bayesian optimisation
-    result = gp_minimize(
-        func=objective,
+    return gp_minimize(
+        func=objective_function,
         dimensions=search_space,
         n_calls=n_calls,
-        n_initial_points=n_initial_points,
+        n_initial_points=max(1, min(n_initial_points, n_calls - len(x0 or []))),
+        x0=x0,
         random_state=random_state, # Same seed for reproducibility
         verbose=False,
     )
 
+def optimise_sampleCount(bitCount, min_sample_val=None, max_sample_val=None, random_state=42, n_calls=100, n_initial_points=100, search='gp', objective='loss', fit=None):
+    """
+    Find the optimal sampleCount for a given bitcount, using Bayesian optimisation or an exhaustive search.
+
+    With a fit from find_ideal_sampleCount_data, only a window around the fitted sampleCount is searched
+    (see fit_search_window for when the fit is not used) and the GP search starts from the prediction.
+    The sampleCounts just outside the window are then scored, and if one of them beats the best result
+    the window is doubled towards it and searched again, up to FIT_MAX_REFINEMENTS times or until it
+    reaches the range. A message is printed if the refinements stop with a better sampleCount still outside.
+
+    Parameters:
+        bitCount (int): Number of bits for amplitude resolution.
+        min_sample_val (int): Minimum value for the sampleCount (default: 2 * bitCount).
+        max_sample_val (int): Maximum value for the sampleCount (default: 4 * 2^bitCount).
+        random_state (int): Random seed for reproducibility (default: 42).
+        n_calls (int): Number of optimisation calls (default: 100).
+        n_initial_points (int): Number of initial points for the optimisation (default: 100).
+        search (str): 'gp' for Gaussian-process minimisation, or 'exhaustive' to score every sampleCount
+                      in the range. The exhaustive search falls back to 'gp' if the range would evaluate
+                      more than EXHAUSTIVE_MAX_ELEMENTS table entries.
+        objective (str): 'loss' for loss_function, or 'sinad', 'sfdr' or 'enob' to maximise that spectral
+                         metric of the synthesized tone (the minimum loss is then the negated metric).
+        fit (dict): Exponential fit with keys a, b and c (and the bits it was fitted to) from load_fit, or None
+                    to search the whole range.
+
+    Returns:
+        dict: A dictionary containing the optimal sampleCount, the minimum loss, the optimisation results,
+              the search that was used, the number of objective evaluations, whether a fit window was used,
+              the window that was searched last, the number of window refinements and the evaluated fraction
+              of the sampleCount range.
+    """
+    # Default range for sampleCount
+    min_sample_val, max_sample_val = default_sampleCount_bounds(bitCount, min_sample_val, max_sample_val)
+
+    if search not in ('gp', 'exhaustive'):
+        raise ValueError("Unknown search '{}', expected 'gp' or 'exhaustive'".format(search))
+    if objective not in SAMPLE_COUNT_OBJECTIVES:
+        raise ValueError("Unknown objective '{}', expected one of {}".format(objective, ', '.join(SAMPLE_COUNT_OBJECTIVES)))
+
+    window = fit_search_window(fit, bitCount, min_sample_val, max_sample_val, search)
+    fit_window = window is not None
+    x0 = None
+    if fit_window:
+        predicted = fitted_sampleCount(fit, bitCount)
+        x0 = sorted({min(max(int(round(predicted * (1 + offset))), window[0]), window[1]) for offset in FIT_SEED_OFFSETS})
+    else:
+        window = (min_sample_val, max_sample_val)
+
+    if search == 'exhaustive' and exhaustive_search_size(*window) > EXHAUSTIVE_MAX_ELEMENTS:
+        print("sampleCount range [{}, {}] is too large for an exhaustive search, falling back to GP search".format(*window))
+        search = 'gp'
+
+    evaluated = set()
+    evaluations = 0
+    refinements = 0
+    best = None
+    with active_profile().stage('optimise_sampleCount', bits=int(bitCount), search=search, objective=objective, window=list(window)) as stage:
+        while True:
+            result = search_sampleCount_window(bitCount, *window, random_state, n_calls, n_initial_points, search, objective, x0)
+            evaluations += len(result.func_vals)
+            evaluated.update(int(x[0]) for x in result.x_iters)
+            if best is None or result.fun < best.fun:
+                best = result
+            if not fit_window:
+                break
+
+            # Score the sampleCounts just outside the window, the optimum lies outside if one of them is better
+            low, high = window
+            band = max(FIT_WINDOW_MIN_HALF_WIDTH, int(FIT_PROBE_FRACTION * (high - low)))
+            below = np.arange(max(min_sample_val, low - band), low, dtype=np.int64)
+            above = np.arange(high + 1, min(max_sample_val, high + band) + 1, dtype=np.int64)
+            probes = np.concatenate([below, above])
+            if len(probes) == 0:
+                break
+            probe_losses = batch_sampleCount_objective(bitCount, probes, objective)
+            evaluations += len(probes)
+            evaluated.update(int(sampleCount) for sampleCount in probes)
+
+            # Same rounding tolerance as the exhaustive search between the batch and scalar objectives
+            threshold = best.fun - 1e-9 * max(1.0, abs(best.fun))
+            extend_low = len(below) > 0 and probe_losses[:len(below)].min() < threshold
+            extend_high = len(above) > 0 and probe_losses[len(below):].min() < threshold
+            if not (extend_low or extend_high):
+                break
+            width = high - low + 1
+            next_window = (max(min_sample_val, low - width) if extend_low else low, min(max_sample_val, high + width) if extend_high else high)
+            if refinements == FIT_MAX_REFINEMENTS or (search == 'exhaustive' and exhaustive_search_size(*next_window) > EXHAUSTIVE_MAX_ELEMENTS):
+                print("sampleCount {} outside the searched window [{}, {}] beats its best result, the fit may be off, "
+                      "rerun without it for the optimum".format(int(probes[np.argmin(probe_losses)]), low, high))
+                break
+            window = next_window
+            x0 = [int(best.x[0]), int(probes[np.argmin(probe_losses)])]
+            refinements += 1
+        stage.update(evaluations=evaluations, refinements=refinements, final_window=list(window))
+
     # Extract and return the results
-    optimal_sampleCount = result.x[0]
-    minimum_loss = result.fun
+    optimal_sampleCount = best.x[0]
+    minimum_loss = best.fun
 
     return {
         "optimal_sampleCount": optimal_sampleCount,
         "minimum_loss": minimum_loss,
-        "result": result,
+        "result": best,
+        "search": search,
+        "evaluations": evaluations,
+        "fit_window": fit_window,
+        "window": [int(window[0]), int(window[1])],
+        "refinements": refinements,
+        "evaluated_fraction": len(evaluated) / (max_sample_val - min_sample_val + 1),
     }
 
+def sampleCount_fit_key(objective='loss'):
+    """
+    Key of the stored fit for an objective, covering the loss weights the optimal sampleCounts depend on.
+    """
+    return make_cache_key(objective=objective, weights=[SAMPLE_COUNT_WEIGHT, REPEAT_VALUE_WEIGHT, SMOOTHNESS_WEIGHT, MAX_VALUE_PENALTY])
+
+def load_fit(objective='loss', path=DEFAULT_FIT_PATH):
+    """
+    The fit find_ideal_sampleCount_data last stored for an objective, or None if there is none.
+    """
+    return load_sampleCount_fit(sampleCount_fit_key(objective), path)
+
+
+# Persistent cache of optimise_sampleCount results, stored next to this script
+SAMPLE_COUNT_CACHE = SampleCountCache()
+
+def sampleCount_cache_key(bitCount, min_sample_val=None, max_sample_val=None, random_state=42, n_calls=100, n_initial_points=100, search='gp', objective='loss', fit=None):
+    """
+    Cache key of an optimise_sampleCount call, covering every input that changes its result.
+    """
+    min_sample_val, max_sample_val = default_sampleCount_bounds(bitCount, min_sample_val, max_sample_val)
+    # The fit is only part of the key when optimise_sampleCount narrows the search with it, searches of the
+    # full range (no fit, or one fit_search_window does not use) keep the key they had before fit-guided searches
+    fit_window = fit_search_window(fit, bitCount, min_sample_val, max_sample_val, search)
+    fit_params = {} if fit_window is None else {"fit": [fit["a"], fit["b"], fit["c"]]}
+    return make_cache_key(
+        **fit_params,
+        bitCount=int(bitCount),
+        min_sample_val=int(min_sample_val),
+        max_sample_val=int(max_sample_val),
+        random_state=random_state,
+        n_calls=n_calls,
+        n_initial_points=n_initial_points,
+        search=search,
+        objective=objective,
+        weights=[SAMPLE_COUNT_WEIGHT, REPEAT_VALUE_WEIGHT, SMOOTHNESS_WEIGHT, MAX_VALUE_PENALTY],
+    )
+
+def cached_optimise_sampleCount(bitCount, min_sample_val=None, max_sample_val=None, random_state=42, n_calls=100, n_initial_points=100, search='gp', objective='loss', fit=None, cache=SAMPLE_COUNT_CACHE):
+    """
+    optimise_sampleCount with its result memoized in a SampleCountCache.
+
+    Takes the same parameters as optimise_sampleCount, plus the cache to use (None disables caching).
+    On a cache hit the returned "result" is None, since the optimiser state is not stored.
+
+    Returns:
+        dict: The optimise_sampleCount dictionary, with "cached" set to whether it came from the cache.
+    """
+    params = dict(min_sample_val=min_sample_val, max_sample_val=max_sample_val, random_state=random_state,
+                  n_calls=n_calls, n_initial_points=n_initial_points, search=search, objective=objective, fit=fit)
+    profile = active_profile()
+    if cache is None:
+        results = optimise_sampleCount(bitCount, **params)
+        profile.count('loss_evaluations', results["evaluations"])
+        return dict(results, cached=False)
+
+    key = sampleCount_cache_key(bitCount, **params)
+    cached = cache.get(key)
+    if cached is not None:
+        profile.count('sample_count_cache_hits')
+        return dict(cached, result=None, cached=True)
+
+    profile.count('sample_count_cache_misses')
+    results = optimise_sampleCount(bitCount, **params)
+    profile.count('loss_evaluations', results["evaluations"])
+    cache.put(key, {
+        "optimal_sampleCount": int(results["optimal_sampleCount"]),
+        "minimum_loss": float(results["minimum_loss"]),
+        "search": results["search"],
+        "window": results["window"],
+        "fit_window": results["fit_window"],
+        "evaluated_fraction": results["evaluated_fraction"],
+    })
+    return dict(results, cached=False)
+
 
 # ============ sine_wave.v generation ============ #
 
-def update_verilog_macros(sine_table: np.ndarray, bitResolution: int, filename = 'sine_wave.v'):
+def update_verilog_macros(sine_table: np.ndarray, bitResolution: int, filename = 'sine_wave.v', dry_run=False, output_dir=None):
     """
     Update the parameter definitions for the sine_wave.v module.
 
+    All files are updated in a single pass, and a file is only rewritten if a parameter value changes.
+
     :param sine_table: List of integer values representing the sine wave.
     :param bitResolution: Bit resolution for the sine wave values.
-    :param filename: Path to the Verilog file to be updated.
+    :param filename: Path to the Verilog file to be updated, or a list of paths.
+    :param dry_run: Print the changes instead of writing the files.
+    :param output_dir: Write the updated modules to this directory instead of updating them in place,
+                       the modules in the sine wave module directory are used as templates.
+    :return: List of the files that changed (or would change on a dry run).
     """
 
     SINE_SIZE = bitResolution
     TABLE_SIZE = len(sine_table)
     TABLE_REG_SIZE = math.ceil(math.log2(TABLE_SIZE + 1))
-    file_path = os.path.join(MODULE_ROOT_PATH, filename)
+    filenames = [filename] if isinstance(filename, str) else filename
     parameters = {"SINE_SIZE": SINE_SIZE, "TABLE_SIZE": TABLE_SIZE, "TABLE_REG_SIZE": TABLE_REG_SIZE}
 
-    with open(file_path, 'r') as file:
-        content = file.read()
-
-    # Regex pattern to match Verilog parameters (e.g., parameter NAME = VALUE)
-    pattern = r"parameter\s+(\w+)\s*=\s*(\d+)"
-
-    def replacer(match):
-        param_name = match.group(1)
-        # Replace the parameter value if it's in the dictionary
-        if param_name in parameters:
-            new_value = parameters[param_name]
-            return f"parameter {param_name} = {new_value}"
-        return match.group(0)  # Keep the original line if parameter not in dictionary
-
-    # Replace parameters in the Verilog file
-    updated_content = re.sub(pattern, replacer, content)
-
-    # Overwrite the original file
-    with open(file_path, 'w') as file:
-        file.write(updated_content)
+    directory = output_dir or MODULE_ROOT_PATH
+    updates = {os.path.join(directory, name): parameters for name in filenames}
+    sources = {os.path.join(directory, name): os.path.join(MODULE_ROOT_PATH, name) for name in filenames}
+    return update_parameter_files(updates, dry_run, sources)
 
 
 def plotSineWave(sine_table: np.ndarray):
@@ -202,8 +1006,9 @@ def plotSineWave(sine_table: np.ndarray):
     :param sine_table: A numpy array containing the sine wave values to be plotted.
     :type sine_table: np.ndarray
     """
+    import matplotlib.pyplot as plt
 
-    plt.plot(sine_table)
+    plot_decimated(sine_table)
     plt.title('Sine Wave')
     plt.xlabel('Samples')
     plt.ylabel('Sine Value')
@@ -212,62 +1017,126 @@ def plotSineWave(sine_table: np.ndarray):
 
 # ============ Ideal sampleCount ============ #
 
-def find_ideal_sampleCount_data(maxBits=16):
+def optimise_sampleCount_job(bits, random_state, search, objective='loss', fit=None):
+    """
+    Process pool job for sweep_optimise_sampleCount, returns only picklable values.
+    """
+    result = optimise_sampleCount(bits, random_state=random_state, search=search, objective=objective, fit=fit)
+    return bits, int(result["optimal_sampleCount"]), float(result["minimum_loss"]), result["search"], result["evaluations"], result["evaluated_fraction"]
+
+def sweep_optimise_sampleCount(bitResolutions, workers=None, random_state=42, search='gp', verbose=True, cache=SAMPLE_COUNT_CACHE, objective='loss', fit=None):
+    """
+    Run optimise_sampleCount for several bit resolutions on a process pool.
+
+    The jobs are submitted largest bit resolution first, since those dominate the run time. Every job is
+    seeded with random_state, so the results do not depend on the worker count or completion order and
+    match a serial optimise_sampleCount(bits) call. Bit resolutions already in the cache are not rerun,
+    and new results are stored by this process once their job finishes.
+
+    :param bitResolutions: Iterable of bit resolutions to optimise.
+    :param workers: Number of worker processes (default: os.cpu_count()). 1 runs the jobs in this process.
+    :param random_state: Seed passed to every optimise_sampleCount job.
+    :param search: The optimise_sampleCount search to use, 'gp' or 'exhaustive'.
+    :param verbose: Print each result as its job finishes.
+    :param cache: SampleCountCache to read and store results in, or None to always optimise.
+    :param objective: The optimise_sampleCount objective, one of SAMPLE_COUNT_OBJECTIVES.
+    :param fit: Fit from load_fit that narrows every search to a window around its prediction, or None.
+    :return: A dictionary mapping each bit resolution to a dict with its optimal_sampleCount, minimum_loss,
+             search and evaluated_fraction, ordered by bit resolution.
+    """
+    profile = active_profile()
+    results = {}
+    jobs = []
+    for bits in sorted({int(bits) for bits in bitResolutions}, reverse=True):
+        cached = cache.get(sampleCount_cache_key(bits, random_state=random_state, search=search, objective=objective, fit=fit)) if cache else None
+        if cached is not None:
+            results[bits] = cached
+            profile.count('sample_count_cache_hits')
+        else:
+            jobs.append(bits)
+            if cache:
+                profile.count('sample_count_cache_misses')
+    if verbose and results:
+        print(f"Cached results for bits: {sorted(results)}")
+    total = len(results) + len(jobs)
+
+    def job_done(bits, optimal_sampleCount, minimum_loss, used_search, evaluations, evaluated_fraction):
+        results[bits] = {"optimal_sampleCount": optimal_sampleCount, "minimum_loss": minimum_loss, "search": used_search,
+                         "evaluated_fraction": evaluated_fraction}
+        profile.count('loss_evaluations', evaluations)
+        if cache:
+            cache.put(sampleCount_cache_key(bits, random_state=random_state, search=search, objective=objective, fit=fit), results[bits])
+        if verbose:
+            print(f"[{len(results)}/{total}] Done for bits: {bits}, optimal_sampleCount: {optimal_sampleCount}, "
+                  f"evaluated {100 * evaluated_fraction:.2f}% of the range")
+
+    with profile.stage('sweep_optimise_sampleCount', jobs=len(jobs), cached=len(results), workers=workers):
+        if workers == 1 or len(jobs) <= 1:
+            for bits in jobs:
+                job_done(*optimise_sampleCount_job(bits, random_state, search, objective, fit))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(optimise_sampleCount_job, bits, random_state, search, objective, fit) for bits in jobs]
+                for future in concurrent.futures.as_completed(futures):
+                    job_done(*future.result())
+
+    return {bits: results[bits] for bits in sorted(results)}
+
+def find_ideal_sampleCount_data(maxBits=16, search='gp', workers=None, cache=SAMPLE_COUNT_CACHE, objective='loss', fit_path=DEFAULT_FIT_PATH):
     """
     Plot the ideal sample count data for a range of bit resolutions and fits the data to an exponential curve.
     This function calculates the optimal sample count for bit resolutions ranging from `minBits` to `maxBits` using 
-    multithreading to speed up the computation. It then fits the calculated data to an exponential curve and plots 
-    both the original data points and the fitted curve.
+    a process pool to speed up the computation. It then fits the calculated data to an exponential curve and plots
+    both the original data points and the fitted curve. Every bit resolution is searched over its full range,
+    so the new fit does not depend on a previous one.
    
      Parameters:
     maxBits (int): The maximum bit resolution to consider. The default value is 16.
+    search (str): The optimise_sampleCount search to use, 'gp' or 'exhaustive'.
+    workers (int): Number of worker processes for the sweep (default: os.cpu_count()).
+    cache (SampleCountCache): Cache of optimisation results, or None to always optimise.
+    objective (str): The optimise_sampleCount objective, one of SAMPLE_COUNT_OBJECTIVES.
+    fit_path (str): File the new fit is stored in for load_fit, or None to not store it.
     Returns:
-    None: It displays a plot of the data and the fitted curve.
+    tuple: The bit resolutions, their ideal sample counts, the fit parameters (a, b, c) and the smooth x and y
+           values of the fitted curve.
     """
     minBits = 2
 
-    def optimise_sampleCount_wrapper(bits):
-        """
-        Wrapper function to calculate the optimal sample count for a given bit resolution.
-        """
-        return bits, optimise_sampleCount(bits)["optimal_sampleCount"]
-    
-    def thread_done_callback(future):
-        """
-        Callback function to print the result of a threadn when it is done.
-        """
-        bits, optimal_sampleCount = future.result()
-        print(f"Thread done for bits: {bits}, optimal_sampleCount: {optimal_sampleCount}")
-
     bitsToCycle = np.arange(minBits, maxBits+1)
     print(bitsToCycle)
 
-    # Use ThreadPoolExecutor for multithreading
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [executor.submit(optimise_sampleCount_wrapper, bits) for bits in bitsToCycle]
-        for future in futures:
-            future.add_done_callback(thread_done_callback)
-
-    # Collect the results
-    results = [future.result() for future in futures]
+    # Run the optimisations on a process pool, largest bit resolution first
+    sweep_results = sweep_optimise_sampleCount(bitsToCycle, workers=workers, search=search, cache=cache, objective=objective)
 
     # Populate the dictionary with the results
-    bit_idealSample_dict = {bits: optimal_sampleCount for bits, optimal_sampleCount in results}
+    bit_idealSample_dict = {bits: result["optimal_sampleCount"] for bits, result in sweep_results.items()}
     print(bit_idealSample_dict)
     idealSamples = list(bit_idealSample_dict.values())
 
     # === Now try to fit the data to a curve
+    from scipy.optimize import curve_fit
     curve = lambda x, a, b, c : a * np.exp(b * x) + c
     #fit the data to the exponential curve
-    params, covariance = curve_fit(curve, bitsToCycle, idealSamples)
+    with active_profile().stage('curve_fit', points=len(idealSamples)):
+        params, covariance = curve_fit(curve, bitsToCycle, idealSamples)
     a, b, c = params
     print(f"Exponential fit (ae^(bx) +c): a={a}, b={b}, c={c}")
+    if fit_path is not None:
+        # Kept for optimise_sampleCount to search around the fitted curve for new bit resolutions
+        store_sampleCount_fit(sampleCount_fit_key(objective), {
+            "a": float(a), "b": float(b), "c": float(c), "search": search,
+            "bits": [int(bits) for bits in bitsToCycle], "sampleCounts": [int(sampleCount) for sampleCount in idealSamples],
+        }, fit_path)
+        print(f"Fit stored in {fit_path}")
     # Generate smooth x values for plotting the fitted curve
     x_smooth = np.linspace(min(bitsToCycle), max(bitsToCycle), 500)
     y_smooth = curve(x_smooth, a, b, c)
     return bitsToCycle, idealSamples, params, x_smooth, y_smooth
     
 def plot_ideal_sampleCount(bitsToCycle, idealSamples, params, x_smooth, y_smooth):
+    import matplotlib.pyplot as plt
+
     # Plot the original data points
     plt.scatter(bitsToCycle, idealSamples, label="Data Points", color="blue", zorder=5)
 
@@ -284,25 +1153,38 @@ def plot_ideal_sampleCount(bitsToCycle, idealSamples, params, x_smooth, y_smooth
     plt.tight_layout()  # Adjust the padding between and around subplots
     plt.show()
 
-def plot_multiple_sine_tables(max_bits, identicalSampleCount = None, wavesToPlot=None):
+def plot_multiple_sine_tables(max_bits, identicalSampleCount = None, wavesToPlot=None, search='gp', workers=None, cache=SAMPLE_COUNT_CACHE, objective='loss', fit=None):
     """
     Generate and plot multiple sine tables for bit resolutions from 2 to max_bits.
 
     :param max_bits: The maximum bit resolution to consider.
+    :param search: The optimise_sampleCount search to use, 'gp' or 'exhaustive'.
+    :param workers: Number of worker processes for the sample count sweep (default: os.cpu_count()).
+    :param cache: Cache of optimisation results, or None to always optimise.
+    :param objective: The optimise_sampleCount objective, one of SAMPLE_COUNT_OBJECTIVES.
+    :param fit: Fit from load_fit to narrow the sample count searches with, or None.
     """
+    import matplotlib.pyplot as plt
+
+    bit_resolutions = [bits for bits in range(2, max_bits + 1) if not wavesToPlot or bits in wavesToPlot]
+
+    # Optimise every plotted bit resolution once, both subplots reuse the same sample counts
+    if identicalSampleCount:
+        sample_counts = {bits: identicalSampleCount for bits in bit_resolutions}
+    else:
+        sweep_results = sweep_optimise_sampleCount(bit_resolutions, workers=workers, search=search, cache=cache, objective=objective, fit=fit)
+        sample_counts = {bits: result["optimal_sampleCount"] for bits, result in sweep_results.items()}
+
     plt.figure(figsize=(14, 10))
-    colormap = cm.get_cmap('viridis', max_bits - 1)
+    colormap = plt.get_cmap('viridis', max_bits - 1)
 
     # First subplot: Linear scale
     plt.subplot(2, 1, 1)
-    for bit_resolution in range(2, max_bits + 1):
-        if wavesToPlot and bit_resolution not in wavesToPlot:
-            continue
-        sample_count = identicalSampleCount if identicalSampleCount else optimise_sampleCount(bit_resolution)["optimal_sampleCount"]
-        sine_table = generateSineTable(bit_resolution, sample_count)
+    for bit_resolution in bit_resolutions:
+        sine_table = generateSineTable(bit_resolution, sample_counts[bit_resolution])
         sine_table_normalised = sine_table / np.max(sine_table)  # Scale to have a maximum value of 1
         color = colormap(bit_resolution - 2)
-        plt.step(range(len(sine_table_normalised)), sine_table_normalised, label='{} bits'.format(bit_resolution), where='mid', color=color)
+        plot_decimated(range(len(sine_table_normalised)), sine_table_normalised, label='{} bits'.format(bit_resolution), where='mid', color=color)
     
     title_part = "Identical Samples" if identicalSampleCount else "Optimal Samples"
     plt.title('Sine Tables for Different Bit Resolutions ({})'.format(title_part), fontsize=16)
@@ -315,14 +1197,11 @@ def plot_multiple_sine_tables(max_bits, identicalSampleCount = None, wavesToPlot
     # Second subplot: Logarithmic scale if identicalSampleCount is None
     if not identicalSampleCount:
         plt.subplot(2, 1, 2)
-        for bit_resolution in range(2, max_bits + 1):
-            if wavesToPlot and bit_resolution not in wavesToPlot:
-                continue
-            sample_count = optimise_sampleCount(bit_resolution)["optimal_sampleCount"]
-            sine_table = generateSineTable(bit_resolution, sample_count)
+        for bit_resolution in bit_resolutions:
+            sine_table = generateSineTable(bit_resolution, sample_counts[bit_resolution])
             sine_table_normalised = sine_table / np.max(sine_table)  # Scale to have a maximum value of 1
             color = colormap(bit_resolution - 2)
-            plt.step(range(len(sine_table_normalised)), sine_table_normalised, label='{} bits'.format(bit_resolution), where='mid', color=color)
+            plot_decimated(range(len(sine_table_normalised)), sine_table_normalised, label='{} bits'.format(bit_resolution), where='mid', color=color)
         
         plt.xscale('log')
         plt.xlabel('Samples (Log Scale)', fontsize=12)
@@ -338,50 +1217,126 @@ def main():
     parser = argparse.ArgumentParser(description='Generate a sine wave table.')
     parser.add_argument('--bit_count', type=int, default=8, help='The bit resolution for the sine wave values.')
     parser.add_argument('--override_sample', type=int, default=None, help='Override the sample count for the sine wave table.')
+    parser.add_argument('--frequency_plan', type=str, default=None, help='Take the bit count and sample count from a frequency_plan.py JSON plan.')
     parser.add_argument('--find_sample', type=int, default=None, help='Find the ideal sample count data, up to the specified bit resolution.')
     parser.add_argument('--plot_multiple', type=int, nargs='+', default=None, help='Plot multiple sine tables, x y z_1 z_2... where x is the max bits, y is the sample count (0 for ideal samples), and z_1 z_2... are the bit resolutions to plot.')
     parser.add_argument('--plot_sample', action='store_true', help='Plot the ideal sample count data.')
     parser.add_argument('--plot_sine', action='store_true', help='Plot the generated sine wave.')
     parser.add_argument('--no_generate', action='store_true', help='Do not generate and update the sine wave verilog modules.')
+    parser.add_argument('--table_format', choices=TABLE_FORMATS, default='inline', help='Initialise half_sine_table.v and phase_index_table.v inline, or with $readmemh (hex), $readmemb (bin) or $readmemh plus a Vivado .coe file (coe).')
+    parser.add_argument('--table_layout', choices=TABLE_LAYOUTS, default='half', help='Store the half sine table, or only a quarter wave that is mirrored in hardware (half the ROM). Only applies to half_sine_table.v, phase_index_table.v is always stored whole.')
+    parser.add_argument('--dry_run', action='store_true', help='Print a diff of the verilog module changes instead of writing them.')
+    parser.add_argument('--output_dir', type=str, default=None, help='Write the generated modules to this directory instead of updating the sine wave modules in place.')
+    parser.add_argument('--no_cache', action='store_true', help='Do not read or store optimal sample counts in the result cache.')
+    parser.add_argument('--no_fit', action='store_true', help='Search the full sample count range instead of a window around the curve stored by --find_sample.')
+    parser.add_argument('--clear_cache', action='store_true', help='Delete the optimal sample count result cache before running.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes for sample count sweeps (default: number of CPUs).')
+    parser.add_argument('--search', choices=['gp', 'exhaustive'], default='gp', help='Sample count search: Gaussian-process minimisation or an exhaustive search. The exhaustive search is exact up to {} bits, '
+                        'wider tables are searched exhaustively around the fit stored by --find_sample, and with gp without a fit, with --no_fit '
+                        'and in the full range sweeps of --find_sample.'.format(exhaustive_max_bits()))
+    parser.add_argument('--objective', choices=SAMPLE_COUNT_OBJECTIVES, default='loss', help='What the sample count search optimises: the table loss, or the SINAD, SFDR or ENOB of the synthesized tone.')
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
     bitResolution = args.bit_count
     override_sampleCount = args.override_sample
+    if args.frequency_plan:
+        with open(args.frequency_plan, 'r') as file:
+            plan = json.load(file)
+        bitResolution = plan["bit_count"]
+        override_sampleCount = plan["sampleCount"]
+        print("Using frequency plan {}: TABLE_SIZE = {} for {} target frequencies".format(args.frequency_plan, plan["TABLE_SIZE"], len(plan["frequencies"])))
     find_sampleCounts = args.find_sample
+    cache = None if args.no_cache else SAMPLE_COUNT_CACHE
+    fit = None if args.no_fit else load_fit(args.objective)
 
-    # determine the optimal sample count or use the override value
-    if override_sampleCount:
-        print("Overriding sample count with value: {}".format(override_sampleCount))
-        sampleCount = override_sampleCount
-    else:
-        optimisation_results = optimise_sampleCount(bitResolution)
-        sampleCount = optimisation_results["optimal_sampleCount"]
-    deltaPhase = 360 / sampleCount
-
-    if not args.no_generate:
-        sine_table = generateSineTable(bitResolution=bitResolution, sampleCount=sampleCount)
-        print("\nSine wave table generated with bit resolution = {}, delta phase = {}, and {} samples".format(bitResolution, deltaPhase, len(sine_table)))
-
-        construct_sine_table_module(sine_table, bitResolution)
-        print("half_sine_table.v generated with SINE_SIZE = {} and TABLE_SIZE = {}".format(bitResolution, len(sine_table)))
-
-        update_verilog_macros(sine_table, bitResolution)
-        print("sine_wave.v updated with SINE_SIZE = {} and TABLE_SIZE = {}\n".format(bitResolution, len(sine_table)))
-
-        update_verilog_macros(sine_table, bitResolution, 'signal_gen_top.v')
-        print("signal_gen_top.v updated with SINE_SIZE = {} and TABLE_SIZE = {}\n".format(bitResolution, len(sine_table)))
-    if args.plot_multiple:
-        max_bits = args.plot_multiple[0]
-        sample_count = args.plot_multiple[1] if len(args.plot_multiple) > 1 else None
-        wavesToPlot = args.plot_multiple[2:] if len(args.plot_multiple) > 2 else None
-        plot_multiple_sine_tables(max_bits, sample_count, wavesToPlot)
-
-    if args.plot_sine:
-        plotSineWave(sine_table)
-    if find_sampleCounts:
-        bitsToCycle, idealSamples, params, x_smooth, y_smooth = find_ideal_sampleCount_data(int(find_sampleCounts))
-        if args.plot_sample:
-            plot_ideal_sampleCount(bitsToCycle, idealSamples, params, x_smooth, y_smooth)
+    profile = profile_from_arguments(args, 'generate_modules_sine')
+    with profile:
+        profile.record("bit_count", bitResolution)
+        profile.record("search", args.search)
+        profile.record("objective", args.objective)
+
+        if args.clear_cache:
+            SAMPLE_COUNT_CACHE.clear()
+            print("Cleared the sample count cache")
+
+        # determine the optimal sample count or use the override value
+        if override_sampleCount:
+            print("Overriding sample count with value: {}".format(override_sampleCount))
+            sampleCount = override_sampleCount
+        else:
+            optimisation_results = cached_optimise_sampleCount(bitResolution, search=args.search, objective=args.objective, fit=fit, cache=cache)
+            sampleCount = optimisation_results["optimal_sampleCount"]
+            if optimisation_results["cached"]:
+                print("Using cached optimal sample count: {}".format(sampleCount))
+            if "evaluated_fraction" in optimisation_results:
+                print("Optimal sample count {} found in [{}, {}]{}, evaluating {:.2f}% of the sample count range".format(
+                    sampleCount, *optimisation_results["window"], " around the fitted curve" if optimisation_results.get("fit_window") else "",
+                    100 * optimisation_results["evaluated_fraction"]))
+                profile.record("evaluated_fraction", optimisation_results["evaluated_fraction"])
+        deltaPhase = 360 / sampleCount
+        profile.record("sampleCount", int(sampleCount))
+
+        if not args.no_generate:
+            output_dir = args.output_dir or MODULE_ROOT_PATH
+            if args.output_dir and not args.dry_run:
+                os.makedirs(args.output_dir, exist_ok=True)
+            with profile.stage('generateSineTable', bits=bitResolution, sampleCount=int(sampleCount)) as stage:
+                sine_table = generateSineTable(bitResolution=bitResolution, sampleCount=sampleCount)
+                stage.update(table_size=len(sine_table), table_bytes=sine_table.nbytes)
+            print("\nSine wave table generated with bit resolution = {}, delta phase = {}, and {} samples".format(bitResolution, deltaPhase, len(sine_table)))
+            profile.record("table_size", len(sine_table))
+            profile.record("table_bytes", sine_table.nbytes)
+
+            if args.table_layout == 'quarter':
+                with profile.stage('verify_quarter_table'):
+                    verified_samples = verify_quarter_table(bitResolution, sampleCount)
+                print("Quarter-wave table verified against the half table ({} samples)".format(verified_samples))
+
+            with profile.stage('construct_sine_table_module', table_format=args.table_format, table_layout=args.table_layout) as stage:
+                changed = construct_sine_table_module(sine_table, bitResolution, table_format=args.table_format, table_layout=args.table_layout, dry_run=args.dry_run, output_dir=args.output_dir)
+                stage["changed_files"] = len(changed)
+            status = "generated" if changed else "unchanged"
+            print("half_sine_table.v {} with SINE_SIZE = {}, TABLE_SIZE = {} and a {} table layout".format(status, bitResolution, len(sine_table), args.table_layout))
+
+            # Phase to start index and direction ROM read by sine_wave.v, for the PHASE_SIZE set in sine_wave.v
+            PHASE_SIZE = read_parameters(os.path.join(MODULE_ROOT_PATH, 'sine_wave.v'))['PHASE_SIZE']
+            TABLE_REG_SIZE = math.ceil(math.log2(len(sine_table) + 1))
+            with profile.stage('construct_phase_index_module', phase_size=PHASE_SIZE, table_format=args.table_format) as stage:
+                changed = construct_phase_index_module(len(sine_table), TABLE_REG_SIZE, PHASE_SIZE, table_format=args.table_format, dry_run=args.dry_run, output_dir=args.output_dir)
+                stage["changed_files"] = len(changed)
+            status = "generated" if changed else "unchanged"
+            print("phase_index_table.v {} with TABLE_SIZE = {} and PHASE_SIZE = {}, checked against the sine_wave.v model for all {} phase inputs".format(
+                status, len(sine_table), PHASE_SIZE, 2 ** (PHASE_SIZE + 1)))
+
+            # Update both modules in one pass, files whose parameters already match are left untouched
+            with profile.stage('update_verilog_macros') as stage:
+                changed = update_verilog_macros(sine_table, bitResolution, ['sine_wave.v', 'signal_gen_top.v'], dry_run=args.dry_run, output_dir=args.output_dir)
+                stage["changed_files"] = len(changed)
+            for filename in ['sine_wave.v', 'signal_gen_top.v']:
+                status = "updated" if os.path.join(output_dir, filename) in changed else "unchanged"
+                print("{} {} with SINE_SIZE = {} and TABLE_SIZE = {}".format(filename, status, bitResolution, len(sine_table)))
+            print()
+        if args.plot_multiple:
+            max_bits = args.plot_multiple[0]
+            sample_count = args.plot_multiple[1] if len(args.plot_multiple) > 1 else None
+            wavesToPlot = args.plot_multiple[2:] if len(args.plot_multiple) > 2 else None
+            with profile.stage('plot_multiple_sine_tables', max_bits=max_bits):
+                plot_multiple_sine_tables(max_bits, sample_count, wavesToPlot, args.search, args.workers, cache, args.objective, fit)
+
+        if args.plot_sine:
+            if args.no_generate:
+                sine_table = generateSineTable(bitResolution=bitResolution, sampleCount=sampleCount)
+            with profile.stage('plotSineWave'):
+                plotSineWave(sine_table)
+        if find_sampleCounts:
+            with profile.stage('find_ideal_sampleCount_data', max_bits=int(find_sampleCounts)):
+                bitsToCycle, idealSamples, params, x_smooth, y_smooth = find_ideal_sampleCount_data(int(find_sampleCounts), args.search, args.workers, cache, args.objective)
+            if args.plot_sample:
+                with profile.stage('plot_ideal_sampleCount'):
+                    plot_ideal_sampleCount(bitsToCycle, idealSamples, params, x_smooth, y_smooth)
+
+    finish_profile(profile, args)
 
 if __name__ == '__main__':
     main()
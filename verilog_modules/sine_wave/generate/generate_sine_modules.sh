@@ -39,6 +39,15 @@ while [[ "$#" -gt 0 ]]; do
                 exit 1
             fi
             ;;
+        --frequency_plan)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --frequency_plan $2"
+                shift 2
+            else
+                echo "Error: --frequency_plan requires a value"
+                exit 1
+            fi
+            ;;
         --find_sample)
             if [[ -n "$2" ]]; then
                 FIND_IDEAL_SAMPLES=$2
@@ -49,6 +58,93 @@ while [[ "$#" -gt 0 ]]; do
                 exit 1
             fi
             ;;
+        --table_format)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --table_format $2"
+                shift 2
+            else
+                echo "Error: --table_format requires a value"
+                exit 1
+            fi
+            ;;
+        --table_layout)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --table_layout $2"
+                shift 2
+            else
+                echo "Error: --table_layout requires a value"
+                exit 1
+            fi
+            ;;
+        --output_dir)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --output_dir $2"
+                shift 2
+            else
+                echo "Error: --output_dir requires a value"
+                exit 1
+            fi
+            ;;
+        --dry_run)
+            flag_string="${flag_string} --dry_run"
+            shift
+            ;;
+        --no_cache)
+            flag_string="${flag_string} --no_cache"
+            shift
+            ;;
+        --clear_cache)
+            flag_string="${flag_string} --clear_cache"
+            shift
+            ;;
+        --no_fit)
+            flag_string="${flag_string} --no_fit"
+            shift
+            ;;
+        --workers)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --workers $2"
+                shift 2
+            else
+                echo "Error: --workers requires a value"
+                exit 1
+            fi
+            ;;
+        --search)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --search $2"
+                shift 2
+            else
+                echo "Error: --search requires a value"
+                exit 1
+            fi
+            ;;
+        --objective)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} --objective $2"
+                shift 2
+            else
+                echo "Error: --objective requires a value"
+                exit 1
+            fi
+            ;;
+        --profile|--profile_format)
+            if [[ -n "$2" ]]; then
+                flag_string="${flag_string} $1 $2"
+                shift 2
+            else
+                echo "Error: $1 requires a value"
+                exit 1
+            fi
+            ;;
+        --profile_stage)
+            shift
+            flag_string="${flag_string} --profile_stage"
+            while [[ "$#" -gt 0 && "$1" != --* ]]; do
+                flag_string="${flag_string} $1"
+                shift
+            done
+            ;;
         --plot_sample)
             PLOT_SAMPLES=true
             flag_string="${flag_string} --plot_sample"
@@ -78,7 +174,23 @@ while [[ "$#" -gt 0 ]]; do
             echo "Options:"
             echo "  --bit_count         Set the bit count of the sine wave (default: 8)"
             echo "  --override_sample   Override the default sample count"
+            echo "  --frequency_plan    Take the bit count and sample count from a frequency_plan.py JSON plan"
             echo "  --find_sample       Find the ideal sample count up to the given bit resolution"
+            echo "  --table_format      Table and phase ROM initialisation: inline (default), hex, bin or coe"
+            echo "  --table_layout      Table layout: half (default) or quarter (mirrored quarter wave, half the ROM)"
+            echo "                      (the phase ROM is always stored whole)"
+            echo "  --dry_run           Print a diff of the verilog module changes instead of writing them"
+            echo "  --output_dir        Write the generated modules to this directory instead of updating them in place"
+            echo "  --no_cache          Do not use the optimal sample count result cache"
+            echo "  --clear_cache       Delete the optimal sample count result cache"
+            echo "  --no_fit            Search the full sample count range, not around the fitted curve"
+            echo "  --workers           Number of worker processes for sample count sweeps"
+            echo "  --search            Sample count search: gp (default) or exhaustive"
+            echo "                      (exact up to 13 bits, around the stored fit or gp above)"
+            echo "  --objective         Sample count objective: loss (default), sinad, sfdr or enob"
+            echo "  --profile           Time the generation stages and write the profile to the given file"
+            echo "  --profile_format    Profile file format: json (default) or chrome (chrome://tracing, Perfetto)"
+            echo "  --profile_stage     Stages to run under cProfile, e.g. --profile_stage optimise_sampleCount"
             echo "  --plot_sample       Plot the ideal sample count"
             echo "  --plot_sine         Plot the sine wave"
             echo "  --no_generate       Skip generation of sine wave modules"
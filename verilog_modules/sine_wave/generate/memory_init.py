@@ -0,0 +1,53 @@
+import os
+import numpy as np
+
+# ASCII codes of the hexadecimal digits, indexed by digit value
+DIGIT_CODES = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+def format_memory_lines(values, bitResolution: int, radix: int = 16, terminators=b'\n') -> bytes:
+    """
+    Format integer values as fixed-width digit strings, one per line, in a single vectorized step.
+
+    :param values: 1-D array of non-negative integers.
+    :param bitResolution: Bit width of the values, sets the number of digits per line.
+    :param radix: 16 for hexadecimal or 2 for binary digits.
+    :param terminators: Bytes appended after every value.
+    :return: The formatted lines as one bytes buffer.
+    """
+    if radix not in (2, 16):
+        raise ValueError("radix must be 2 or 16, got {}".format(radix))
+
+    bits_per_digit = 4 if radix == 16 else 1
+    digits = max(1, -(-bitResolution // bits_per_digit))
+    values = np.asarray(values).astype(np.uint64)
+
+    # Split every value into its digits, most significant first
+    shifts = (np.arange(digits - 1, -1, -1, dtype=np.uint64) * np.uint64(bits_per_digit))
+    codes = (values[:, None] >> shifts[None, :]) & np.uint64(radix - 1)
+
+    lines = np.empty((len(values), digits + len(terminators)), dtype=np.uint8)
+    lines[:, :digits] = DIGIT_CODES[codes]
+    lines[:, digits:] = np.frombuffer(terminators, dtype=np.uint8)
+    return lines.tobytes()
+
+def format_mem_file(values, bitResolution: int, radix: int = 16) -> bytes:
+    """
+    Content of a $readmemh (radix 16) or $readmemb (radix 2) memory file with one value per line.
+    """
+    return format_memory_lines(values, bitResolution, radix)
+
+def format_coe_file(values, bitResolution: int, radix: int = 16) -> bytes:
+    """
+    Content of a Vivado coefficient (.coe) file to initialise a block memory with the given values.
+    """
+    header = 'memory_initialization_radix={};\nmemory_initialization_vector=\n'.format(radix).encode()
+    body = bytearray(format_memory_lines(values, bitResolution, radix, terminators=b',\n'))
+    if body:
+        body[-2:-1] = b';'  # The last value ends the vector
+    return header + bytes(body)
+
+def memory_file_name(filename: str, extension: str) -> str:
+    """
+    Name of the memory file that goes with a generated Verilog module, e.g. half_sine_table.v -> half_sine_table.mem.
+    """
+    return os.path.splitext(filename)[0] + extension
@@ -0,0 +1,187 @@
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+# Bump when the cached values or the key layout change, older cache files are then discarded
+CACHE_SCHEMA_VERSION = 1
+
+# Default cache file, stored next to the generator
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sample_count_cache.json')
+
+# Default file of the fitted sampleCount curves, stored next to the generator
+DEFAULT_FIT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sample_count_fit.json')
+
+def make_cache_key(**params) -> str:
+    """
+    Build a cache key from the parameters that determine an optimisation result.
+
+    :param params: Keyword arguments of JSON serialisable values (bit count, bounds, seed, loss weights...).
+    :return: A canonical JSON string, independent of the keyword order.
+    """
+    return json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+def write_json_atomic(path, content: str):
+    """
+    Replace a file with the given text through a temporary file and a rename, so a reader never sees a
+    partially written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def _load_fits(path) -> dict:
+    """
+    Read the fits from the fit file, an unreadable or outdated file counts as empty.
+    """
+    if path is None or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("schema") != CACHE_SCHEMA_VERSION:
+        return {}
+    return data.get("fits", {})
+
+def load_sampleCount_fit(key: str, path=DEFAULT_FIT_PATH):
+    """
+    Look up the fitted sampleCount curve stored under a key.
+
+    :param key: Key from make_cache_key, e.g. over the objective and loss weights the fit was made with.
+    :param path: Path of the JSON fit file.
+    :return: The stored fit dictionary, or None if there is none.
+    """
+    fit = _load_fits(path).get(key)
+    return dict(fit) if fit is not None else None
+
+def store_sampleCount_fit(key: str, fit: dict, path=DEFAULT_FIT_PATH):
+    """
+    Store a fitted sampleCount curve under a key, replacing the previous fit for that key.
+
+    :param key: Key from make_cache_key.
+    :param fit: JSON serialisable dictionary.
+    :param path: Path of the JSON fit file.
+    """
+    # Merge with the file as it is now, another run may have stored other fits since it was read
+    fits = _load_fits(path)
+    fits[key] = dict(fit, stored_at=time.time())
+    write_json_atomic(path, json.dumps({"schema": CACHE_SCHEMA_VERSION, "fits": fits}, indent=1))
+
+class SampleCountCache:
+    """
+    Memoization of optimal sample counts, with an in-process LRU in front of a JSON file on disk.
+
+    Entries on disk are evicted least recently written first once the file holds more than max_entries
+    entries or grows past max_bytes, their last_used time is set by put and not refreshed by get, so a
+    lookup never rewrites the file. Writes go through a temporary file and a rename, so a reader never
+    sees a partially written cache.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=1024, max_bytes=1024 * 1024, memory_entries=128):
+        """
+        :param path: Path of the JSON cache file, or None for an in-memory only cache.
+        :param max_entries: Maximum number of entries kept on disk.
+        :param max_bytes: Maximum size of the cache file in bytes.
+        :param memory_entries: Maximum number of entries kept in the in-process LRU.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _load_entries(self) -> dict:
+        """
+        Read the entries from the cache file, an unreadable or outdated file counts as empty.
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("schema") != CACHE_SCHEMA_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def _write_entries(self, entries: dict):
+        """
+        Evict entries past the size limits and atomically replace the cache file.
+        """
+        # Least recently written entries first
+        ordered = sorted(entries.items(), key=lambda item: item[1]["last_used"])
+        ordered = ordered[-self.max_entries:]
+        while True:
+            content = json.dumps({"schema": CACHE_SCHEMA_VERSION, "entries": dict(ordered)}, indent=1)
+            if len(content) <= self.max_bytes or not ordered:
+                break
+            ordered = ordered[max(1, len(ordered) // 10):]
+
+        write_json_atomic(self.path, content)
+
+    def _remember(self, key: str, value: dict):
+        """
+        Insert a value into the in-process LRU.
+        """
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        Look up a cached value.
+
+        :param key: Key from make_cache_key.
+        :return: The cached dictionary, or None on a miss.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return dict(self.memory[key])
+
+        entry = self._load_entries().get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._remember(key, entry["value"])
+        self.hits += 1
+        return dict(entry["value"])
+
+    def put(self, key: str, value: dict):
+        """
+        Store a value in memory and on disk.
+
+        :param key: Key from make_cache_key.
+        :param value: JSON serialisable dictionary.
+        """
+        self._remember(key, value)
+        if self.path is None:
+            return
+
+        # Merge with the file as it is now, another run may have added entries since it was read
+        entries = self._load_entries()
+        entries[key] = {"value": value, "last_used": time.time()}
+        self._write_entries(entries)
+
+    def clear(self):
+        """
+        Remove every entry from memory and delete the cache file.
+        """
+        self.memory.clear()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
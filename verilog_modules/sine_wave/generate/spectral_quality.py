@@ -0,0 +1,196 @@
+import argparse
+import csv
+import numpy as np
+
+# Metrics the sample count search can maximise instead of the table loss
+SPECTRAL_METRICS = ('sinad', 'sfdr', 'enob')
+
+# Noise floor relative to the fundamental, caps SINAD and SFDR of distortion-free periods at 300 dB
+MIN_RELATIVE_NOISE = 1e-30
+
+def walk_indices(table_length: int, phaseStep: int = 1, start_index=None) -> np.ndarray:
+    """
+    Table indices visited by sine_wave.v over one steady-state period.
+
+    The hardware walks the half sine table up and down in steps of phaseStep. An index that does not land
+    exactly on the end of the table is held for one extra cycle when the direction reverses, so the period
+    is 2*(n-1) cycles for n visited indices, plus one for each end that is not hit exactly.
+
+    :param table_length: Number of entries in the half sine table (TABLE_SIZE).
+    :param phaseStep: Index increment per clock cycle.
+    :param start_index: Index the walk starts from (default: TABLE_SIZE // 2, where a phase of 0 starts).
+                        Only its residue modulo phaseStep changes the indices that are visited.
+    :return: An int64 array with the index of every cycle of one period, starting from the lowest index.
+    """
+    last = table_length - 1
+    if table_length < 2 or not 1 <= phaseStep <= last:
+        raise ValueError("phaseStep must be between 1 and TABLE_SIZE - 1 = {}, got {}".format(last, phaseStep))
+    if start_index is None:
+        start_index = table_length // 2
+
+    lowest = start_index % phaseStep
+    up = np.arange(lowest, last + 1, phaseStep, dtype=np.int64)
+    highest = up[-1]
+    if len(up) == 1:
+        return up  # a single reachable index, the output is constant
+    return np.concatenate([
+        up,
+        up[-1:] if highest < last else up[:0],  # held at the top when the end is not hit exactly
+        up[-2:0:-1],
+        up[:1] if lowest > 0 else up[:0],  # held at the bottom when index 0 is not hit exactly
+    ])
+
+def walk_period_length(table_length, phaseStep=1, start_index=None):
+    """
+    Length in clock cycles of the period produced by walk_indices, without building it.
+
+    The arguments may also be arrays, the lengths are then computed elementwise with broadcasting.
+    Every phaseStep must be between 1 and its table_length - 1.
+    """
+    table_length = np.asarray(table_length, dtype=np.int64)
+    phaseStep = np.asarray(phaseStep, dtype=np.int64)
+    last = table_length - 1
+    if start_index is None:
+        start_index = table_length // 2
+    lowest = np.asarray(start_index, dtype=np.int64) % phaseStep
+    count = (last - lowest) // phaseStep + 1
+    highest = lowest + (count - 1) * phaseStep
+    period = np.where(count == 1, 1, 2 * (count - 1) + (highest < last) + (lowest > 0))
+    return int(period) if period.ndim == 0 else period
+
+def spectral_metrics(periods) -> dict:
+    """
+    SFDR, SINAD and ENOB of a batch of single-period waveforms, with one real FFT over the whole batch.
+
+    Every row holds exactly one period of the tone, so the fundamental is bin 1 and every other non-DC bin
+    is noise or distortion.
+
+    :param periods: 2-D array of shape (waveforms, period length), the period length must be at least 4.
+    :return: A dictionary of float64 arrays: "sfdr" (dBc), "sinad" (dB) and "enob" (bits).
+    """
+    periods = np.asarray(periods, dtype=np.float64)
+    length = periods.shape[1]
+    if length < 4:
+        raise ValueError("A period needs at least 4 samples to have harmonics, got {}".format(length))
+
+    spectrum = np.fft.rfft(periods - periods.mean(axis=1, keepdims=True), axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    # Single-sided power, the Nyquist bin of an even-length period has no mirror image
+    if length % 2 == 0:
+        power[:, -1] /= 2
+
+    signal = power[:, 1]
+    floor = signal * MIN_RELATIVE_NOISE
+    noise_distortion = np.maximum(power[:, 2:].sum(axis=1), floor)
+    largest_spur = np.maximum(power[:, 2:].max(axis=1), floor)
+
+    with np.errstate(divide='ignore'):
+        sinad = 10 * np.log10(signal / noise_distortion)
+        sfdr = 10 * np.log10(signal / largest_spur)
+    return {
+        "sfdr": sfdr,
+        "sinad": sinad,
+        "enob": (sinad - 1.76) / 6.02,
+    }
+
+def table_spectral_metrics(tables, table_length: int, phaseStep: int = 1, start_index=None) -> dict:
+    """
+    Spectral metrics of the waveforms produced by walking a batch of equal-length sine tables.
+
+    :param tables: 2-D array of shape (tables, at least table_length), e.g. rows of generateSineTables output.
+    :param table_length: Number of valid entries in every row.
+    :param phaseStep: Index increment per clock cycle.
+    :param start_index: Start index of the walk (default: where a phase of 0 starts).
+    :return: The spectral_metrics dictionary, plus the "period" length in cycles.
+    """
+    indices = walk_indices(table_length, phaseStep, start_index)
+    metrics = spectral_metrics(np.asarray(tables)[:, indices])
+    metrics["period"] = np.full(len(metrics["sinad"]), len(indices), dtype=np.int64)
+    return metrics
+
+def evaluate_spectral_grid(generate_tables, bitResolutions, sampleCounts, phaseSteps=(1,)) -> dict:
+    """
+    Spectral metrics for every (bit resolution, sampleCount, phaseStep) combination of a grid.
+
+    All bit resolutions of a sampleCount share the same walk, so each (sampleCount, phaseStep) pair is
+    evaluated as one batched FFT over the tables of every bit resolution. Combinations whose walk is
+    shorter than 4 cycles, or whose phaseStep does not fit the table, are reported as NaN.
+
+    :param generate_tables: generateSineTables, called with the (bit resolution, sampleCount) pairs of a sampleCount.
+    :param bitResolutions: Bit resolutions of the grid.
+    :param sampleCounts: sampleCounts of the grid.
+    :param phaseSteps: phaseSteps of the grid.
+    :return: A dictionary of equal-length 1-D arrays: "bits", "sampleCount", "phaseStep", "table_size",
+             "period", "sfdr", "sinad" and "enob", one entry per grid point.
+    """
+    bitResolutions = [int(bits) for bits in bitResolutions]
+    columns = {name: [] for name in ("bits", "sampleCount", "phaseStep", "table_size", "period", "sfdr", "sinad", "enob")}
+
+    for sampleCount in (int(samples) for samples in sampleCounts):
+        tables, lengths = generate_tables([(bits, sampleCount) for bits in bitResolutions])
+        table_length = int(lengths[0]) if len(lengths) else 0
+        for phaseStep in (int(step) for step in phaseSteps):
+            rows = len(bitResolutions)
+            columns["bits"].append(bitResolutions)
+            columns["sampleCount"].append([sampleCount] * rows)
+            columns["phaseStep"].append([phaseStep] * rows)
+            columns["table_size"].append([table_length] * rows)
+
+            valid = 1 <= phaseStep < table_length and walk_period_length(table_length, phaseStep) >= 4
+            if not valid:
+                columns["period"].append([0] * rows)
+                for name in SPECTRAL_METRICS:
+                    columns[name].append(np.full(rows, np.nan))
+                continue
+
+            indices = walk_indices(table_length, phaseStep)
+            metrics = spectral_metrics(tables[:, indices])
+            columns["period"].append([len(indices)] * rows)
+            for name in SPECTRAL_METRICS:
+                columns[name].append(metrics[name])
+
+    return {name: np.concatenate(values) if values else np.zeros(0) for name, values in columns.items()}
+
+def print_spectral_report(grid: dict):
+    """
+    Print one line per grid point of evaluate_spectral_grid.
+    """
+    print("{:>4} {:>11} {:>9} {:>10} {:>10} {:>10} {:>10} {:>7}".format(
+        "bits", "sampleCount", "phaseStep", "TABLE_SIZE", "period", "SFDR dBc", "SINAD dB", "ENOB"))
+    for row in range(len(grid["bits"])):
+        print("{:>4} {:>11} {:>9} {:>10} {:>10} {:>10.2f} {:>10.2f} {:>7.2f}".format(
+            grid["bits"][row], grid["sampleCount"][row], grid["phaseStep"][row], grid["table_size"][row],
+            grid["period"][row], grid["sfdr"][row], grid["sinad"][row], grid["enob"][row]))
+
+def write_spectral_report(grid: dict, filename: str):
+    """
+    Write the grid of evaluate_spectral_grid to a CSV file.
+    """
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(list(grid))
+        writer.writerows(zip(*(grid[name].tolist() for name in grid)))
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the spectral quality (SFDR, SINAD, ENOB) of the generated sine tables.')
+    parser.add_argument('--bits', type=int, nargs=2, default=[2, 16], help='Range of bit resolutions to evaluate, inclusive (default: 2 16).')
+    parser.add_argument('--sample_counts', type=int, nargs='+', default=None, help='sampleCounts to evaluate (default: 4 * 2^bits for every bit resolution in the range).')
+    parser.add_argument('--phase_steps', type=int, nargs='+', default=[1], help='phaseSteps to evaluate (default: 1).')
+    parser.add_argument('--output', type=str, default=None, help='Write the report to a CSV file instead of printing it.')
+    args = parser.parse_args()
+
+    # Table generation lives with the generator, it is only needed when running the report
+    from generate_modules_sine import generateSineTables
+
+    bitResolutions = range(args.bits[0], args.bits[1] + 1)
+    sampleCounts = args.sample_counts or [4 * 2**bits for bits in bitResolutions]
+    grid = evaluate_spectral_grid(generateSineTables, bitResolutions, sampleCounts, args.phase_steps)
+
+    if args.output:
+        write_spectral_report(grid, args.output)
+        print("Spectral report of {} configurations written to {}".format(len(grid["bits"]), args.output))
+    else:
+        print_spectral_report(grid)
+
+if __name__ == '__main__':
+    main()
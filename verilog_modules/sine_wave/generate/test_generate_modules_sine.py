@@ -0,0 +1,80 @@
+import math
+import numpy as np
+import pytest
+
+import generate_modules_sine as gen
+
+def scalar_sine_table(bitResolution: int, sampleCount: int) -> list:
+    """
+    The sine table as generateSineTable used to compute it, one math.sin call per entry.
+    """
+    max_val = (2 ** bitResolution) - 1
+    return [round((math.sin(2 * math.pi * i / sampleCount) + 1) * (max_val / 2))
+            for i in range(int(-sampleCount / 4), int(sampleCount / 4))]
+
+def wrap_signed(value: int, width: int) -> int:
+    """
+    Two's complement truncation to a signed register of the given width.
+    """
+    value &= (1 << width) - 1
+    return value - (1 << width) if value >> (width - 1) else value
+
+def verilog_div(numerator: int, denominator: int) -> int:
+    """
+    Signed division truncating toward zero, as Verilog's / does.
+    """
+    quotient = abs(numerator) // abs(denominator)
+    return quotient if (numerator < 0) == (denominator < 0) else -quotient
+
+def scalar_phase_entry(phase: int, TABLE_SIZE: int, TABLE_REG_SIZE: int, PHASE_SIZE: int) -> tuple:
+    """
+    phaseVal, start index and direction of one phase input, with the multiply and divide sine_wave.v used to have.
+    """
+    width = PHASE_SIZE + 1
+    minVal = wrap_signed(-3 * (TABLE_SIZE // 2) + 1, width)
+    maxVal = wrap_signed((TABLE_SIZE // 2) - 1, width)
+    if 0 <= phase <= 90:
+        phaseVal = verilog_div(phase * maxVal, 90)
+    elif 90 < phase <= 180:
+        phaseVal = minVal + verilog_div((phase - 90) * maxVal, 90)
+    elif -180 <= phase < 0:
+        phaseVal = -TABLE_SIZE + verilog_div((phase + 180) * TABLE_SIZE, 180)
+    else:
+        phaseVal = maxVal if phase > 180 else minVal
+    phaseVal = wrap_signed(phaseVal, width)
+    start_index = abs((TABLE_SIZE // 2) + phaseVal) & ((1 << (TABLE_REG_SIZE + 1)) - 1)
+
+    if phase in (90, 180, -180):
+        direction = gen.DIRECTION_REVERSE
+    elif phase == -90:
+        direction = gen.DIRECTION_FORWARD
+    elif phase >= 0:
+        direction = gen.DIRECTION_FORWARD_UNTIL_END
+    else:
+        direction = gen.DIRECTION_REVERSE_UNLESS_START
+    return phaseVal, start_index, direction
+
+@pytest.mark.parametrize("bitResolution, sampleCount", [(4, 20), (8, 101), (8, 256), (12, 536), (12, 1023), (16, 4000)])
+def test_sine_table_matches_scalar_formula(bitResolution, sampleCount):
+    table = gen.generateSineTable(bitResolution, sampleCount)
+    assert table.tolist() == scalar_sine_table(bitResolution, sampleCount)
+    assert table.dtype == gen.sine_table_dtype(bitResolution)
+
+@pytest.mark.parametrize("bitResolution, sampleCount", [(4, 20), (8, 256), (12, 536), (12, 540), (16, 4000)])
+def test_quarter_table_round_trip(bitResolution, sampleCount):
+    table = gen.generateSineTable(bitResolution, sampleCount)
+    quarter = gen.quarterFromHalfSineTable(table, bitResolution)
+    assert len(quarter) == len(table) // 2 + 1
+    rebuilt = gen.reconstructHalfSineTable(quarter, bitResolution)
+    assert rebuilt.dtype == table.dtype
+    np.testing.assert_array_equal(rebuilt, table)
+
+@pytest.mark.parametrize("TABLE_SIZE, PHASE_SIZE", [(10, 8), (64, 8), (268, 8), (268, 9), (511, 10), (1000, 12)])
+def test_phase_index_table_matches_divide_formula(TABLE_SIZE, PHASE_SIZE):
+    TABLE_REG_SIZE = math.ceil(math.log2(TABLE_SIZE + 1))
+    phase_table = gen.generatePhaseIndexTable(TABLE_SIZE, TABLE_REG_SIZE, PHASE_SIZE)
+    assert len(phase_table["phase"]) == 1 << (PHASE_SIZE + 1)
+    for code, phase in enumerate(phase_table["phase"].tolist()):
+        assert phase == wrap_signed(code, PHASE_SIZE + 1)
+        entry = (int(phase_table["phaseVal"][code]), int(phase_table["start_index"][code]), int(phase_table["direction"][code]))
+        assert entry == scalar_phase_entry(phase, TABLE_SIZE, TABLE_REG_SIZE, PHASE_SIZE), phase
@@ -0,0 +1,556 @@
+`timescale 1ns / 1ps
+
+//////////////////////////////////////////////////////////////////////////////////
+// Module Name: phase_index_table
+// Description: This module maps a phase input of sine_wave to the signed phase
+//              index, the start index into the half sine table and the initial
+//              traversal direction, without any runtime arithmetic.
+//              The contents are generated for TABLE_SIZE = 268.
+//              Direction: 0 forward, 1 reverse, 2 forward unless the previous index
+//              is at the end of the table, 3 reverse unless it is at the start.
+//
+// Autogenerated from generate_modules_sine.py
+//////////////////////////////////////////////////////////////////////////////////
+/* verilator lint_off WIDTHEXPAND */
+/* verilator lint_off WIDTHTRUNC */
+
+module phase_index_table #(
+    parameter TABLE_SIZE = 268,
+    parameter TABLE_REG_SIZE = 9,
+    parameter PHASE_SIZE = 8
+) (
+    input  wire signed [PHASE_SIZE:0]     phase,        // Phase input of sine_wave
+    output wire signed [PHASE_SIZE:0]     phaseVal,     // Signed phase index
+    output wire        [TABLE_REG_SIZE:0] start_index,  // Index loaded into i
+    output wire        [1:0]              direction     // Initial traversal direction
+);
+
+    // The contents only hold for the table they were generated for
+    localparam GENERATED_TABLE_SIZE = 268;
+
+    if (TABLE_SIZE != GENERATED_TABLE_SIZE) begin : g_table_size_check
+        $error("phase_index_table was generated for TABLE_SIZE = %0d, regenerate it with generate_modules_sine.py", GENERATED_TABLE_SIZE);
+    end
+
+    // One {phaseVal, start_index, direction} entry per phase input bit pattern
+    reg [PHASE_SIZE+TABLE_REG_SIZE+3:0] phase_rom [0:(1 << (PHASE_SIZE+1))-1];
+
+    initial begin
+        phase_rom[0] = 21'h00021a; // 0º: phaseVal 0, start index 134, forward until end
+        phase_rom[1] = 21'h00121e; // 1º: phaseVal 1, start index 135, forward until end
+        phase_rom[2] = 21'h002222; // 2º: phaseVal 2, start index 136, forward until end
+        phase_rom[3] = 21'h00422a; // 3º: phaseVal 4, start index 138, forward until end
+        phase_rom[4] = 21'h00522e; // 4º: phaseVal 5, start index 139, forward until end
+        phase_rom[5] = 21'h007236; // 5º: phaseVal 7, start index 141, forward until end
+        phase_rom[6] = 21'h00823a; // 6º: phaseVal 8, start index 142, forward until end
+        phase_rom[7] = 21'h00a242; // 7º: phaseVal 10, start index 144, forward until end
+        phase_rom[8] = 21'h00b246; // 8º: phaseVal 11, start index 145, forward until end
+        phase_rom[9] = 21'h00d24e; // 9º: phaseVal 13, start index 147, forward until end
+        phase_rom[10] = 21'h00e252; // 10º: phaseVal 14, start index 148, forward until end
+        phase_rom[11] = 21'h01025a; // 11º: phaseVal 16, start index 150, forward until end
+        phase_rom[12] = 21'h01125e; // 12º: phaseVal 17, start index 151, forward until end
+        phase_rom[13] = 21'h013266; // 13º: phaseVal 19, start index 153, forward until end
+        phase_rom[14] = 21'h01426a; // 14º: phaseVal 20, start index 154, forward until end
+        phase_rom[15] = 21'h016272; // 15º: phaseVal 22, start index 156, forward until end
+        phase_rom[16] = 21'h017276; // 16º: phaseVal 23, start index 157, forward until end
+        phase_rom[17] = 21'h01927e; // 17º: phaseVal 25, start index 159, forward until end
+        phase_rom[18] = 21'h01a282; // 18º: phaseVal 26, start index 160, forward until end
+        phase_rom[19] = 21'h01c28a; // 19º: phaseVal 28, start index 162, forward until end
+        phase_rom[20] = 21'h01d28e; // 20º: phaseVal 29, start index 163, forward until end
+        phase_rom[21] = 21'h01f296; // 21º: phaseVal 31, start index 165, forward until end
+        phase_rom[22] = 21'h02029a; // 22º: phaseVal 32, start index 166, forward until end
+        phase_rom[23] = 21'h02129e; // 23º: phaseVal 33, start index 167, forward until end
+        phase_rom[24] = 21'h0232a6; // 24º: phaseVal 35, start index 169, forward until end
+        phase_rom[25] = 21'h0242aa; // 25º: phaseVal 36, start index 170, forward until end
+        phase_rom[26] = 21'h0262b2; // 26º: phaseVal 38, start index 172, forward until end
+        phase_rom[27] = 21'h0272b6; // 27º: phaseVal 39, start index 173, forward until end
+        phase_rom[28] = 21'h0292be; // 28º: phaseVal 41, start index 175, forward until end
+        phase_rom[29] = 21'h02a2c2; // 29º: phaseVal 42, start index 176, forward until end
+        phase_rom[30] = 21'h02c2ca; // 30º: phaseVal 44, start index 178, forward until end
+        phase_rom[31] = 21'h02d2ce; // 31º: phaseVal 45, start index 179, forward until end
+        phase_rom[32] = 21'h02f2d6; // 32º: phaseVal 47, start index 181, forward until end
+        phase_rom[33] = 21'h0302da; // 33º: phaseVal 48, start index 182, forward until end
+        phase_rom[34] = 21'h0322e2; // 34º: phaseVal 50, start index 184, forward until end
+        phase_rom[35] = 21'h0332e6; // 35º: phaseVal 51, start index 185, forward until end
+        phase_rom[36] = 21'h0352ee; // 36º: phaseVal 53, start index 187, forward until end
+        phase_rom[37] = 21'h0362f2; // 37º: phaseVal 54, start index 188, forward until end
+        phase_rom[38] = 21'h0382fa; // 38º: phaseVal 56, start index 190, forward until end
+        phase_rom[39] = 21'h0392fe; // 39º: phaseVal 57, start index 191, forward until end
+        phase_rom[40] = 21'h03b306; // 40º: phaseVal 59, start index 193, forward until end
+        phase_rom[41] = 21'h03c30a; // 41º: phaseVal 60, start index 194, forward until end
+        phase_rom[42] = 21'h03e312; // 42º: phaseVal 62, start index 196, forward until end
+        phase_rom[43] = 21'h03f316; // 43º: phaseVal 63, start index 197, forward until end
+        phase_rom[44] = 21'h04131e; // 44º: phaseVal 65, start index 199, forward until end
+        phase_rom[45] = 21'h042322; // 45º: phaseVal 66, start index 200, forward until end
+        phase_rom[46] = 21'h043326; // 46º: phaseVal 67, start index 201, forward until end
+        phase_rom[47] = 21'h04532e; // 47º: phaseVal 69, start index 203, forward until end
+        phase_rom[48] = 21'h046332; // 48º: phaseVal 70, start index 204, forward until end
+        phase_rom[49] = 21'h04833a; // 49º: phaseVal 72, start index 206, forward until end
+        phase_rom[50] = 21'h04933e; // 50º: phaseVal 73, start index 207, forward until end
+        phase_rom[51] = 21'h04b346; // 51º: phaseVal 75, start index 209, forward until end
+        phase_rom[52] = 21'h04c34a; // 52º: phaseVal 76, start index 210, forward until end
+        phase_rom[53] = 21'h04e352; // 53º: phaseVal 78, start index 212, forward until end
+        phase_rom[54] = 21'h04f356; // 54º: phaseVal 79, start index 213, forward until end
+        phase_rom[55] = 21'h05135e; // 55º: phaseVal 81, start index 215, forward until end
+        phase_rom[56] = 21'h052362; // 56º: phaseVal 82, start index 216, forward until end
+        phase_rom[57] = 21'h05436a; // 57º: phaseVal 84, start index 218, forward until end
+        phase_rom[58] = 21'h05536e; // 58º: phaseVal 85, start index 219, forward until end
+        phase_rom[59] = 21'h057376; // 59º: phaseVal 87, start index 221, forward until end
+        phase_rom[60] = 21'h05837a; // 60º: phaseVal 88, start index 222, forward until end
+        phase_rom[61] = 21'h05a382; // 61º: phaseVal 90, start index 224, forward until end
+        phase_rom[62] = 21'h05b386; // 62º: phaseVal 91, start index 225, forward until end
+        phase_rom[63] = 21'h05d38e; // 63º: phaseVal 93, start index 227, forward until end
+        phase_rom[64] = 21'h05e392; // 64º: phaseVal 94, start index 228, forward until end
+        phase_rom[65] = 21'h06039a; // 65º: phaseVal 96, start index 230, forward until end
+        phase_rom[66] = 21'h06139e; // 66º: phaseVal 97, start index 231, forward until end
+        phase_rom[67] = 21'h0633a6; // 67º: phaseVal 99, start index 233, forward until end
+        phase_rom[68] = 21'h0643aa; // 68º: phaseVal 100, start index 234, forward until end
+        phase_rom[69] = 21'h0653ae; // 69º: phaseVal 101, start index 235, forward until end
+        phase_rom[70] = 21'h0673b6; // 70º: phaseVal 103, start index 237, forward until end
+        phase_rom[71] = 21'h0683ba; // 71º: phaseVal 104, start index 238, forward until end
+        phase_rom[72] = 21'h06a3c2; // 72º: phaseVal 106, start index 240, forward until end
+        phase_rom[73] = 21'h06b3c6; // 73º: phaseVal 107, start index 241, forward until end
+        phase_rom[74] = 21'h06d3ce; // 74º: phaseVal 109, start index 243, forward until end
+        phase_rom[75] = 21'h06e3d2; // 75º: phaseVal 110, start index 244, forward until end
+        phase_rom[76] = 21'h0703da; // 76º: phaseVal 112, start index 246, forward until end
+        phase_rom[77] = 21'h0713de; // 77º: phaseVal 113, start index 247, forward until end
+        phase_rom[78] = 21'h0733e6; // 78º: phaseVal 115, start index 249, forward until end
+        phase_rom[79] = 21'h0743ea; // 79º: phaseVal 116, start index 250, forward until end
+        phase_rom[80] = 21'h0763f2; // 80º: phaseVal 118, start index 252, forward until end
+        phase_rom[81] = 21'h0773f6; // 81º: phaseVal 119, start index 253, forward until end
+        phase_rom[82] = 21'h0793fe; // 82º: phaseVal 121, start index 255, forward until end
+        phase_rom[83] = 21'h07a402; // 83º: phaseVal 122, start index 256, forward until end
+        phase_rom[84] = 21'h07c40a; // 84º: phaseVal 124, start index 258, forward until end
+        phase_rom[85] = 21'h07d40e; // 85º: phaseVal 125, start index 259, forward until end
+        phase_rom[86] = 21'h07f416; // 86º: phaseVal 127, start index 261, forward until end
+        phase_rom[87] = 21'h08041a; // 87º: phaseVal 128, start index 262, forward until end
+        phase_rom[88] = 21'h082422; // 88º: phaseVal 130, start index 264, forward until end
+        phase_rom[89] = 21'h083426; // 89º: phaseVal 131, start index 265, forward until end
+        phase_rom[90] = 21'h08542d; // 90º: phaseVal 133, start index 267, reverse
+        phase_rom[91] = 21'h0703da; // 91º: phaseVal 112, start index 246, forward until end
+        phase_rom[92] = 21'h0713de; // 92º: phaseVal 113, start index 247, forward until end
+        phase_rom[93] = 21'h0733e6; // 93º: phaseVal 115, start index 249, forward until end
+        phase_rom[94] = 21'h0743ea; // 94º: phaseVal 116, start index 250, forward until end
+        phase_rom[95] = 21'h0763f2; // 95º: phaseVal 118, start index 252, forward until end
+        phase_rom[96] = 21'h0773f6; // 96º: phaseVal 119, start index 253, forward until end
+        phase_rom[97] = 21'h0793fe; // 97º: phaseVal 121, start index 255, forward until end
+        phase_rom[98] = 21'h07a402; // 98º: phaseVal 122, start index 256, forward until end
+        phase_rom[99] = 21'h07c40a; // 99º: phaseVal 124, start index 258, forward until end
+        phase_rom[100] = 21'h07d40e; // 100º: phaseVal 125, start index 259, forward until end
+        phase_rom[101] = 21'h07f416; // 101º: phaseVal 127, start index 261, forward until end
+        phase_rom[102] = 21'h08041a; // 102º: phaseVal 128, start index 262, forward until end
+        phase_rom[103] = 21'h082422; // 103º: phaseVal 130, start index 264, forward until end
+        phase_rom[104] = 21'h083426; // 104º: phaseVal 131, start index 265, forward until end
+        phase_rom[105] = 21'h08542e; // 105º: phaseVal 133, start index 267, forward until end
+        phase_rom[106] = 21'h086432; // 106º: phaseVal 134, start index 268, forward until end
+        phase_rom[107] = 21'h08843a; // 107º: phaseVal 136, start index 270, forward until end
+        phase_rom[108] = 21'h08943e; // 108º: phaseVal 137, start index 271, forward until end
+        phase_rom[109] = 21'h08b446; // 109º: phaseVal 139, start index 273, forward until end
+        phase_rom[110] = 21'h08c44a; // 110º: phaseVal 140, start index 274, forward until end
+        phase_rom[111] = 21'h08e452; // 111º: phaseVal 142, start index 276, forward until end
+        phase_rom[112] = 21'h08f456; // 112º: phaseVal 143, start index 277, forward until end
+        phase_rom[113] = 21'h09045a; // 113º: phaseVal 144, start index 278, forward until end
+        phase_rom[114] = 21'h092462; // 114º: phaseVal 146, start index 280, forward until end
+        phase_rom[115] = 21'h093466; // 115º: phaseVal 147, start index 281, forward until end
+        phase_rom[116] = 21'h09546e; // 116º: phaseVal 149, start index 283, forward until end
+        phase_rom[117] = 21'h096472; // 117º: phaseVal 150, start index 284, forward until end
+        phase_rom[118] = 21'h09847a; // 118º: phaseVal 152, start index 286, forward until end
+        phase_rom[119] = 21'h09947e; // 119º: phaseVal 153, start index 287, forward until end
+        phase_rom[120] = 21'h09b486; // 120º: phaseVal 155, start index 289, forward until end
+        phase_rom[121] = 21'h09c48a; // 121º: phaseVal 156, start index 290, forward until end
+        phase_rom[122] = 21'h09e492; // 122º: phaseVal 158, start index 292, forward until end
+        phase_rom[123] = 21'h09f496; // 123º: phaseVal 159, start index 293, forward until end
+        phase_rom[124] = 21'h0a149e; // 124º: phaseVal 161, start index 295, forward until end
+        phase_rom[125] = 21'h0a24a2; // 125º: phaseVal 162, start index 296, forward until end
+        phase_rom[126] = 21'h0a44aa; // 126º: phaseVal 164, start index 298, forward until end
+        phase_rom[127] = 21'h0a54ae; // 127º: phaseVal 165, start index 299, forward until end
+        phase_rom[128] = 21'h0a74b6; // 128º: phaseVal 167, start index 301, forward until end
+        phase_rom[129] = 21'h0a84ba; // 129º: phaseVal 168, start index 302, forward until end
+        phase_rom[130] = 21'h0aa4c2; // 130º: phaseVal 170, start index 304, forward until end
+        phase_rom[131] = 21'h0ab4c6; // 131º: phaseVal 171, start index 305, forward until end
+        phase_rom[132] = 21'h0ad4ce; // 132º: phaseVal 173, start index 307, forward until end
+        phase_rom[133] = 21'h0ae4d2; // 133º: phaseVal 174, start index 308, forward until end
+        phase_rom[134] = 21'h0b04da; // 134º: phaseVal 176, start index 310, forward until end
+        phase_rom[135] = 21'h0b14de; // 135º: phaseVal 177, start index 311, forward until end
+        phase_rom[136] = 21'h0b24e2; // 136º: phaseVal 178, start index 312, forward until end
+        phase_rom[137] = 21'h0b44ea; // 137º: phaseVal 180, start index 314, forward until end
+        phase_rom[138] = 21'h0b54ee; // 138º: phaseVal 181, start index 315, forward until end
+        phase_rom[139] = 21'h0b74f6; // 139º: phaseVal 183, start index 317, forward until end
+        phase_rom[140] = 21'h0b84fa; // 140º: phaseVal 184, start index 318, forward until end
+        phase_rom[141] = 21'h0ba502; // 141º: phaseVal 186, start index 320, forward until end
+        phase_rom[142] = 21'h0bb506; // 142º: phaseVal 187, start index 321, forward until end
+        phase_rom[143] = 21'h0bd50e; // 143º: phaseVal 189, start index 323, forward until end
+        phase_rom[144] = 21'h0be512; // 144º: phaseVal 190, start index 324, forward until end
+        phase_rom[145] = 21'h0c051a; // 145º: phaseVal 192, start index 326, forward until end
+        phase_rom[146] = 21'h0c151e; // 146º: phaseVal 193, start index 327, forward until end
+        phase_rom[147] = 21'h0c3526; // 147º: phaseVal 195, start index 329, forward until end
+        phase_rom[148] = 21'h0c452a; // 148º: phaseVal 196, start index 330, forward until end
+        phase_rom[149] = 21'h0c6532; // 149º: phaseVal 198, start index 332, forward until end
+        phase_rom[150] = 21'h0c7536; // 150º: phaseVal 199, start index 333, forward until end
+        phase_rom[151] = 21'h0c953e; // 151º: phaseVal 201, start index 335, forward until end
+        phase_rom[152] = 21'h0ca542; // 152º: phaseVal 202, start index 336, forward until end
+        phase_rom[153] = 21'h0cc54a; // 153º: phaseVal 204, start index 338, forward until end
+        phase_rom[154] = 21'h0cd54e; // 154º: phaseVal 205, start index 339, forward until end
+        phase_rom[155] = 21'h0cf556; // 155º: phaseVal 207, start index 341, forward until end
+        phase_rom[156] = 21'h0d055a; // 156º: phaseVal 208, start index 342, forward until end
+        phase_rom[157] = 21'h0d2562; // 157º: phaseVal 210, start index 344, forward until end
+        phase_rom[158] = 21'h0d3566; // 158º: phaseVal 211, start index 345, forward until end
+        phase_rom[159] = 21'h0d456a; // 159º: phaseVal 212, start index 346, forward until end
+        phase_rom[160] = 21'h0d6572; // 160º: phaseVal 214, start index 348, forward until end
+        phase_rom[161] = 21'h0d7576; // 161º: phaseVal 215, start index 349, forward until end
+        phase_rom[162] = 21'h0d957e; // 162º: phaseVal 217, start index 351, forward until end
+        phase_rom[163] = 21'h0da582; // 163º: phaseVal 218, start index 352, forward until end
+        phase_rom[164] = 21'h0dc58a; // 164º: phaseVal 220, start index 354, forward until end
+        phase_rom[165] = 21'h0dd58e; // 165º: phaseVal 221, start index 355, forward until end
+        phase_rom[166] = 21'h0df596; // 166º: phaseVal 223, start index 357, forward until end
+        phase_rom[167] = 21'h0e059a; // 167º: phaseVal 224, start index 358, forward until end
+        phase_rom[168] = 21'h0e25a2; // 168º: phaseVal 226, start index 360, forward until end
+        phase_rom[169] = 21'h0e35a6; // 169º: phaseVal 227, start index 361, forward until end
+        phase_rom[170] = 21'h0e55ae; // 170º: phaseVal 229, start index 363, forward until end
+        phase_rom[171] = 21'h0e65b2; // 171º: phaseVal 230, start index 364, forward until end
+        phase_rom[172] = 21'h0e85ba; // 172º: phaseVal 232, start index 366, forward until end
+        phase_rom[173] = 21'h0e95be; // 173º: phaseVal 233, start index 367, forward until end
+        phase_rom[174] = 21'h0eb5c6; // 174º: phaseVal 235, start index 369, forward until end
+        phase_rom[175] = 21'h0ec5ca; // 175º: phaseVal 236, start index 370, forward until end
+        phase_rom[176] = 21'h0ee5d2; // 176º: phaseVal 238, start index 372, forward until end
+        phase_rom[177] = 21'h0ef5d6; // 177º: phaseVal 239, start index 373, forward until end
+        phase_rom[178] = 21'h0f15de; // 178º: phaseVal 241, start index 375, forward until end
+        phase_rom[179] = 21'h0f25e2; // 179º: phaseVal 242, start index 376, forward until end
+        phase_rom[180] = 21'h0f45e9; // 180º: phaseVal 244, start index 378, reverse
+        phase_rom[181] = 21'h08542e; // 181º: phaseVal 133, start index 267, forward until end
+        phase_rom[182] = 21'h08542e; // 182º: phaseVal 133, start index 267, forward until end
+        phase_rom[183] = 21'h08542e; // 183º: phaseVal 133, start index 267, forward until end
+        phase_rom[184] = 21'h08542e; // 184º: phaseVal 133, start index 267, forward until end
+        phase_rom[185] = 21'h08542e; // 185º: phaseVal 133, start index 267, forward until end
+        phase_rom[186] = 21'h08542e; // 186º: phaseVal 133, start index 267, forward until end
+        phase_rom[187] = 21'h08542e; // 187º: phaseVal 133, start index 267, forward until end
+        phase_rom[188] = 21'h08542e; // 188º: phaseVal 133, start index 267, forward until end
+        phase_rom[189] = 21'h08542e; // 189º: phaseVal 133, start index 267, forward until end
+        phase_rom[190] = 21'h08542e; // 190º: phaseVal 133, start index 267, forward until end
+        phase_rom[191] = 21'h08542e; // 191º: phaseVal 133, start index 267, forward until end
+        phase_rom[192] = 21'h08542e; // 192º: phaseVal 133, start index 267, forward until end
+        phase_rom[193] = 21'h08542e; // 193º: phaseVal 133, start index 267, forward until end
+        phase_rom[194] = 21'h08542e; // 194º: phaseVal 133, start index 267, forward until end
+        phase_rom[195] = 21'h08542e; // 195º: phaseVal 133, start index 267, forward until end
+        phase_rom[196] = 21'h08542e; // 196º: phaseVal 133, start index 267, forward until end
+        phase_rom[197] = 21'h08542e; // 197º: phaseVal 133, start index 267, forward until end
+        phase_rom[198] = 21'h08542e; // 198º: phaseVal 133, start index 267, forward until end
+        phase_rom[199] = 21'h08542e; // 199º: phaseVal 133, start index 267, forward until end
+        phase_rom[200] = 21'h08542e; // 200º: phaseVal 133, start index 267, forward until end
+        phase_rom[201] = 21'h08542e; // 201º: phaseVal 133, start index 267, forward until end
+        phase_rom[202] = 21'h08542e; // 202º: phaseVal 133, start index 267, forward until end
+        phase_rom[203] = 21'h08542e; // 203º: phaseVal 133, start index 267, forward until end
+        phase_rom[204] = 21'h08542e; // 204º: phaseVal 133, start index 267, forward until end
+        phase_rom[205] = 21'h08542e; // 205º: phaseVal 133, start index 267, forward until end
+        phase_rom[206] = 21'h08542e; // 206º: phaseVal 133, start index 267, forward until end
+        phase_rom[207] = 21'h08542e; // 207º: phaseVal 133, start index 267, forward until end
+        phase_rom[208] = 21'h08542e; // 208º: phaseVal 133, start index 267, forward until end
+        phase_rom[209] = 21'h08542e; // 209º: phaseVal 133, start index 267, forward until end
+        phase_rom[210] = 21'h08542e; // 210º: phaseVal 133, start index 267, forward until end
+        phase_rom[211] = 21'h08542e; // 211º: phaseVal 133, start index 267, forward until end
+        phase_rom[212] = 21'h08542e; // 212º: phaseVal 133, start index 267, forward until end
+        phase_rom[213] = 21'h08542e; // 213º: phaseVal 133, start index 267, forward until end
+        phase_rom[214] = 21'h08542e; // 214º: phaseVal 133, start index 267, forward until end
+        phase_rom[215] = 21'h08542e; // 215º: phaseVal 133, start index 267, forward until end
+        phase_rom[216] = 21'h08542e; // 216º: phaseVal 133, start index 267, forward until end
+        phase_rom[217] = 21'h08542e; // 217º: phaseVal 133, start index 267, forward until end
+        phase_rom[218] = 21'h08542e; // 218º: phaseVal 133, start index 267, forward until end
+        phase_rom[219] = 21'h08542e; // 219º: phaseVal 133, start index 267, forward until end
+        phase_rom[220] = 21'h08542e; // 220º: phaseVal 133, start index 267, forward until end
+        phase_rom[221] = 21'h08542e; // 221º: phaseVal 133, start index 267, forward until end
+        phase_rom[222] = 21'h08542e; // 222º: phaseVal 133, start index 267, forward until end
+        phase_rom[223] = 21'h08542e; // 223º: phaseVal 133, start index 267, forward until end
+        phase_rom[224] = 21'h08542e; // 224º: phaseVal 133, start index 267, forward until end
+        phase_rom[225] = 21'h08542e; // 225º: phaseVal 133, start index 267, forward until end
+        phase_rom[226] = 21'h08542e; // 226º: phaseVal 133, start index 267, forward until end
+        phase_rom[227] = 21'h08542e; // 227º: phaseVal 133, start index 267, forward until end
+        phase_rom[228] = 21'h08542e; // 228º: phaseVal 133, start index 267, forward until end
+        phase_rom[229] = 21'h08542e; // 229º: phaseVal 133, start index 267, forward until end
+        phase_rom[230] = 21'h08542e; // 230º: phaseVal 133, start index 267, forward until end
+        phase_rom[231] = 21'h08542e; // 231º: phaseVal 133, start index 267, forward until end
+        phase_rom[232] = 21'h08542e; // 232º: phaseVal 133, start index 267, forward until end
+        phase_rom[233] = 21'h08542e; // 233º: phaseVal 133, start index 267, forward until end
+        phase_rom[234] = 21'h08542e; // 234º: phaseVal 133, start index 267, forward until end
+        phase_rom[235] = 21'h08542e; // 235º: phaseVal 133, start index 267, forward until end
+        phase_rom[236] = 21'h08542e; // 236º: phaseVal 133, start index 267, forward until end
+        phase_rom[237] = 21'h08542e; // 237º: phaseVal 133, start index 267, forward until end
+        phase_rom[238] = 21'h08542e; // 238º: phaseVal 133, start index 267, forward until end
+        phase_rom[239] = 21'h08542e; // 239º: phaseVal 133, start index 267, forward until end
+        phase_rom[240] = 21'h08542e; // 240º: phaseVal 133, start index 267, forward until end
+        phase_rom[241] = 21'h08542e; // 241º: phaseVal 133, start index 267, forward until end
+        phase_rom[242] = 21'h08542e; // 242º: phaseVal 133, start index 267, forward until end
+        phase_rom[243] = 21'h08542e; // 243º: phaseVal 133, start index 267, forward until end
+        phase_rom[244] = 21'h08542e; // 244º: phaseVal 133, start index 267, forward until end
+        phase_rom[245] = 21'h08542e; // 245º: phaseVal 133, start index 267, forward until end
+        phase_rom[246] = 21'h08542e; // 246º: phaseVal 133, start index 267, forward until end
+        phase_rom[247] = 21'h08542e; // 247º: phaseVal 133, start index 267, forward until end
+        phase_rom[248] = 21'h08542e; // 248º: phaseVal 133, start index 267, forward until end
+        phase_rom[249] = 21'h08542e; // 249º: phaseVal 133, start index 267, forward until end
+        phase_rom[250] = 21'h08542e; // 250º: phaseVal 133, start index 267, forward until end
+        phase_rom[251] = 21'h08542e; // 251º: phaseVal 133, start index 267, forward until end
+        phase_rom[252] = 21'h08542e; // 252º: phaseVal 133, start index 267, forward until end
+        phase_rom[253] = 21'h08542e; // 253º: phaseVal 133, start index 267, forward until end
+        phase_rom[254] = 21'h08542e; // 254º: phaseVal 133, start index 267, forward until end
+        phase_rom[255] = 21'h08542e; // 255º: phaseVal 133, start index 267, forward until end
+        phase_rom[256] = 21'h06f3d7; // -256º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[257] = 21'h06f3d7; // -255º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[258] = 21'h06f3d7; // -254º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[259] = 21'h06f3d7; // -253º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[260] = 21'h06f3d7; // -252º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[261] = 21'h06f3d7; // -251º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[262] = 21'h06f3d7; // -250º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[263] = 21'h06f3d7; // -249º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[264] = 21'h06f3d7; // -248º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[265] = 21'h06f3d7; // -247º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[266] = 21'h06f3d7; // -246º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[267] = 21'h06f3d7; // -245º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[268] = 21'h06f3d7; // -244º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[269] = 21'h06f3d7; // -243º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[270] = 21'h06f3d7; // -242º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[271] = 21'h06f3d7; // -241º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[272] = 21'h06f3d7; // -240º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[273] = 21'h06f3d7; // -239º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[274] = 21'h06f3d7; // -238º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[275] = 21'h06f3d7; // -237º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[276] = 21'h06f3d7; // -236º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[277] = 21'h06f3d7; // -235º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[278] = 21'h06f3d7; // -234º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[279] = 21'h06f3d7; // -233º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[280] = 21'h06f3d7; // -232º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[281] = 21'h06f3d7; // -231º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[282] = 21'h06f3d7; // -230º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[283] = 21'h06f3d7; // -229º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[284] = 21'h06f3d7; // -228º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[285] = 21'h06f3d7; // -227º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[286] = 21'h06f3d7; // -226º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[287] = 21'h06f3d7; // -225º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[288] = 21'h06f3d7; // -224º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[289] = 21'h06f3d7; // -223º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[290] = 21'h06f3d7; // -222º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[291] = 21'h06f3d7; // -221º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[292] = 21'h06f3d7; // -220º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[293] = 21'h06f3d7; // -219º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[294] = 21'h06f3d7; // -218º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[295] = 21'h06f3d7; // -217º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[296] = 21'h06f3d7; // -216º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[297] = 21'h06f3d7; // -215º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[298] = 21'h06f3d7; // -214º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[299] = 21'h06f3d7; // -213º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[300] = 21'h06f3d7; // -212º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[301] = 21'h06f3d7; // -211º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[302] = 21'h06f3d7; // -210º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[303] = 21'h06f3d7; // -209º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[304] = 21'h06f3d7; // -208º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[305] = 21'h06f3d7; // -207º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[306] = 21'h06f3d7; // -206º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[307] = 21'h06f3d7; // -205º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[308] = 21'h06f3d7; // -204º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[309] = 21'h06f3d7; // -203º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[310] = 21'h06f3d7; // -202º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[311] = 21'h06f3d7; // -201º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[312] = 21'h06f3d7; // -200º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[313] = 21'h06f3d7; // -199º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[314] = 21'h06f3d7; // -198º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[315] = 21'h06f3d7; // -197º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[316] = 21'h06f3d7; // -196º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[317] = 21'h06f3d7; // -195º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[318] = 21'h06f3d7; // -194º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[319] = 21'h06f3d7; // -193º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[320] = 21'h06f3d7; // -192º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[321] = 21'h06f3d7; // -191º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[322] = 21'h06f3d7; // -190º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[323] = 21'h06f3d7; // -189º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[324] = 21'h06f3d7; // -188º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[325] = 21'h06f3d7; // -187º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[326] = 21'h06f3d7; // -186º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[327] = 21'h06f3d7; // -185º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[328] = 21'h06f3d7; // -184º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[329] = 21'h06f3d7; // -183º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[330] = 21'h06f3d7; // -182º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[331] = 21'h06f3d7; // -181º: phaseVal 111, start index 245, reverse unless start
+        phase_rom[332] = 21'h0f45e9; // -180º: phaseVal 244, start index 378, reverse
+        phase_rom[333] = 21'h0f55ef; // -179º: phaseVal 245, start index 379, reverse unless start
+        phase_rom[334] = 21'h0f65f3; // -178º: phaseVal 246, start index 380, reverse unless start
+        phase_rom[335] = 21'h0f85fb; // -177º: phaseVal 248, start index 382, reverse unless start
+        phase_rom[336] = 21'h0f95ff; // -176º: phaseVal 249, start index 383, reverse unless start
+        phase_rom[337] = 21'h0fb607; // -175º: phaseVal 251, start index 385, reverse unless start
+        phase_rom[338] = 21'h0fc60b; // -174º: phaseVal 252, start index 386, reverse unless start
+        phase_rom[339] = 21'h0fe613; // -173º: phaseVal 254, start index 388, reverse unless start
+        phase_rom[340] = 21'h0ff617; // -172º: phaseVal 255, start index 389, reverse unless start
+        phase_rom[341] = 21'h1011e7; // -171º: phaseVal -255, start index 121, reverse unless start
+        phase_rom[342] = 21'h1021e3; // -170º: phaseVal -254, start index 120, reverse unless start
+        phase_rom[343] = 21'h1041db; // -169º: phaseVal -252, start index 118, reverse unless start
+        phase_rom[344] = 21'h1051d7; // -168º: phaseVal -251, start index 117, reverse unless start
+        phase_rom[345] = 21'h1071cf; // -167º: phaseVal -249, start index 115, reverse unless start
+        phase_rom[346] = 21'h1081cb; // -166º: phaseVal -248, start index 114, reverse unless start
+        phase_rom[347] = 21'h10a1c3; // -165º: phaseVal -246, start index 112, reverse unless start
+        phase_rom[348] = 21'h10b1bf; // -164º: phaseVal -245, start index 111, reverse unless start
+        phase_rom[349] = 21'h10d1b7; // -163º: phaseVal -243, start index 109, reverse unless start
+        phase_rom[350] = 21'h10e1b3; // -162º: phaseVal -242, start index 108, reverse unless start
+        phase_rom[351] = 21'h1101ab; // -161º: phaseVal -240, start index 106, reverse unless start
+        phase_rom[352] = 21'h1111a7; // -160º: phaseVal -239, start index 105, reverse unless start
+        phase_rom[353] = 21'h11319f; // -159º: phaseVal -237, start index 103, reverse unless start
+        phase_rom[354] = 21'h11419b; // -158º: phaseVal -236, start index 102, reverse unless start
+        phase_rom[355] = 21'h116193; // -157º: phaseVal -234, start index 100, reverse unless start
+        phase_rom[356] = 21'h11718f; // -156º: phaseVal -233, start index 99, reverse unless start
+        phase_rom[357] = 21'h119187; // -155º: phaseVal -231, start index 97, reverse unless start
+        phase_rom[358] = 21'h11a183; // -154º: phaseVal -230, start index 96, reverse unless start
+        phase_rom[359] = 21'h11c17b; // -153º: phaseVal -228, start index 94, reverse unless start
+        phase_rom[360] = 21'h11d177; // -152º: phaseVal -227, start index 93, reverse unless start
+        phase_rom[361] = 21'h11f16f; // -151º: phaseVal -225, start index 91, reverse unless start
+        phase_rom[362] = 21'h12016b; // -150º: phaseVal -224, start index 90, reverse unless start
+        phase_rom[363] = 21'h122163; // -149º: phaseVal -222, start index 88, reverse unless start
+        phase_rom[364] = 21'h12315f; // -148º: phaseVal -221, start index 87, reverse unless start
+        phase_rom[365] = 21'h125157; // -147º: phaseVal -219, start index 85, reverse unless start
+        phase_rom[366] = 21'h126153; // -146º: phaseVal -218, start index 84, reverse unless start
+        phase_rom[367] = 21'h12814b; // -145º: phaseVal -216, start index 82, reverse unless start
+        phase_rom[368] = 21'h129147; // -144º: phaseVal -215, start index 81, reverse unless start
+        phase_rom[369] = 21'h12b13f; // -143º: phaseVal -213, start index 79, reverse unless start
+        phase_rom[370] = 21'h12c13b; // -142º: phaseVal -212, start index 78, reverse unless start
+        phase_rom[371] = 21'h12e133; // -141º: phaseVal -210, start index 76, reverse unless start
+        phase_rom[372] = 21'h12f12f; // -140º: phaseVal -209, start index 75, reverse unless start
+        phase_rom[373] = 21'h131127; // -139º: phaseVal -207, start index 73, reverse unless start
+        phase_rom[374] = 21'h132123; // -138º: phaseVal -206, start index 72, reverse unless start
+        phase_rom[375] = 21'h13411b; // -137º: phaseVal -204, start index 70, reverse unless start
+        phase_rom[376] = 21'h135117; // -136º: phaseVal -203, start index 69, reverse unless start
+        phase_rom[377] = 21'h13710f; // -135º: phaseVal -201, start index 67, reverse unless start
+        phase_rom[378] = 21'h13810b; // -134º: phaseVal -200, start index 66, reverse unless start
+        phase_rom[379] = 21'h139107; // -133º: phaseVal -199, start index 65, reverse unless start
+        phase_rom[380] = 21'h13b0ff; // -132º: phaseVal -197, start index 63, reverse unless start
+        phase_rom[381] = 21'h13c0fb; // -131º: phaseVal -196, start index 62, reverse unless start
+        phase_rom[382] = 21'h13e0f3; // -130º: phaseVal -194, start index 60, reverse unless start
+        phase_rom[383] = 21'h13f0ef; // -129º: phaseVal -193, start index 59, reverse unless start
+        phase_rom[384] = 21'h1410e7; // -128º: phaseVal -191, start index 57, reverse unless start
+        phase_rom[385] = 21'h1420e3; // -127º: phaseVal -190, start index 56, reverse unless start
+        phase_rom[386] = 21'h1440db; // -126º: phaseVal -188, start index 54, reverse unless start
+        phase_rom[387] = 21'h1450d7; // -125º: phaseVal -187, start index 53, reverse unless start
+        phase_rom[388] = 21'h1470cf; // -124º: phaseVal -185, start index 51, reverse unless start
+        phase_rom[389] = 21'h1480cb; // -123º: phaseVal -184, start index 50, reverse unless start
+        phase_rom[390] = 21'h14a0c3; // -122º: phaseVal -182, start index 48, reverse unless start
+        phase_rom[391] = 21'h14b0bf; // -121º: phaseVal -181, start index 47, reverse unless start
+        phase_rom[392] = 21'h14d0b7; // -120º: phaseVal -179, start index 45, reverse unless start
+        phase_rom[393] = 21'h14e0b3; // -119º: phaseVal -178, start index 44, reverse unless start
+        phase_rom[394] = 21'h1500ab; // -118º: phaseVal -176, start index 42, reverse unless start
+        phase_rom[395] = 21'h1510a7; // -117º: phaseVal -175, start index 41, reverse unless start
+        phase_rom[396] = 21'h15309f; // -116º: phaseVal -173, start index 39, reverse unless start
+        phase_rom[397] = 21'h15409b; // -115º: phaseVal -172, start index 38, reverse unless start
+        phase_rom[398] = 21'h156093; // -114º: phaseVal -170, start index 36, reverse unless start
+        phase_rom[399] = 21'h15708f; // -113º: phaseVal -169, start index 35, reverse unless start
+        phase_rom[400] = 21'h159087; // -112º: phaseVal -167, start index 33, reverse unless start
+        phase_rom[401] = 21'h15a083; // -111º: phaseVal -166, start index 32, reverse unless start
+        phase_rom[402] = 21'h15c07b; // -110º: phaseVal -164, start index 30, reverse unless start
+        phase_rom[403] = 21'h15d077; // -109º: phaseVal -163, start index 29, reverse unless start
+        phase_rom[404] = 21'h15f06f; // -108º: phaseVal -161, start index 27, reverse unless start
+        phase_rom[405] = 21'h16006b; // -107º: phaseVal -160, start index 26, reverse unless start
+        phase_rom[406] = 21'h162063; // -106º: phaseVal -158, start index 24, reverse unless start
+        phase_rom[407] = 21'h16305f; // -105º: phaseVal -157, start index 23, reverse unless start
+        phase_rom[408] = 21'h165057; // -104º: phaseVal -155, start index 21, reverse unless start
+        phase_rom[409] = 21'h166053; // -103º: phaseVal -154, start index 20, reverse unless start
+        phase_rom[410] = 21'h16804b; // -102º: phaseVal -152, start index 18, reverse unless start
+        phase_rom[411] = 21'h169047; // -101º: phaseVal -151, start index 17, reverse unless start
+        phase_rom[412] = 21'h16b03f; // -100º: phaseVal -149, start index 15, reverse unless start
+        phase_rom[413] = 21'h16c03b; // -99º: phaseVal -148, start index 14, reverse unless start
+        phase_rom[414] = 21'h16e033; // -98º: phaseVal -146, start index 12, reverse unless start
+        phase_rom[415] = 21'h16f02f; // -97º: phaseVal -145, start index 11, reverse unless start
+        phase_rom[416] = 21'h171027; // -96º: phaseVal -143, start index 9, reverse unless start
+        phase_rom[417] = 21'h172023; // -95º: phaseVal -142, start index 8, reverse unless start
+        phase_rom[418] = 21'h17401b; // -94º: phaseVal -140, start index 6, reverse unless start
+        phase_rom[419] = 21'h175017; // -93º: phaseVal -139, start index 5, reverse unless start
+        phase_rom[420] = 21'h17700f; // -92º: phaseVal -137, start index 3, reverse unless start
+        phase_rom[421] = 21'h17800b; // -91º: phaseVal -136, start index 2, reverse unless start
+        phase_rom[422] = 21'h17a000; // -90º: phaseVal -134, start index 0, forward
+        phase_rom[423] = 21'h17b007; // -89º: phaseVal -133, start index 1, reverse unless start
+        phase_rom[424] = 21'h17c00b; // -88º: phaseVal -132, start index 2, reverse unless start
+        phase_rom[425] = 21'h17e013; // -87º: phaseVal -130, start index 4, reverse unless start
+        phase_rom[426] = 21'h17f017; // -86º: phaseVal -129, start index 5, reverse unless start
+        phase_rom[427] = 21'h18101f; // -85º: phaseVal -127, start index 7, reverse unless start
+        phase_rom[428] = 21'h182023; // -84º: phaseVal -126, start index 8, reverse unless start
+        phase_rom[429] = 21'h18402b; // -83º: phaseVal -124, start index 10, reverse unless start
+        phase_rom[430] = 21'h18502f; // -82º: phaseVal -123, start index 11, reverse unless start
+        phase_rom[431] = 21'h187037; // -81º: phaseVal -121, start index 13, reverse unless start
+        phase_rom[432] = 21'h18803b; // -80º: phaseVal -120, start index 14, reverse unless start
+        phase_rom[433] = 21'h18a043; // -79º: phaseVal -118, start index 16, reverse unless start
+        phase_rom[434] = 21'h18b047; // -78º: phaseVal -117, start index 17, reverse unless start
+        phase_rom[435] = 21'h18d04f; // -77º: phaseVal -115, start index 19, reverse unless start
+        phase_rom[436] = 21'h18e053; // -76º: phaseVal -114, start index 20, reverse unless start
+        phase_rom[437] = 21'h19005b; // -75º: phaseVal -112, start index 22, reverse unless start
+        phase_rom[438] = 21'h19105f; // -74º: phaseVal -111, start index 23, reverse unless start
+        phase_rom[439] = 21'h193067; // -73º: phaseVal -109, start index 25, reverse unless start
+        phase_rom[440] = 21'h19406b; // -72º: phaseVal -108, start index 26, reverse unless start
+        phase_rom[441] = 21'h196073; // -71º: phaseVal -106, start index 28, reverse unless start
+        phase_rom[442] = 21'h197077; // -70º: phaseVal -105, start index 29, reverse unless start
+        phase_rom[443] = 21'h19907f; // -69º: phaseVal -103, start index 31, reverse unless start
+        phase_rom[444] = 21'h19a083; // -68º: phaseVal -102, start index 32, reverse unless start
+        phase_rom[445] = 21'h19c08b; // -67º: phaseVal -100, start index 34, reverse unless start
+        phase_rom[446] = 21'h19d08f; // -66º: phaseVal -99, start index 35, reverse unless start
+        phase_rom[447] = 21'h19f097; // -65º: phaseVal -97, start index 37, reverse unless start
+        phase_rom[448] = 21'h1a009b; // -64º: phaseVal -96, start index 38, reverse unless start
+        phase_rom[449] = 21'h1a20a3; // -63º: phaseVal -94, start index 40, reverse unless start
+        phase_rom[450] = 21'h1a30a7; // -62º: phaseVal -93, start index 41, reverse unless start
+        phase_rom[451] = 21'h1a50af; // -61º: phaseVal -91, start index 43, reverse unless start
+        phase_rom[452] = 21'h1a60b3; // -60º: phaseVal -90, start index 44, reverse unless start
+        phase_rom[453] = 21'h1a80bb; // -59º: phaseVal -88, start index 46, reverse unless start
+        phase_rom[454] = 21'h1a90bf; // -58º: phaseVal -87, start index 47, reverse unless start
+        phase_rom[455] = 21'h1ab0c7; // -57º: phaseVal -85, start index 49, reverse unless start
+        phase_rom[456] = 21'h1ac0cb; // -56º: phaseVal -84, start index 50, reverse unless start
+        phase_rom[457] = 21'h1ae0d3; // -55º: phaseVal -82, start index 52, reverse unless start
+        phase_rom[458] = 21'h1af0d7; // -54º: phaseVal -81, start index 53, reverse unless start
+        phase_rom[459] = 21'h1b10df; // -53º: phaseVal -79, start index 55, reverse unless start
+        phase_rom[460] = 21'h1b20e3; // -52º: phaseVal -78, start index 56, reverse unless start
+        phase_rom[461] = 21'h1b40eb; // -51º: phaseVal -76, start index 58, reverse unless start
+        phase_rom[462] = 21'h1b50ef; // -50º: phaseVal -75, start index 59, reverse unless start
+        phase_rom[463] = 21'h1b70f7; // -49º: phaseVal -73, start index 61, reverse unless start
+        phase_rom[464] = 21'h1b80fb; // -48º: phaseVal -72, start index 62, reverse unless start
+        phase_rom[465] = 21'h1ba103; // -47º: phaseVal -70, start index 64, reverse unless start
+        phase_rom[466] = 21'h1bb107; // -46º: phaseVal -69, start index 65, reverse unless start
+        phase_rom[467] = 21'h1bd10f; // -45º: phaseVal -67, start index 67, reverse unless start
+        phase_rom[468] = 21'h1be113; // -44º: phaseVal -66, start index 68, reverse unless start
+        phase_rom[469] = 21'h1bf117; // -43º: phaseVal -65, start index 69, reverse unless start
+        phase_rom[470] = 21'h1c111f; // -42º: phaseVal -63, start index 71, reverse unless start
+        phase_rom[471] = 21'h1c2123; // -41º: phaseVal -62, start index 72, reverse unless start
+        phase_rom[472] = 21'h1c412b; // -40º: phaseVal -60, start index 74, reverse unless start
+        phase_rom[473] = 21'h1c512f; // -39º: phaseVal -59, start index 75, reverse unless start
+        phase_rom[474] = 21'h1c7137; // -38º: phaseVal -57, start index 77, reverse unless start
+        phase_rom[475] = 21'h1c813b; // -37º: phaseVal -56, start index 78, reverse unless start
+        phase_rom[476] = 21'h1ca143; // -36º: phaseVal -54, start index 80, reverse unless start
+        phase_rom[477] = 21'h1cb147; // -35º: phaseVal -53, start index 81, reverse unless start
+        phase_rom[478] = 21'h1cd14f; // -34º: phaseVal -51, start index 83, reverse unless start
+        phase_rom[479] = 21'h1ce153; // -33º: phaseVal -50, start index 84, reverse unless start
+        phase_rom[480] = 21'h1d015b; // -32º: phaseVal -48, start index 86, reverse unless start
+        phase_rom[481] = 21'h1d115f; // -31º: phaseVal -47, start index 87, reverse unless start
+        phase_rom[482] = 21'h1d3167; // -30º: phaseVal -45, start index 89, reverse unless start
+        phase_rom[483] = 21'h1d416b; // -29º: phaseVal -44, start index 90, reverse unless start
+        phase_rom[484] = 21'h1d6173; // -28º: phaseVal -42, start index 92, reverse unless start
+        phase_rom[485] = 21'h1d7177; // -27º: phaseVal -41, start index 93, reverse unless start
+        phase_rom[486] = 21'h1d917f; // -26º: phaseVal -39, start index 95, reverse unless start
+        phase_rom[487] = 21'h1da183; // -25º: phaseVal -38, start index 96, reverse unless start
+        phase_rom[488] = 21'h1dc18b; // -24º: phaseVal -36, start index 98, reverse unless start
+        phase_rom[489] = 21'h1dd18f; // -23º: phaseVal -35, start index 99, reverse unless start
+        phase_rom[490] = 21'h1df197; // -22º: phaseVal -33, start index 101, reverse unless start
+        phase_rom[491] = 21'h1e019b; // -21º: phaseVal -32, start index 102, reverse unless start
+        phase_rom[492] = 21'h1e21a3; // -20º: phaseVal -30, start index 104, reverse unless start
+        phase_rom[493] = 21'h1e31a7; // -19º: phaseVal -29, start index 105, reverse unless start
+        phase_rom[494] = 21'h1e51af; // -18º: phaseVal -27, start index 107, reverse unless start
+        phase_rom[495] = 21'h1e61b3; // -17º: phaseVal -26, start index 108, reverse unless start
+        phase_rom[496] = 21'h1e81bb; // -16º: phaseVal -24, start index 110, reverse unless start
+        phase_rom[497] = 21'h1e91bf; // -15º: phaseVal -23, start index 111, reverse unless start
+        phase_rom[498] = 21'h1eb1c7; // -14º: phaseVal -21, start index 113, reverse unless start
+        phase_rom[499] = 21'h1ec1cb; // -13º: phaseVal -20, start index 114, reverse unless start
+        phase_rom[500] = 21'h1ee1d3; // -12º: phaseVal -18, start index 116, reverse unless start
+        phase_rom[501] = 21'h1ef1d7; // -11º: phaseVal -17, start index 117, reverse unless start
+        phase_rom[502] = 21'h1f11df; // -10º: phaseVal -15, start index 119, reverse unless start
+        phase_rom[503] = 21'h1f21e3; // -9º: phaseVal -14, start index 120, reverse unless start
+        phase_rom[504] = 21'h1f41eb; // -8º: phaseVal -12, start index 122, reverse unless start
+        phase_rom[505] = 21'h1f51ef; // -7º: phaseVal -11, start index 123, reverse unless start
+        phase_rom[506] = 21'h1f71f7; // -6º: phaseVal -9, start index 125, reverse unless start
+        phase_rom[507] = 21'h1f81fb; // -5º: phaseVal -8, start index 126, reverse unless start
+        phase_rom[508] = 21'h1fa203; // -4º: phaseVal -6, start index 128, reverse unless start
+        phase_rom[509] = 21'h1fb207; // -3º: phaseVal -5, start index 129, reverse unless start
+        phase_rom[510] = 21'h1fd20f; // -2º: phaseVal -3, start index 131, reverse unless start
+        phase_rom[511] = 21'h1fe213; // -1º: phaseVal -2, start index 132, reverse unless start
+    end
+
+    // The phase bits address the ROM as an unsigned value
+    assign {phaseVal, start_index, direction} = phase_rom[$unsigned(phase)];
+
+endmodule
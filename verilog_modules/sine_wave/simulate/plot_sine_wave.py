@@ -1,19 +1,29 @@
-import pandas as pd
+import sys
 import matplotlib.pyplot as plt
 import os
+from sim_trace import load_csv_trace, load_trace
 
-# Read the CSV file
-csv_file = os.path.join(os.path.dirname(__file__),'signal_gen_top_output.csv')
+# helpers shared by the verilog modules
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'common'))
+from decimated_plot import plot_decimated
 
-data = pd.read_csv(csv_file) 
+# Read the simulation output, a binary trace is memory-mapped and a CSV is read into memory
+# (convert large CSVs once with sim_trace.py to memory-map them)
+simulate_dir = os.path.dirname(os.path.abspath(__file__))
+trace_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(simulate_dir, 'signal_gen_top_output.bin')
+if len(sys.argv) <= 1 and not os.path.exists(trace_file):
+    trace_file = os.path.join(simulate_dir, 'signal_gen_top_output.csv')
+
+if trace_file.endswith('.bin'):
+    data = load_trace(trace_file, columns=['c', 's'])
+else:
+    data = load_csv_trace(trace_file, columns=['c', 's'])
 
 x = data['c']
 y = data['s']
-z = data['p']
-t = data['i']
 
 # Plot the sine wave
-plt.step(x, y)
+plot_decimated(x, y, where='pre')
 plt.title('Sine Wave Simulation', fontsize=20)
 plt.xlabel('Clock Cycle',fontsize=16)
 plt.ylabel('Amplitude (uint)', fontsize=16)
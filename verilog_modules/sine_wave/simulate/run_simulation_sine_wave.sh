@@ -12,11 +12,12 @@ verilator --cc --exe --build -j 0 -Wall -I${MODULE_DIR} ${MODULE_DIR}/simulate/$
 echo ""
 echo "Compiled the simulation of the ${verilog_module_filename}.v module"
 
-# delete the csv if it is present
+# delete the csv and binary trace if they are present
 output_csv="${MODULE_DIR}/simulate/${verilog_module_filename}_output.csv"
-if [ -f "$output_csv" ]; then
-    echo "Overriding the existing csv file..."
-    rm "$output_csv"
+output_bin="${MODULE_DIR}/simulate/${verilog_module_filename}_output.bin"
+if [ -f "$output_csv" ] || [ -f "$output_bin" ]; then
+    echo "Overriding the existing output files..."
+    rm -f "$output_csv" "$output_bin"
 fi
 
 # Default values
@@ -26,6 +27,7 @@ PHASE=0
 SIM_TIME_PROVIDED=false
 PHASE_PROVIDED=false
 PLOT=false
+BINARY=false
 
 # Parse optional arguments
 while [[ "$#" -gt 0 ]]; do
@@ -34,6 +36,10 @@ while [[ "$#" -gt 0 ]]; do
             PLOT=true
             shift
             ;;
+        --binary)
+            BINARY=true
+            shift
+            ;;
         --sim_time)
             if [[ -n "$2" ]]; then
                 SIM_TIME=$2
@@ -60,6 +66,7 @@ while [[ "$#" -gt 0 ]]; do
             echo "  --plot          Plot the output of the simulation"
             echo "  --sim_time      Set the simulation time in cycles (default: 250)"
             echo "  --phase         Set the phase of the sine wave in cycles (default: 0)"
+            echo "  --binary        Write a binary trace (${verilog_module_filename}_output.bin) instead of the csv"
             echo "  -h              Display this help message"
             exit 0
             ;;
@@ -82,15 +89,22 @@ else
     echo "No phase argument provided. Using default value of ${PHASE} cycles."
 fi
 
-# Run the simulation, and save the output to a csv file
-${MODULE_DIR}/simulate/obj_dir/V${verilog_module_filename} --sim_time ${SIM_TIME} --phase ${PHASE} >> ${output_csv}
+# Run the simulation, and save the output to a csv file or a binary trace
+# (run from the module directory so $readmemh table files are found)
+if $BINARY; then
+    (cd ${MODULE_DIR} && ./simulate/obj_dir/V${verilog_module_filename} --sim_time ${SIM_TIME} --phase ${PHASE} --trace simulate/${verilog_module_filename}_output.bin)
+    output_file=${output_bin}
+else
+    (cd ${MODULE_DIR} && ./simulate/obj_dir/V${verilog_module_filename} --sim_time ${SIM_TIME} --phase ${PHASE}) >> ${output_csv}
+    output_file=${output_csv}
+fi
 
 echo "Simulation of the ${verilog_module_filename}.v module is complete"
 
 # Check for the --no-plot argument
 if $PLOT; then
     echo "Plotting the output of the simulation..."
-    python ${MODULE_DIR}/simulate/plot_sine_wave.py
+    python ${MODULE_DIR}/simulate/plot_sine_wave.py ${output_file}
 else
     echo "Plotting is disabled."
 fi
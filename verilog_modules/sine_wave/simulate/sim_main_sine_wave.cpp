@@ -1,13 +1,80 @@
 #include "Vsignal_gen_top.h"
 #include "verilated.h"
 #include <iostream>
+#include <fstream>
+#include <string>
+#include <vector>
+#include <cstdint>
+
+// Writes the c,s,p,i outputs either as CSV to stdout or as the packed binary trace read by sim_trace.py
+// (to a file, or to stdout when the file name is "-"):
+// magic "SGTRACE1", little-endian uint32 header length, JSON header with the field dtypes, then
+// one 14 byte little-endian record (int32 c, uint32 s, uint16 p, uint32 i) per cycle.
+class TraceWriter {
+public:
+    explicit TraceWriter(const std::string& filename) : binary(!filename.empty()), out(&std::cout) {
+        if (binary && filename != "-") {
+            file.open(filename, std::ios::binary | std::ios::trunc);
+            out = &file;
+        }
+        if (binary) {
+            static const char header[] = "{\"fields\":[[\"c\",\"<i4\"],[\"s\",\"<u4\"],[\"p\",\"<u2\"],[\"i\",\"<u4\"]]}";
+            const uint32_t header_length = sizeof(header) - 1;
+            out->write("SGTRACE1", 8);
+            put(header_length, 4);
+            buffer.insert(buffer.end(), header, header + header_length);
+        } else {
+            std::cout << "c,s,p,i" << std::endl;
+        }
+    }
+
+    ~TraceWriter() { flush(); }
+
+    bool is_open() const { return out != &file || file.is_open(); }
+
+    void write(int cycle, uint32_t sine, uint32_t phaseIdx, uint32_t index) {
+        if (!binary) {
+            std::cout << "" << cycle << "," << static_cast<int>(sine) << "," << static_cast<int>(phaseIdx) << "," << static_cast<int>(index) << "\n";
+            return;
+        }
+        put(static_cast<uint32_t>(cycle), 4);
+        put(sine, 4);
+        put(phaseIdx, 2);
+        put(index, 4);
+        if (buffer.size() >= (1 << 20)) flush();
+    }
+
+    void flush() {
+        if (binary) {
+            out->write(buffer.data(), buffer.size());
+            buffer.clear();
+        }
+        out->flush();
+    }
+
+private:
+    // Append the low bytes of a value in little-endian order
+    void put(uint32_t value, int bytes) {
+        for (int b = 0; b < bytes; b++) buffer.push_back(static_cast<char>((value >> (8 * b)) & 0xFF));
+    }
+
+    bool binary;
+    std::ofstream file;
+    std::ostream* out;
+    std::vector<char> buffer;
+};
 
 int main(int argc, char** argv) {
     // Initialize Verilator context
     VerilatedContext* contextp = new VerilatedContext;
     contextp->commandArgs(argc, argv);
-    int sim_time;
-    int phase;
+    int sim_time = 250;
+    int phase = 0;
+    int phase_step = 1;
+    // Phase change applied during the run, a negative switch cycle disables it
+    int switch_cycle = 300;
+    int switch_phase = 90;
+    std::string trace_filename;
 
     // Retrieve command line arguments
     for (int i = 1; i < argc; i++) {
@@ -23,6 +90,18 @@ int main(int argc, char** argv) {
             //printf("Setting phase to %d\n", std::atoi(argv[i + 1]));
             phase = std::atoi(argv[i + 1]);
         }
+        if (std::string(argv[i]) == "--phase_step" && i + 1 < argc) {
+            phase_step = std::atoi(argv[i + 1]);
+        }
+        if (std::string(argv[i]) == "--switch_cycle" && i + 1 < argc) {
+            switch_cycle = std::atoi(argv[i + 1]);
+        }
+        if (std::string(argv[i]) == "--switch_phase" && i + 1 < argc) {
+            switch_phase = std::atoi(argv[i + 1]);
+        }
+        if (std::string(argv[i]) == "--trace" && i + 1 < argc) {
+            trace_filename = argv[i + 1];
+        }
     }
 
     // Instantiate the model
@@ -32,10 +111,14 @@ int main(int argc, char** argv) {
     top->clock = 0;
     top->reset = 0;
     top->phase = phase;
-    top->phaseStep = 1;
+    top->phaseStep = phase_step;
 
-    // Print csv headers
-    std::cout << "c,s,p,i" << std::endl;
+    // Print csv headers, or open the binary trace given with --trace
+    TraceWriter trace(trace_filename);
+    if (!trace.is_open()) {
+        std::cerr << "Error: Could not open the trace file " << trace_filename << std::endl;
+        return 1;
+    }
 
     // Reset logic for 5 cycles
     int reset_cycles = -5;
@@ -44,7 +127,7 @@ int main(int argc, char** argv) {
         top->eval(); // Evaluate model on each clock edge
 
         if (top->clock) {
-            std::cout << "" << reset_cycles << "," << static_cast<int>(top->sine) << "," << static_cast<int>(top->phaseIdxOut) << "," << static_cast<int>(top->i) << std::endl;
+            trace.write(reset_cycles, top->sine, top->phaseIdxOut, top->i);
             reset_cycles++;
         }
 
@@ -64,8 +147,8 @@ int main(int argc, char** argv) {
             //top->phaseStep = 3;
             //top->reset = 1;
         }
-        if (cycleCount == 300){
-            top->phase = 90;
+        if (cycleCount == switch_cycle){
+            top->phase = switch_phase;
             //top->phaseStep = 10;
             //top->reset = 0;
         }
@@ -75,7 +158,7 @@ int main(int argc, char** argv) {
 
         // Capture output on the positive edge of clock
         if (top->clock) {
-            std::cout << "" << cycleCount << "," << static_cast<int>(top->sine) << "," << static_cast<int>(top->phaseIdxOut) << "," << static_cast<int>(top->i) << std::endl;
+            trace.write(cycleCount, top->sine, top->phaseIdxOut, top->i);
             cycleCount++;
         }
 
@@ -84,6 +167,7 @@ int main(int argc, char** argv) {
     }
 
     // Final model cleanup
+    trace.flush();
     top->final();
 
     // Cleanup
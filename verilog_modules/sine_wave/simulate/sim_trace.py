@@ -0,0 +1,164 @@
+import argparse
+import itertools
+import json
+import os
+import struct
+import numpy as np
+
+# Binary trace layout:
+#   8 bytes   magic, b'SGTRACE1'
+#   4 bytes   little-endian uint32 length of the JSON header
+#   N bytes   JSON header, {"fields": [[name, numpy dtype string], ...]}
+#   records   packed little-endian records with the fields in header order, until the end of the file
+TRACE_MAGIC = b'SGTRACE1'
+
+# Columns written by sim_main_sine_wave.cpp: clock cycle, sine output, phase index and table index.
+# p and i hold the unsigned values of their Verilog width, as in the CSV output.
+TRACE_FIELDS = [('c', '<i4'), ('s', '<u4'), ('p', '<u2'), ('i', '<u4')]
+
+def trace_header(fields=TRACE_FIELDS) -> bytes:
+    """
+    Build the magic, header length and JSON header that start a binary trace file.
+    """
+    header = json.dumps({"fields": [list(field) for field in fields]}, separators=(',', ':')).encode('ascii')
+    return TRACE_MAGIC + struct.pack('<I', len(header)) + header
+
+def parse_trace_header(buffer: bytes):
+    """
+    Parse the start of a binary trace.
+
+    :param buffer: At least the first bytes of the trace, up to the end of the header.
+    :return: (dtype, offset) where dtype is the packed record dtype and offset is where the records start.
+    """
+    if buffer[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError("Not a signal generator trace, the file does not start with {!r}".format(TRACE_MAGIC))
+    (header_length,) = struct.unpack_from('<I', buffer, len(TRACE_MAGIC))
+    start = len(TRACE_MAGIC) + 4
+    header = json.loads(bytes(buffer[start:start + header_length]).decode('ascii'))
+    dtype = np.dtype([(name, field_dtype) for name, field_dtype in header["fields"]])
+    return dtype, start + header_length
+
+def read_trace_header(filepath: str):
+    """
+    Read the record dtype and data offset of a binary trace file.
+    """
+    with open(filepath, 'rb') as file:
+        prefix = file.read(len(TRACE_MAGIC) + 4)
+        if len(prefix) < len(TRACE_MAGIC) + 4:
+            raise ValueError("{} is too short to be a trace file".format(filepath))
+        (header_length,) = struct.unpack_from('<I', prefix, len(TRACE_MAGIC))
+        return parse_trace_header(prefix + file.read(header_length))
+
+def load_trace(filepath: str, columns=None, start=None, stop=None) -> dict:
+    """
+    Memory-map a binary trace and return the requested columns and cycle range.
+
+    The arrays are views into the mapped file, so only the pages of the slice that are actually
+    accessed are read from disk.
+
+    :param filepath: Path of the binary trace.
+    :param columns: Column names to return (default: every column in the file).
+    :param start: First record to return (default: 0).
+    :param stop: Record to stop before (default: the end of the trace).
+    :return: A dict mapping column names to read-only numpy arrays.
+    """
+    dtype, offset = read_trace_header(filepath)
+    records = (os.path.getsize(filepath) - offset) // dtype.itemsize
+    names = list(dtype.names) if columns is None else list(columns)
+    for name in names:
+        if name not in dtype.names:
+            raise KeyError("Column '{}' is not in the trace, available columns: {}".format(name, ', '.join(dtype.names)))
+    if records == 0:
+        return {name: np.zeros(0, dtype=dtype[name]) for name in names}
+
+    data = np.memmap(filepath, dtype=dtype, mode='r', offset=offset, shape=(records,))[start:stop]
+    return {name: data[name] for name in names}
+
+def parse_trace(buffer: bytes, columns=None) -> dict:
+    """
+    Parse a complete binary trace held in memory (e.g. read from a simulator pipe) without copying it.
+    """
+    dtype, offset = parse_trace_header(buffer)
+    records = (len(buffer) - offset) // dtype.itemsize
+    data = np.frombuffer(buffer, dtype=dtype, count=records, offset=offset)
+    return {name: data[name] for name in (dtype.names if columns is None else columns)}
+
+def write_trace(filepath: str, columns: dict, fields=TRACE_FIELDS):
+    """
+    Write columns of equal length to a binary trace file.
+    """
+    dtype = np.dtype(list(fields))
+    length = len(columns[dtype.names[0]])
+    records = np.empty(length, dtype=dtype)
+    for name in dtype.names:
+        records[name] = columns[name]
+    with open(filepath, 'wb') as file:
+        file.write(trace_header(fields))
+        records.tofile(file)
+
+def iter_csv_records(csv_file, fields=TRACE_FIELDS, chunk_rows: int = 2**20):
+    """
+    Read a c,s,p,i CSV written by sim_main_sine_wave.cpp from an open file, chunk by chunk.
+
+    :return: A generator of record arrays with the trace fields.
+    """
+    dtype = np.dtype(list(fields))
+    header = csv_file.readline().strip().split(',')
+    if sorted(header) != sorted(dtype.names):
+        raise ValueError("CSV columns {} do not match the trace fields {}".format(header, list(dtype.names)))
+
+    while True:
+        lines = csv_file.readlines(chunk_rows * 16)
+        if not lines:
+            break
+        values = np.loadtxt(lines, delimiter=',', dtype=np.int64, ndmin=2)
+        records = np.empty(len(values), dtype=dtype)
+        for column, name in enumerate(header):
+            info = np.iinfo(dtype[name])
+            if values[:, column].min() < info.min or values[:, column].max() > info.max:
+                raise ValueError("Column '{}' has values outside the range of {}".format(name, dtype[name]))
+            records[name] = values[:, column]
+        yield records
+
+def csv_to_trace(csv_path: str, trace_path: str, fields=TRACE_FIELDS, chunk_rows: int = 2**20) -> int:
+    """
+    Convert a c,s,p,i CSV written by sim_main_sine_wave.cpp into a binary trace, chunk by chunk.
+
+    :return: The number of records written.
+    """
+    records_written = 0
+    with open(csv_path, 'r') as csv_file:
+        chunks = iter_csv_records(csv_file, fields, chunk_rows)
+        # Reading the first chunk checks the CSV header before the trace file is created
+        first = next(chunks, None)
+        with open(trace_path, 'wb') as trace_file:
+            trace_file.write(trace_header(fields))
+            for records in itertools.chain([] if first is None else [first], chunks):
+                records.tofile(trace_file)
+                records_written += len(records)
+    return records_written
+
+def load_csv_trace(csv_path: str, columns=None, fields=TRACE_FIELDS) -> dict:
+    """
+    Read a c,s,p,i CSV written by sim_main_sine_wave.cpp into memory, with the same column dtypes as load_trace.
+
+    :param columns: Names of the columns to return (default: all).
+    :return: A dict of numpy arrays, one per column.
+    """
+    with open(csv_path, 'r') as csv_file:
+        chunks = list(iter_csv_records(csv_file, fields))
+    records = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.dtype(list(fields)))
+    return {name: records[name] for name in (columns or records.dtype.names)}
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a signal_gen_top CSV trace into the binary trace format.')
+    parser.add_argument('csv', help='CSV trace written by sim_main_sine_wave.cpp.')
+    parser.add_argument('trace', nargs='?', default=None, help='Output binary trace (default: the CSV path with a .bin extension).')
+    args = parser.parse_args()
+
+    trace_path = args.trace or os.path.splitext(args.csv)[0] + '.bin'
+    records = csv_to_trace(args.csv, trace_path)
+    print("Converted {} records from {} to {}".format(records, args.csv, trace_path))
+
+if __name__ == '__main__':
+    main()
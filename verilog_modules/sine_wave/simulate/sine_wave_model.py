@@ -0,0 +1,362 @@
+import argparse
+import os
+import re
+import numpy as np
+
+# Root directory of the sine wave verilog modules
+MODULE_ROOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Cycle at which sim_main_sine_wave.cpp switches the phase input to 90º
+TESTBENCH_PHASE_SWITCH = (300, 90)
+
+def wrap_signed(value: int, width: int) -> int:
+    """
+    Truncate an integer to a two's complement signed value of the given bit width, as a Verilog assignment does.
+    """
+    mask = (1 << width) - 1
+    value &= mask
+    return value - (1 << width) if value >> (width - 1) else value
+
+def verilog_div(numerator: int, denominator: int) -> int:
+    """
+    Signed integer division that truncates toward zero, as Verilog's / operator does.
+    """
+    quotient = abs(numerator) // abs(denominator)
+    return quotient if (numerator < 0) == (denominator < 0) else -quotient
+
+def phase_to_phaseVal(phaseIn: int, TABLE_SIZE: int, PHASE_SIZE: int = 8) -> int:
+    """
+    Bit-exact model of the mapping from the phase input to the signed table index in sine_wave.v.
+
+    The arithmetic is 32-bit signed (the integer constants size the expression) and the result, minVal and
+    maxVal are truncated to PHASE_SIZE+1 bit signed registers, as in the phase_to_phaseVal function
+    sine_wave.v used to have. sine_wave.v now reads the result from the phase_index_table.v ROM, which
+    generate_modules_sine.py builds with the same arithmetic and checks against this model.
+    """
+    width = PHASE_SIZE + 1
+    phaseIn = wrap_signed(phaseIn, width)
+    minVal = wrap_signed(-3 * (TABLE_SIZE // 2) + 1, width)
+    maxVal = wrap_signed((TABLE_SIZE // 2) - 1, width)
+    if 0 <= phaseIn <= 90:
+        value = verilog_div(phaseIn * maxVal, 90)
+    elif 90 < phaseIn <= 180:
+        value = minVal + verilog_div((phaseIn - 90) * maxVal, 90)
+    elif -180 <= phaseIn < 0:
+        value = -TABLE_SIZE + verilog_div((phaseIn + 180) * TABLE_SIZE, 180)
+    else:
+        value = maxVal if phaseIn > 180 else minVal
+    return wrap_signed(value, width)
+
+def calculate_start_index(phaseIndex: int, TABLE_SIZE: int) -> int:
+    """
+    Model of the start index sine_wave.v loads into i on a phase change (before truncation to the width of i).
+    """
+    start_index = (TABLE_SIZE // 2) + phaseIndex
+    return -start_index if start_index < 0 else start_index
+
+class SineWaveModel:
+    """
+    Cycle-accurate model of signal_gen_top.v and the sine_wave.v instance it wraps.
+
+    Registers start at zero, as they do in a Verilator model. Reads of the ROM past the end of the
+    table return 0, which is what Verilator gives for an out-of-range array read.
+    """
+
+    def __init__(self, sine_table, TABLE_REG_SIZE=None, PHASE_SIZE=8):
+        """
+        :param sine_table: The half sine table held by half_sine_table.v.
+        :param TABLE_REG_SIZE: Width of the table address (default: ceil(log2(TABLE_SIZE + 1))).
+        :param PHASE_SIZE: Phase resolution parameter of sine_wave.v.
+        """
+        self.table = [int(value) for value in sine_table]
+        self.TABLE_SIZE = len(self.table)
+        self.TABLE_REG_SIZE = TABLE_REG_SIZE if TABLE_REG_SIZE is not None else int(np.ceil(np.log2(self.TABLE_SIZE + 1)))
+        self.PHASE_SIZE = PHASE_SIZE
+        self.reset_state()
+
+    def reset_state(self):
+        """
+        Put every register back to its power-on value of zero.
+        """
+        self.i = 0                # sine_wave.i
+        self.reverseTraversal = 0
+        self.prev_phase = 0
+        self.phaseIdxOut = 0
+        self.tableSize = 0        # sine_wave.tableSize, only loaded in the reset branch
+        self.wave_sine = 0        # sine_wave.sine
+        self.sine = 0             # signal_gen_top.sine
+
+    def rom(self, index: int) -> int:
+        """
+        Combinational read of half_sine_table.v, addressed by the low TABLE_REG_SIZE bits of i.
+        """
+        addr = index & ((1 << self.TABLE_REG_SIZE) - 1)
+        return self.table[addr] if addr < self.TABLE_SIZE else 0
+
+    def _sine_wave_block(self, reset: bool, phase: int, phaseStep: int):
+        """
+        One execution of the always block of sine_wave.v, with non-blocking assignments.
+        """
+        i_width = self.TABLE_REG_SIZE + 1
+        phase_width = self.PHASE_SIZE + 1
+        phase = wrap_signed(phase, phase_width)
+        phaseStep = wrap_signed(phaseStep, phase_width)
+        sine_val = self.rom(self.i)
+
+        if reset or phase != self.prev_phase:
+            self.tableSize = (self.TABLE_SIZE - 1) & ((1 << self.TABLE_REG_SIZE) - 1)
+            self.prev_phase = phase
+            phaseIdx = phase_to_phaseVal(phase, self.TABLE_SIZE, self.PHASE_SIZE)
+            self.phaseIdxOut = phaseIdx
+            next_i = wrap_signed(calculate_start_index(phaseIdx, self.TABLE_SIZE), i_width)
+
+            # The direction uses the value of i from before this clock edge
+            if phase >= 0:
+                if phase in (90, 180):
+                    self.reverseTraversal = 1
+                else:
+                    self.reverseTraversal = 0 if self.i < self.TABLE_SIZE - 1 else 1
+            else:
+                if phase == -90:
+                    self.reverseTraversal = 0
+                elif phase == -180:
+                    self.reverseTraversal = 1
+                else:
+                    self.reverseTraversal = 1 if self.i > 0 else 0
+            self.i = next_i
+        else:
+            i = self.i
+            if not self.reverseTraversal:
+                if i >= self.tableSize - phaseStep:
+                    self.reverseTraversal = 1
+                if i + phaseStep <= self.tableSize:
+                    self.i = wrap_signed(i + phaseStep, i_width)
+            else:
+                if i <= phaseStep:
+                    self.reverseTraversal = 0
+                if i - phaseStep >= 0:
+                    self.i = wrap_signed(i - phaseStep, i_width)
+
+        return sine_val
+
+    def posedge(self, reset: bool, phase: int, phaseStep: int):
+        """
+        Advance the model by one rising clock edge.
+        """
+        wave_sine = self.wave_sine
+        self.wave_sine = self._sine_wave_block(reset, phase, phaseStep)
+        self.sine = 0 if reset else wave_sine
+
+    def reset_edge(self, phase: int, phaseStep: int):
+        """
+        Apply a rising edge of the asynchronous reset between clock edges.
+        """
+        self.wave_sine = self._sine_wave_block(True, phase, phaseStep)
+        self.sine = 0
+
+    def outputs(self):
+        """
+        Current (sine, phaseIdxOut, i) outputs of signal_gen_top, as signed integers.
+        """
+        return self.sine, self.phaseIdxOut, self.i
+
+    def _state(self):
+        return (self.i, self.reverseTraversal, self.prev_phase, self.phaseIdxOut, self.tableSize, self.wave_sine, self.sine)
+
+    def _set_state(self, state):
+        (self.i, self.reverseTraversal, self.prev_phase, self.phaseIdxOut, self.tableSize, self.wave_sine, self.sine) = state
+
+    def run(self, cycles: int, phase: int, phaseStep: int, reset: bool = False) -> np.ndarray:
+        """
+        Run a number of clock cycles with constant inputs and return the outputs after every rising edge.
+
+        With constant inputs the model settles into a periodic walk over the table, so cycles are only
+        stepped one by one until a state repeats and the rest of the run is filled in by repeating that period.
+
+        :return: An int64 array of shape (cycles, 3) holding sine, phaseIdxOut and i after each edge.
+        """
+        rows = np.empty((cycles, 3), dtype=np.int64)
+        states = []
+        seen = {}
+        for cycle in range(cycles):
+            state = self._state()
+            if state in seen:
+                # Repeat the period found between the first visit of this state and now
+                first = seen[state]
+                period = cycle - first
+                offsets = first + (np.arange(cycles - cycle) % period)
+                rows[cycle:] = rows[offsets]
+                self._set_state(states[first + (cycles - cycle) % period])
+                return rows
+            seen[state] = cycle
+            states.append(state)
+            self.posedge(reset, phase, phaseStep)
+            rows[cycle] = self.outputs()
+        return rows
+
+def simulate_testbench(sine_table, sim_time: int, phase: int, phaseStep: int = 1, schedule=None, TABLE_REG_SIZE=None, PHASE_SIZE=8):
+    """
+    Reproduce a run of sim_main_sine_wave.cpp, including its reset sequence and CSV output.
+
+    The testbench prints five reset rows (cycles -5 to -1), then one row per rising clock edge of the
+    sim_time half-period loop. The schedule changes the inputs from a given cycle onward.
+
+    :param sine_table: The half sine table held by half_sine_table.v.
+    :param sim_time: The --sim_time argument of the testbench, in half clock periods.
+    :param phase: Initial phase input in degrees.
+    :param phaseStep: Initial phaseStep input.
+    :param schedule: List of (cycle, phase, phaseStep) input changes, phaseStep may be None to keep it.
+                     Defaults to the testbench's switch to 90º at cycle 300.
+    :return: A dict of int64 arrays 'c', 's', 'p' and 'i' with the values the testbench prints
+             (Verilator prints the signed outputs as unsigned values of their width).
+    """
+    if schedule is None:
+        schedule = [(TESTBENCH_PHASE_SWITCH[0], TESTBENCH_PHASE_SWITCH[1], None)]
+    model = SineWaveModel(sine_table, TABLE_REG_SIZE, PHASE_SIZE)
+
+    # Reset sequence: one edge before reset is asserted, the asynchronous reset edge, then four edges in reset
+    rows = []
+    model.posedge(False, phase, phaseStep)
+    rows.append(model.outputs())
+    model.reset_edge(phase, phaseStep)
+    for _ in range(4):
+        model.posedge(True, phase, phaseStep)
+        rows.append(model.outputs())
+    reset_rows = np.array(rows, dtype=np.int64)
+
+    # Main loop: one rising edge every second half period
+    cycles = (sim_time + 1) // 2
+    segments = []
+    start = 0
+    for change_cycle, new_phase, new_phaseStep in sorted(schedule) + [(cycles, None, None)]:
+        change_cycle = min(max(change_cycle, 0), cycles)
+        if change_cycle > start:
+            segments.append(model.run(change_cycle - start, phase, phaseStep))
+            start = change_cycle
+        if new_phase is not None:
+            phase = new_phase
+        if new_phaseStep is not None:
+            phaseStep = new_phaseStep
+    main_rows = np.concatenate(segments) if segments else np.empty((0, 3), dtype=np.int64)
+
+    outputs = np.concatenate([reset_rows, main_rows])
+    return {
+        'c': np.concatenate([np.arange(-5, 0), np.arange(len(main_rows))]).astype(np.int64),
+        's': outputs[:, 0],
+        'p': outputs[:, 1] & ((1 << (PHASE_SIZE + 1)) - 1),
+        'i': outputs[:, 2] & ((1 << (model.TABLE_REG_SIZE + 1)) - 1),
+    }
+
+def read_verilog_parameters(filepath: str) -> dict:
+    """
+    Read the numeric and string parameters of a Verilog module.
+    """
+    with open(filepath, 'r') as file:
+        content = file.read()
+    parameters = {name: int(value) for name, value in re.findall(r"parameter\s+(\w+)\s*=\s*(\d+)", content)}
+    parameters.update(re.findall(r'parameter\s+(\w+)\s*=\s*"([^"]*)"', content))
+    return parameters
+
+def load_sine_table(filepath: str = os.path.join(MODULE_ROOT_PATH, 'half_sine_table.v')) -> np.ndarray:
+    """
+    Load the half sine table from a generated half_sine_table.v.
+
+    Handles inline and $readmemh/$readmemb tables, in the half or quarter layout.
+    """
+    with open(filepath, 'r') as file:
+        content = file.read()
+    parameters = read_verilog_parameters(filepath)
+    quarter = 'QUARTER_SIZE' in parameters
+    rom_name = 'quarter_sine_wave' if quarter else 'sine_wave'
+
+    if '$readmem' in content:
+        radix = 2 if '$readmemb' in content else 16
+        mem_path = os.path.join(os.path.dirname(filepath), parameters['TABLE_FILE'])
+        with open(mem_path, 'r') as file:
+            rom = np.array([int(line, radix) for line in file.read().split()], dtype=np.int64)
+    else:
+        entries = re.findall(r"\b{}\[(\d+)\]\s*=\s*(\d+);".format(rom_name), content)
+        rom = np.zeros(len(entries), dtype=np.int64)
+        for index, value in entries:
+            rom[int(index)] = int(value)
+
+    if not quarter:
+        return rom
+    # Mirror the quarter wave into the half table, as the quarter layout module does
+    midpoint = parameters['TABLE_SIZE'] // 2
+    max_val = (1 << parameters['SINE_SIZE']) - 1
+    return np.concatenate([max_val - rom[midpoint:0:-1], rom[:midpoint]])
+
+def read_trace_csv(filepath: str) -> dict:
+    """
+    Read a c,s,p,i CSV written by sim_main_sine_wave.cpp.
+    """
+    data = np.loadtxt(filepath, delimiter=',', skiprows=1, dtype=np.int64, ndmin=2)
+    return {name: data[:, column] for column, name in enumerate(['c', 's', 'p', 'i'])}
+
+def compare_traces(expected: dict, actual: dict, max_report: int = 10) -> int:
+    """
+    Compare a model trace with a simulator trace row by row and print the first mismatches.
+
+    :return: The number of mismatching rows (a length difference counts every missing row).
+    """
+    rows = min(len(expected['c']), len(actual['c']))
+    mismatch = np.zeros(rows, dtype=bool)
+    for column in ['c', 's', 'p', 'i']:
+        mismatch |= expected[column][:rows] != actual[column][:rows]
+
+    for row in np.flatnonzero(mismatch)[:max_report]:
+        print("Mismatch at row {}: model c={} s={} p={} i={}, simulation c={} s={} p={} i={}".format(
+            row, *(expected[column][row] for column in 'cspi'), *(actual[column][row] for column in 'cspi')))
+    missing = abs(len(expected['c']) - len(actual['c']))
+    if missing:
+        print("Trace lengths differ: model has {} rows, simulation has {}".format(len(expected['c']), len(actual['c'])))
+    return int(np.count_nonzero(mismatch)) + missing
+
+def parse_schedule(items) -> list:
+    """
+    Parse schedule arguments of the form cycle:phase or cycle:phase:phaseStep.
+    """
+    schedule = []
+    for item in items:
+        fields = item.split(':')
+        if len(fields) not in (2, 3):
+            raise argparse.ArgumentTypeError("Schedule entries must be cycle:phase or cycle:phase:phaseStep, got '{}'".format(item))
+        cycle, phase = int(fields[0]), int(fields[1])
+        schedule.append((cycle, phase, int(fields[2]) if len(fields) == 3 else None))
+    return schedule
+
+def main():
+    parser = argparse.ArgumentParser(description='Golden model of signal_gen_top.v, reproducing sim_main_sine_wave.cpp.')
+    parser.add_argument('--sim_time', type=int, default=250, help='Simulation time in half clock periods, as for the testbench (default: 250).')
+    parser.add_argument('--phase', type=int, default=0, help='Initial phase in degrees (default: 0).')
+    parser.add_argument('--phase_step', type=int, default=1, help='Initial phase step (default: 1).')
+    parser.add_argument('--schedule', nargs='+', default=None, help='Input changes as cycle:phase[:phaseStep] (default: 300:90, as in the testbench).')
+    parser.add_argument('--table', default=os.path.join(MODULE_ROOT_PATH, 'half_sine_table.v'), help='Generated half_sine_table.v to load the table from.')
+    parser.add_argument('--output', default=None, help='Write the model trace to this CSV file.')
+    parser.add_argument('--compare', default=None, help='Compare the model trace with a CSV written by the Verilator testbench.')
+    args = parser.parse_args()
+
+    sine_table = load_sine_table(args.table)
+    table_parameters = read_verilog_parameters(args.table)
+    wave_parameters = read_verilog_parameters(os.path.join(MODULE_ROOT_PATH, 'sine_wave.v'))
+    schedule = parse_schedule(args.schedule) if args.schedule else None
+
+    trace = simulate_testbench(sine_table, args.sim_time, args.phase, args.phase_step, schedule,
+                               TABLE_REG_SIZE=table_parameters.get('TABLE_REG_SIZE'),
+                               PHASE_SIZE=wave_parameters.get('PHASE_SIZE', 8))
+    print("Simulated {} cycles of signal_gen_top with TABLE_SIZE = {}".format(len(trace['c']), len(sine_table)))
+
+    if args.output:
+        np.savetxt(args.output, np.column_stack([trace[column] for column in 'cspi']), delimiter=',', fmt='%d', header='c,s,p,i', comments='')
+        print("Model trace written to {}".format(args.output))
+
+    if args.compare:
+        mismatches = compare_traces(trace, read_trace_csv(args.compare))
+        if mismatches:
+            print("{} rows differ from {}".format(mismatches, args.compare))
+            raise SystemExit(1)
+        print("Model matches {}".format(args.compare))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import argparse
+import concurrent.futures
+import glob
+import hashlib
+import os
+import subprocess
+import tempfile
+import numpy as np
+from sim_trace import parse_trace
+
+SIMULATE_PATH = os.path.dirname(os.path.abspath(__file__))
+MODULE_ROOT_PATH = os.path.join(SIMULATE_PATH, '..')
+
+TOP_MODULE = 'signal_gen_top'
+SIMULATION_SOURCE = os.path.join(SIMULATE_PATH, 'sim_main_sine_wave.cpp')
+OBJ_DIR = os.path.join(SIMULATE_PATH, 'obj_dir')
+
+# Results of previous runs, one .npz per (model hash, phase, phaseStep, sim_time)
+SWEEP_CACHE_PATH = os.path.join(SIMULATE_PATH, '.sweep_cache')
+
+def model_sources() -> list:
+    """
+    Files the compiled simulation depends on: the Verilog modules, their memory files and the testbench.
+    """
+    patterns = ['*.v', '*.mem']
+    sources = [path for pattern in patterns for path in glob.glob(os.path.join(MODULE_ROOT_PATH, pattern))]
+    return sorted(sources) + [SIMULATION_SOURCE]
+
+def model_hash(sources=None) -> str:
+    """
+    SHA-256 over the names and contents of the simulation sources, identifies a build of the model.
+    """
+    digest = hashlib.sha256()
+    for path in (model_sources() if sources is None else sources):
+        with open(path, 'rb') as file:
+            content = file.read()
+        digest.update(os.path.basename(path).encode('utf-8') + b'\0')
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+def build_model(force=False, verilator='verilator'):
+    """
+    Compile the Verilator model of signal_gen_top once, unless the sources are unchanged since the last build.
+
+    :param force: Rebuild even if the build stamp matches the sources.
+    :param verilator: Verilator executable.
+    :return: (path of the simulation binary, model hash).
+    """
+    digest = model_hash()
+    binary = os.path.join(OBJ_DIR, 'V' + TOP_MODULE)
+    stamp = os.path.join(OBJ_DIR, '.model_hash')
+    if not force and os.path.exists(binary) and os.path.exists(stamp):
+        with open(stamp, 'r') as file:
+            if file.read().strip() == digest:
+                print("Verilator model is up to date")
+                return binary, digest
+
+    print("Building the Verilator model of {}.v...".format(TOP_MODULE))
+    subprocess.run([verilator, '--cc', '--exe', '--build', '-j', '0', '-Wall', '-I' + MODULE_ROOT_PATH,
+                    '--Mdir', OBJ_DIR, SIMULATION_SOURCE, os.path.join(MODULE_ROOT_PATH, TOP_MODULE + '.v')], check=True)
+    with open(stamp, 'w') as file:
+        file.write(digest)
+    return binary, digest
+
+def run_simulation(binary: str, phase: int, phaseStep: int, sim_time: int) -> dict:
+    """
+    Run the simulation for one phase and phaseStep and read its binary trace from a pipe.
+
+    The testbench's phase switch is disabled, so the inputs stay constant for the whole run.
+
+    :return: A dict of numpy arrays 'c', 's', 'p' and 'i'.
+    """
+    command = [binary, '--sim_time', str(sim_time), '--phase', str(phase), '--phase_step', str(phaseStep),
+               '--switch_cycle', '-1', '--trace', '-']
+    # Run from the module directory so $readmemh table files are found
+    result = subprocess.run(command, cwd=MODULE_ROOT_PATH, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError("Simulation with phase {} and phaseStep {} failed ({}): {}".format(
+            phase, phaseStep, result.returncode, result.stderr.decode(errors='replace').strip()))
+    return {name: np.array(values) for name, values in parse_trace(result.stdout).items()}
+
+def cache_file(digest: str, phase: int, phaseStep: int, sim_time: int) -> str:
+    """
+    Path of the cached result of one run.
+    """
+    return os.path.join(SWEEP_CACHE_PATH, digest[:16], "phase_{}_step_{}_time_{}.npz".format(phase, phaseStep, sim_time))
+
+def load_cached_run(path: str):
+    """
+    Read a cached run, an unreadable file counts as a miss.
+    """
+    try:
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError):
+        return None
+
+def store_cached_run(path: str, trace: dict):
+    """
+    Atomically write the result of a run to the cache.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp_', suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            np.savez(file, **trace)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def run_sweep(phases, phaseSteps, sim_time: int, binary: str, digest: str, workers=None, use_cache=True, verbose=True) -> dict:
+    """
+    Simulate every (phase, phaseStep) combination, running the simulations in parallel.
+
+    Every run is its own simulator process, so a thread pool is enough to keep all cores busy, and the
+    traces come back through pipes without going through temporary files. Runs already in the cache
+    are not repeated.
+
+    :param phases: Phase inputs in degrees.
+    :param phaseSteps: phaseStep inputs.
+    :param sim_time: Simulation time in half clock periods.
+    :param binary: Simulation binary from build_model.
+    :param digest: Model hash from build_model, keys the cache.
+    :param workers: Number of simulations run at the same time (default: os.cpu_count()).
+    :param use_cache: Read and store results in SWEEP_CACHE_PATH.
+    :param verbose: Print progress as runs finish.
+    :return: A dictionary mapping (phase, phaseStep) to the trace of that run.
+    """
+    runs = [(int(phase), int(phaseStep)) for phaseStep in phaseSteps for phase in phases]
+    results = {}
+    jobs = []
+    for phase, phaseStep in runs:
+        cached = load_cached_run(cache_file(digest, phase, phaseStep, sim_time)) if use_cache else None
+        if cached is not None:
+            results[(phase, phaseStep)] = cached
+        else:
+            jobs.append((phase, phaseStep))
+    if verbose and results:
+        print("{} of {} runs loaded from the cache".format(len(results), len(runs)))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {executor.submit(run_simulation, binary, phase, phaseStep, sim_time): (phase, phaseStep) for phase, phaseStep in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            phase, phaseStep = futures[future]
+            results[(phase, phaseStep)] = future.result()
+            if use_cache:
+                store_cached_run(cache_file(digest, phase, phaseStep, sim_time), results[(phase, phaseStep)])
+            if verbose:
+                print("[{}/{}] Done for phase: {}, phaseStep: {}".format(len(results), len(runs), phase, phaseStep))
+
+    return {run: results[run] for run in runs}
+
+def stack_sweep(results: dict) -> dict:
+    """
+    Stack the traces of a sweep into 2-D arrays with one row per run.
+
+    :return: A dict with the 'phase' and 'phaseStep' of every row, the shared cycle numbers 'c',
+             and 's', 'p' and 'i' arrays of shape (runs, cycles).
+    """
+    runs = list(results)
+    stacked = {
+        'phase': np.array([phase for phase, _ in runs], dtype=np.int64),
+        'phaseStep': np.array([phaseStep for _, phaseStep in runs], dtype=np.int64),
+        'c': results[runs[0]]['c'] if runs else np.zeros(0, dtype=np.int32),
+    }
+    for name in ('s', 'p', 'i'):
+        stacked[name] = np.stack([results[run][name] for run in runs]) if runs else np.zeros((0, 0))
+    return stacked
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate signal_gen_top for many phase and phaseStep inputs in parallel.')
+    parser.add_argument('--phases', type=int, nargs='+', default=None, help='Phases to simulate in degrees (default: every phase from -180 to 180).')
+    parser.add_argument('--phase_steps', type=int, nargs='+', default=[1], help='phaseSteps to simulate (default: 1).')
+    parser.add_argument('--sim_time', type=int, default=250, help='Simulation time in half clock periods (default: 250).')
+    parser.add_argument('--workers', type=int, default=None, help='Number of simulations run at the same time (default: number of CPUs).')
+    parser.add_argument('--no_cache', action='store_true', help='Do not read or store results in the sweep cache.')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the Verilator model even if its sources are unchanged.')
+    parser.add_argument('--binary', type=str, default=None, help='Use an already built simulation binary instead of building the model.')
+    parser.add_argument('--output', type=str, default=os.path.join(SIMULATE_PATH, TOP_MODULE + '_sweep.npz'), help='File the stacked sweep results are saved to.')
+    args = parser.parse_args()
+
+    if args.binary:
+        binary, digest = os.path.abspath(args.binary), model_hash(model_sources() + [args.binary])
+    else:
+        binary, digest = build_model(force=args.rebuild)
+
+    phases = args.phases if args.phases is not None else range(-180, 181)
+    results = run_sweep(phases, args.phase_steps, args.sim_time, binary, digest, workers=args.workers, use_cache=not args.no_cache)
+
+    np.savez(args.output, **stack_sweep(results))
+    print("Sweep of {} runs saved to {}".format(len(results), args.output))
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,8 @@
 //              The sine wave is generated using a lookup table with a specified
 //              size and resolution. The module supports phase input and phase
 //              step input to control the phase increment.
+//              The start index and direction for each phase input are read from
+//              the phase_index_table ROM generated by generate_modules_sine.py.
 //////////////////////////////////////////////////////////////////////////////////
 /* verilator lint_off WIDTHEXPAND */
 /* verilator lint_off BLKSEQ */
@@ -41,93 +43,63 @@ module sine_wave #(
         .table_size(table_size_wire)
     );
 
+    // Encoding of the direction output of the phase index ROM
+    localparam [1:0] DIRECTION_FORWARD = 2'd0;               // Forward traversal
+    localparam [1:0] DIRECTION_REVERSE = 2'd1;               // Reverse traversal
+    localparam [1:0] DIRECTION_FORWARD_UNTIL_END = 2'd2;     // Forward, unless i is already at the end
+    localparam [1:0] DIRECTION_REVERSE_UNLESS_START = 2'd3;  // Reverse, unless i is already at the start
+
+    // Wires to connect to the phase index ROM
+    wire signed [PHASE_SIZE:0] phaseVal;
+    wire [TABLE_REG_SIZE:0] start_index;
+    wire [1:0] direction;
+
+    // Instantiate the phase index ROM, it replaces the multiply and divide that used to map
+    // the phase in degrees to a table index on every phase change.
+    phase_index_table #(
+        .TABLE_SIZE(TABLE_SIZE),
+        .TABLE_REG_SIZE(TABLE_REG_SIZE),
+        .PHASE_SIZE(PHASE_SIZE)
+    ) phase_table_inst (
+        .phase(phase),
+        .phaseVal(phaseVal),
+        .start_index(start_index),
+        .direction(direction)
+    );
+
     // Signal to hold the previous value of phase
     reg signed [PHASE_SIZE:0] prev_phase;
-    integer phaseIdx;
     integer tableSize;
     reg reverseTraversal; // Flag to indicate reverse traversal
 
-    // Function to calculate the starting index based on phase
-    function integer calculate_start_index;
-        input integer phaseIndex;
-        integer midpoint;
-        integer start_index;
-        begin
-            midpoint = (TABLE_SIZE / 2);    // Exact midpoint index of the sine table
-            // Offset from midpoint
-            start_index = midpoint + phaseIndex;
-            // Ensure the index is positive
-            if (start_index < 0)
-                start_index = -start_index;
-            calculate_start_index = start_index;
-        end
-    endfunction
-
-    // Function: Converts phase in degrees to a table index value.
-    function signed [PHASE_SIZE:0] phase_to_phaseVal;
-        input signed [PHASE_SIZE:0] phaseIn;
-        reg signed [PHASE_SIZE:0] minVal; // Minimum phase value
-        reg signed [PHASE_SIZE:0] maxVal; // Maximum phase value (midpoint)
-        begin
-            minVal = -3 * (TABLE_SIZE / 2) + 1;
-            maxVal = (TABLE_SIZE / 2) - 1;
-            if (phaseIn >= 0 && phaseIn <= 90)
-                // Map [0º, 90º] to [0, maxVal]
-                phase_to_phaseVal = (phaseIn * maxVal) / 90;
-            else if (phaseIn > 90 && phaseIn <= 180)
-                // Map [90º, 180º] to [minVal, -TABLE_SIZE]
-                phase_to_phaseVal = minVal + ((phaseIn - 90) * maxVal) / 90;
-            else if (phaseIn >= -180 && phaseIn < 0)
-                // Map [-180º, 0º] to [TABLE_SIZE, 0]
-                phase_to_phaseVal = -TABLE_SIZE + ((phaseIn + 180) * TABLE_SIZE) / 180;
-            else
-                // Clamp phase to valid range [-180º, 180º]
-                phase_to_phaseVal = (phaseIn > 180) ? maxVal : minVal;
-        end
-    endfunction
-
     always @(posedge clock or posedge reset) begin
         if (reset || phase != prev_phase) begin
             tableSize = table_size_wire;   // Obtain the constant table size from the ROM (TABLE_SIZE - 1)
             prev_phase <= phase;           // Update previous phase (synchronous to avoid combinational loops)
-            // Convert input phase into a table index
-            phaseIdx = phase_to_phaseVal(phase);
-            phaseIdxOut <= phaseIdx;
+            // Table index of the input phase, from the phase index ROM
+            phaseIdxOut <= phaseVal;
             // Set initial index based on phase offset
-            i <= calculate_start_index(phaseIdx);
+            i <= start_index;
 
             // Set initial traversal direction based on phase value
-            if (phase >= 0) begin
-                case (phase)
-                    90: begin
-                        // At 90º, reverse traversal
-                        reverseTraversal <= 1;
-                    end
-                    180: begin
-                        // At 180º, reverse traversal
-                        reverseTraversal <= 1;
-                    end
-                    default: begin
-                        // General case: forward traversal
-                        reverseTraversal <= (i < TABLE_SIZE - 1) ? 0 : 1;
-                    end
-                endcase
-            end else begin
-                case (phase)
-                    -90: begin
-                        // At -90º, forward traversal
-                        reverseTraversal <= 0;
-                    end
-                    -180: begin
-                        // At -180º, reverse traversal
-                        reverseTraversal <= 1;
-                    end
-                    default: begin
-                        // General case: reverse traversal
-                        reverseTraversal <= (i > 0) ? 1 : 0;
-                    end
-                endcase
-            end
+            case (direction)
+                DIRECTION_FORWARD: begin
+                    // At -90º, forward traversal
+                    reverseTraversal <= 0;
+                end
+                DIRECTION_REVERSE: begin
+                    // At 90º, 180º and -180º, reverse traversal
+                    reverseTraversal <= 1;
+                end
+                DIRECTION_FORWARD_UNTIL_END: begin
+                    // General case for positive phases: forward traversal
+                    reverseTraversal <= (i < TABLE_SIZE - 1) ? 0 : 1;
+                end
+                default: begin
+                    // General case for negative phases: reverse traversal
+                    reverseTraversal <= (i > 0) ? 1 : 0;
+                end
+            endcase
 
             sine <= sine_val;      // Set initial output from the ROM
         end else begin